@@ -1,4 +1,23 @@
+from django.contrib import admin
+from .models import AnalyticsReport, CalibrationCycle, ReviewerCalibration
 
-# The analytics app doesn't have its own models, so no admin configuration is needed.
-# This file is created to maintain consistency with other apps.
-pass
+
+@admin.register(AnalyticsReport)
+class AnalyticsReportAdmin(admin.ModelAdmin):
+    list_display = ['title', 'report_type', 'status', 'progress', 'row_count', 'generated_at', 'finished_at', 'generated_by']
+    list_filter = ['report_type', 'status', 'is_active']
+    search_fields = ['title']
+    exclude = ['result_manifest']
+
+
+@admin.register(CalibrationCycle)
+class CalibrationCycleAdmin(admin.ModelAdmin):
+    list_display = ['cycle', 'start_date', 'end_date', 'review_count', 'company_mean', 'computed_at']
+    search_fields = ['cycle']
+
+
+@admin.register(ReviewerCalibration)
+class ReviewerCalibrationAdmin(admin.ModelAdmin):
+    list_display = ['cycle', 'reviewer', 'department', 'review_count', 'mean_score', 'department_bias']
+    list_filter = ['cycle', 'department']
+    search_fields = ['reviewer__first_name', 'reviewer__last_name']
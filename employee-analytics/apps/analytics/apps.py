@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class AnalyticsConfig(AppConfig):
+    """
+    App configuration for the analytics app.
+    """
+    name = 'apps.analytics'
+    verbose_name = 'Analytics'
+
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,129 @@
+import numpy as np
+from django.db import transaction
+
+from apps.performance.models import Performance
+from utils.periods import parse_period
+from utils.stats import grouped_stats
+from .models import CalibrationCycle, ReviewerCalibration, CalibratedScore
+
+
+# Sentinel used for missing reviewer / department ids in the key arrays
+MISSING = -1
+
+
+def _optional(value):
+    """Convert a numpy float to a float, mapping NaN to None."""
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def run_calibration(cycle):
+    """
+    Compute and store reviewer calibration statistics for a review cycle.
+
+    All performance records of the cycle are loaded in one query as arrays.
+    Per-reviewer and per-department statistics are computed with vectorized
+    group-bys, and every score is z-normalized within its reviewer before
+    being mapped back onto the company distribution. Previous results of the
+    cycle are replaced.
+
+    Args:
+        cycle: Cycle label, e.g. "2024", "2024-H1" or "2024-Q3"
+
+    Returns:
+        CalibrationCycle: The stored calibration cycle
+
+    Raises:
+        ValueError: If the cycle label is invalid
+    """
+    start_date, end_date = parse_period(cycle)
+
+    rows = list(
+        Performance.objects.filter(review_date__range=(start_date, end_date))
+        .order_by()
+        .values_list(
+            'id', 'reviewer_id', 'reviewer__department_id',
+            'employee__department_id', 'performance_score',
+        )
+    )
+
+    with transaction.atomic():
+        CalibrationCycle.objects.filter(cycle=cycle).delete()
+        calibration = CalibrationCycle.objects.create(
+            cycle=cycle, start_date=start_date, end_date=end_date, review_count=len(rows)
+        )
+        if not rows:
+            return calibration
+
+        ids, reviewers, reviewer_departments, departments, scores = zip(*rows)
+        reviewers = np.array([MISSING if pk is None else pk for pk in reviewers])
+        reviewer_departments = np.array([MISSING if pk is None else pk for pk in reviewer_departments])
+        departments = np.array([MISSING if pk is None else pk for pk in departments])
+        scores = np.array(scores, dtype=float)
+
+        company_mean = scores.mean()
+        company_std = scores.std(ddof=1) if len(scores) > 1 else np.nan
+        calibration.company_mean = _optional(company_mean)
+        calibration.company_std = _optional(company_std)
+        calibration.save(update_fields=['company_mean', 'company_std'])
+
+        # Department distributions over the reviewees' departments
+        dept_keys, _, _, dept_means, dept_stds = grouped_stats(departments, scores)
+        dept_lookup = {int(key): i for i, key in enumerate(dept_keys) if key != MISSING}
+
+        # Reviewer distributions
+        reviewer_keys, reviewer_index, reviewer_counts, reviewer_means, reviewer_stds = (
+            grouped_stats(reviewers, scores)
+        )
+        first_seen = np.unique(reviewer_index, return_index=True)[1]
+
+        reviewer_rows = []
+        for i, reviewer_id in enumerate(reviewer_keys):
+            if reviewer_id == MISSING:
+                continue
+            department_id = int(reviewer_departments[first_seen[i]])
+            dept = dept_lookup.get(department_id)
+            dept_mean = dept_means[dept] if dept is not None else np.nan
+            dept_std = dept_stds[dept] if dept is not None else np.nan
+            with np.errstate(divide='ignore', invalid='ignore'):
+                department_bias = (reviewer_means[i] - dept_mean) / dept_std
+                company_bias = (reviewer_means[i] - company_mean) / company_std
+            reviewer_rows.append(ReviewerCalibration(
+                cycle=calibration,
+                reviewer_id=int(reviewer_id),
+                department_id=None if department_id == MISSING else department_id,
+                review_count=int(reviewer_counts[i]),
+                mean_score=round(float(reviewer_means[i]), 4),
+                std_score=_optional(reviewer_stds[i]),
+                department_mean=_optional(dept_mean),
+                department_std=_optional(dept_std),
+                department_bias=_optional(department_bias if np.isfinite(department_bias) else np.nan),
+                company_bias=_optional(company_bias if np.isfinite(company_bias) else np.nan),
+            ))
+        ReviewerCalibration.objects.bulk_create(reviewer_rows, batch_size=1000)
+
+        # Normalize within the reviewer when their spread is known, otherwise
+        # fall back to the company distribution
+        own_std = reviewer_stds[reviewer_index]
+        own_mean = reviewer_means[reviewer_index]
+        usable = (reviewers != MISSING) & np.isfinite(own_std) & (own_std > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.where(usable, (scores - own_mean) / own_std, (scores - company_mean) / company_std)
+        z_scores = np.nan_to_num(z_scores, nan=0.0, posinf=0.0, neginf=0.0)
+        if np.isfinite(company_std):
+            normalized = company_mean + z_scores * company_std
+        else:
+            normalized = scores
+
+        CalibratedScore.objects.bulk_create([
+            CalibratedScore(
+                cycle=calibration,
+                performance_id=ids[i],
+                reviewer_id=None if reviewers[i] == MISSING else int(reviewers[i]),
+                raw_score=rows[i][4],
+                z_score=round(float(z_scores[i]), 4),
+                normalized_score=round(float(normalized[i]), 2),
+            )
+            for i in range(len(rows))
+        ], batch_size=1000)
+
+    return calibration
@@ -0,0 +1,120 @@
+import numpy as np
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.employees.models import Employee
+from utils.stats import to_list
+
+COHORT_INTERVALS = ('month', 'quarter')
+
+
+def _period_index(months, interval):
+    """Convert datetime64[M] values to consecutive month or quarter numbers."""
+    index = months.astype('datetime64[M]').astype(int)
+    return index // 3 if interval == 'quarter' else index
+
+
+def _period_label(index, interval):
+    """Label and first day of a month or quarter number."""
+    if interval == 'quarter':
+        year, quarter = divmod(int(index), 4)
+        year += 1970
+        return f"{year}-Q{quarter + 1}", f"{year}-{quarter * 3 + 1:02d}-01"
+    start = np.datetime64(int(index), 'M')
+    return str(start), f"{start}-01"
+
+
+def build_retention(interval='quarter', start_date=None, end_date=None, department=None, by_department=False):
+    """
+    Build hire-cohort retention matrices.
+
+    Employees are grouped by hire period (and department) in one query.
+    Departures are placed in a cohort x tenure matrix and accumulated along
+    the tenure axis, so retention after t periods is the cohort size minus
+    the departures in tenure periods 0..t. Departures use termination_date;
+    inactive employees without one are counted as leaving in their hire
+    period and reported as unknown terminations.
+
+    Args:
+        interval: Cohort and tenure granularity, "month" or "quarter"
+        start_date: Only include employees hired on or after this date
+        end_date: Only include employees hired on or before this date
+        department: Only include this department
+        by_department: Split cohorts by department
+
+    Returns:
+        dict: Interval, number of tenure periods and one entry per cohort
+            with its size, retained counts and retention rates per tenure
+            (None for tenures that have not been reached yet)
+    """
+    queryset = Employee.objects.all()
+    if start_date:
+        queryset = queryset.filter(hire_date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(hire_date__lte=end_date)
+    if department:
+        queryset = queryset.filter(department_id=department)
+
+    group = ['hired', 'left', 'is_active']
+    if by_department:
+        group += ['department_id', 'department__name']
+    rows = list(
+        queryset.annotate(hired=TruncMonth('hire_date'), left=TruncMonth('termination_date'))
+        .values(*group)
+        .annotate(employees=Count('id'))
+        .order_by()
+    )
+    if not rows:
+        return {'interval': interval, 'periods': 0, 'cohorts': []}
+
+    today = _period_index(np.array([timezone.localdate()], dtype='datetime64[M]'), interval)[0]
+    hired = _period_index(np.array([row['hired'] for row in rows], dtype='datetime64[M]'), interval)
+    left_dates = np.array([row['left'] or np.datetime64('NaT') for row in rows], dtype='datetime64[M]')
+    has_left = ~np.isnat(left_dates)
+    left = np.where(has_left, _period_index(np.where(has_left, left_dates, np.datetime64(0, 'M')), interval), 0)
+    inactive = np.array([not row['is_active'] for row in rows])
+    counts = np.array([row['employees'] for row in rows])
+    departments = np.array([row.get('department_id') or 0 for row in rows]) if by_department else np.zeros(len(rows), int)
+    department_names = {row.get('department_id') or 0: row.get('department__name') for row in rows}
+
+    # Departure tenure: exact when a termination date is known, hire period
+    # for inactive employees without one, never for everyone else
+    unknown = inactive & ~has_left
+    departed = has_left | unknown
+    tenure = np.where(has_left, np.maximum(left - hired, 0), 0)
+
+    cohort_keys = np.stack([hired, departments], axis=1)
+    cohorts, cohort_index = np.unique(cohort_keys, axis=0, return_inverse=True)
+    cohort_index = cohort_index.reshape(-1)
+    periods = int(today - cohorts[:, 0].min()) + 1
+
+    sizes = np.bincount(cohort_index, weights=counts, minlength=len(cohorts))
+    unknown_counts = np.bincount(cohort_index, weights=counts * unknown, minlength=len(cohorts))
+    departures = np.zeros((len(cohorts), periods))
+    np.add.at(departures, (cohort_index[departed], np.minimum(tenure[departed], periods - 1)), counts[departed])
+
+    retained = sizes[:, None] - np.cumsum(departures, axis=1)
+    retention = retained / sizes[:, None] * 100
+    # Tenures beyond today have not been observed yet
+    reached = np.arange(periods)[None, :] <= (today - cohorts[:, 0])[:, None]
+    retained = np.where(reached, retained, np.nan)
+    retention = np.where(reached, retention, np.nan)
+
+    results = []
+    for index, (cohort_period, department_id) in enumerate(cohorts):
+        label, start = _period_label(cohort_period, interval)
+        entry = {'cohort': label, 'start': start}
+        if by_department:
+            entry['department_id'] = int(department_id) or None
+            entry['department_name'] = department_names[department_id]
+        observed = int(reached[index].sum())
+        entry.update({
+            'size': int(sizes[index]),
+            'unknown_terminations': int(unknown_counts[index]),
+            'retained': [int(value) for value in retained[index, :observed]],
+            'retention': to_list(retention[index, :observed], 1),
+        })
+        results.append(entry)
+
+    return {'interval': interval, 'periods': periods, 'cohorts': results}
@@ -0,0 +1,195 @@
+import numpy as np
+from django.db.models import Avg, Count, FloatField, Q
+from django.db.models.functions import Cast
+
+from apps.attendance.models import Attendance
+from apps.performance.models import Performance
+from utils.stats import to_list
+
+# Per-employee features, in matrix order
+ATTENDANCE_FEATURES = ('late_rate', 'absence_rate', 'avg_hours_worked', 'avg_overtime_hours')
+PERFORMANCE_FEATURES = ('performance_score', 'goals_achievement')
+FEATURES = ATTENDANCE_FEATURES + PERFORMANCE_FEATURES
+
+CORRELATION_METHODS = ('pearson', 'spearman')
+
+# Groups with fewer employees get no correlation matrix
+MIN_SAMPLES = 3
+
+
+def attendance_features(start_date, end_date, department=None):
+    """
+    Attendance features per employee, in one grouped query.
+
+    Returns:
+        tuple: (employee ids, department ids, department names by id, feature matrix)
+    """
+    queryset = Attendance.objects.filter(date__range=(start_date, end_date))
+    if department:
+        queryset = queryset.filter(employee__department_id=department)
+    rows = list(
+        queryset.values('employee_id', 'employee__department_id', 'employee__department__name')
+        .annotate(
+            days=Count('id'),
+            late=Count('id', filter=Q(status='late')),
+            absent=Count('id', filter=Q(status='absent')),
+            avg_hours_worked=Cast(Avg('hours_worked'), FloatField()),
+            avg_overtime_hours=Cast(Avg('overtime_hours'), FloatField()),
+        )
+        .order_by('employee_id')
+    )
+    ids = np.array([row['employee_id'] for row in rows], dtype=np.int64)
+    departments = np.array([row['employee__department_id'] or 0 for row in rows], dtype=np.int64)
+    names = {row['employee__department_id'] or 0: row['employee__department__name'] for row in rows}
+    days = np.array([row['days'] for row in rows], dtype=float)
+    matrix = np.column_stack([
+        np.array([row['late'] for row in rows], dtype=float) / np.maximum(days, 1) * 100,
+        np.array([row['absent'] for row in rows], dtype=float) / np.maximum(days, 1) * 100,
+        np.array([row['avg_hours_worked'] for row in rows], dtype=float),
+        np.array([row['avg_overtime_hours'] for row in rows], dtype=float),
+    ]) if rows else np.zeros((0, len(ATTENDANCE_FEATURES)))
+    return ids, departments, names, matrix
+
+
+def performance_features(start_date, end_date, department=None):
+    """
+    Average review score and goals achievement per employee, in one grouped query.
+
+    Returns:
+        tuple: (employee ids, feature matrix)
+    """
+    queryset = Performance.objects.filter(review_date__range=(start_date, end_date))
+    if department:
+        queryset = queryset.filter(employee__department_id=department)
+    rows = list(
+        queryset.values('employee_id')
+        .annotate(
+            performance_score=Cast(Avg('performance_score'), FloatField()),
+            goals_achievement=Cast(Avg('goals_achievement'), FloatField()),
+        )
+        .order_by('employee_id')
+    )
+    ids = np.array([row['employee_id'] for row in rows], dtype=np.int64)
+    matrix = np.array(
+        [[row[name] for name in PERFORMANCE_FEATURES] for row in rows], dtype=float,
+    ).reshape(-1, len(PERFORMANCE_FEATURES))
+    return ids, matrix
+
+
+def _ranks(matrix):
+    """Average ranks of each column (ties share their mean rank), for Spearman correlation."""
+    ranks = np.empty_like(matrix)
+    for column in range(matrix.shape[1]):
+        values = matrix[:, column]
+        order = np.argsort(values, kind='mergesort')
+        sorted_values = values[order]
+        # First and last position of every run of equal values
+        starts = np.r_[True, sorted_values[1:] != sorted_values[:-1]]
+        run = np.cumsum(starts) - 1
+        first = np.flatnonzero(starts)
+        last = np.r_[first[1:], len(values)] - 1
+        ranks[order, column] = (first[run] + last[run]) / 2
+    return ranks
+
+
+def correlation_matrix(matrix, method='pearson'):
+    """
+    Correlation between the columns of a feature matrix.
+
+    Args:
+        matrix: Samples x features array without missing values
+        method: "pearson" or "spearman"
+
+    Returns:
+        list or None: Rows of coefficients (None where a feature is constant),
+            None if there are fewer than MIN_SAMPLES samples
+    """
+    if len(matrix) < MIN_SAMPLES:
+        return None
+    if method == 'spearman':
+        matrix = _ranks(matrix)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coefficients = np.corrcoef(matrix, rowvar=False)
+    return [to_list(row, 3) for row in coefficients]
+
+
+def downsample(count, limit, seed=0):
+    """
+    Pick a reproducible sample of row indexes.
+
+    Args:
+        count: Number of rows
+        limit: Maximum number of rows to keep
+        seed: Random seed, so cached and recomputed samples match
+
+    Returns:
+        numpy.ndarray: Sorted row indexes
+    """
+    if count <= limit:
+        return np.arange(count)
+    return np.sort(np.random.default_rng(seed).choice(count, size=limit, replace=False))
+
+
+def build_correlations(start_date, end_date, department=None, method='pearson', max_points=500):
+    """
+    Correlate attendance behaviour with performance per employee.
+
+    Attendance and performance features are computed by two grouped queries
+    ordered by employee, aligned on employee id in memory (employees need
+    attendance records and reviews in the range) and correlated company-wide
+    and per department.
+
+    Args:
+        start_date: First day of the range
+        end_date: Last day of the range
+        department: Only include this department
+        method: Correlation method, "pearson" or "spearman"
+        max_points: Maximum number of scatter points returned
+
+    Returns:
+        dict: Features, company and per-department correlation matrices and
+            a sample of per-employee points (keyed by employee primary key)
+            in columnar form
+    """
+    attendance_ids, departments, names, attendance = attendance_features(start_date, end_date, department)
+    performance_ids, performance = performance_features(start_date, end_date, department)
+
+    # Both id arrays are sorted and unique, intersect them to align the rows
+    ids, attendance_rows, performance_rows = np.intersect1d(
+        attendance_ids, performance_ids, assume_unique=True, return_indices=True,
+    )
+    matrix = np.hstack([attendance[attendance_rows], performance[performance_rows]])
+    departments = departments[attendance_rows]
+    # Employees without any hours recorded have NaN averages
+    complete = ~np.isnan(matrix).any(axis=1)
+    ids, departments, matrix = ids[complete], departments[complete], matrix[complete]
+
+    department_results = []
+    for department_id in np.unique(departments):
+        rows = departments == department_id
+        department_results.append({
+            'department_id': int(department_id) or None,
+            'department_name': names[department_id],
+            'employees': int(rows.sum()),
+            'matrix': correlation_matrix(matrix[rows], method),
+        })
+
+    sample = downsample(len(ids), max_points)
+    return {
+        'method': method,
+        'features': list(FEATURES),
+        'company': {
+            'employees': len(ids),
+            'matrix': correlation_matrix(matrix, method),
+        },
+        'departments': department_results,
+        'points': {
+            'total': len(ids),
+            'returned': len(sample),
+            'columns': {
+                'employee': [int(value) for value in ids[sample]],
+                'department_id': [int(value) or None for value in departments[sample]],
+                **{name: to_list(matrix[sample, index]) for index, name in enumerate(FEATURES)},
+            },
+        },
+    }
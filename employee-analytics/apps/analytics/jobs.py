@@ -0,0 +1,270 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AnalyticsReport
+from .report_files import ReportFileWriter, report_file_name
+from .reports import build_report
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+def parameters_hash(report_type, parameters):
+    """
+    Hash identifying identical report requests.
+
+    Args:
+        report_type: Report type
+        parameters: Report parameters (key order does not matter)
+
+    Returns:
+        str: Hex digest
+    """
+    payload = json.dumps([report_type, parameters or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def submit_report(report_type, parameters, user=None, title=None, description=None, reuse=True):
+    """
+    Enqueue a report, or return an identical one that is recent or in progress.
+
+    A completed report with the same type and parameters is reused when it
+    finished less than REPORT_REUSE_WINDOW seconds ago; identical queued or
+    running reports are always reused so concurrent requests share one job.
+
+    Args:
+        report_type: One of AnalyticsReport.REPORT_TYPES
+        parameters: Report parameters
+        user: Requesting user
+        title: Report title (defaults to the report type name)
+        description: Optional description
+        reuse: Whether an identical report may be returned instead
+
+    Returns:
+        tuple: (AnalyticsReport, whether it was reused)
+
+    Raises:
+        ValueError: If the report type cannot be generated or a parameter is invalid
+    """
+    parameters = parameters or {}
+    # Fail fast on bad input instead of queueing a job that can only fail
+    build_report(report_type, parameters)
+    digest = parameters_hash(report_type, parameters)
+
+    if reuse:
+        window = getattr(settings, 'REPORT_REUSE_WINDOW', 3600)
+        existing = AnalyticsReport.objects.filter(
+            Q(status__in=ACTIVE_STATUSES)
+            | Q(status='completed', finished_at__gte=timezone.now() - timedelta(seconds=window)),
+            report_type=report_type,
+            parameters_hash=digest,
+            is_active=True,
+        ).order_by('-generated_at').first()
+        if existing:
+            return existing, True
+
+    report = AnalyticsReport.objects.create(
+        title=title or dict(AnalyticsReport.REPORT_TYPES)[report_type],
+        report_type=report_type,
+        description=description,
+        parameters=parameters,
+        parameters_hash=digest,
+        generated_by=user if user and user.is_authenticated else None,
+    )
+    return report, False
+
+
+def claim_next(worker):
+    """
+    Claim the oldest queued report for a worker.
+
+    Uses SELECT ... FOR UPDATE SKIP LOCKED where the database supports it so
+    concurrent workers never wait on each other; the conditional status
+    update keeps claims exclusive on databases without it.
+
+    Args:
+        worker: Worker identifier stored on the claimed report
+
+    Returns:
+        AnalyticsReport or None: The claimed report, None if the queue is empty
+    """
+    while True:
+        with transaction.atomic():
+            queryset = AnalyticsReport.objects.filter(status='queued').order_by('generated_at')
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            report = queryset.first()
+            if report is None:
+                return None
+            claimed = AnalyticsReport.objects.filter(pk=report.pk, status='queued').update(
+                status='running', progress=0, started_at=timezone.now(), worker=worker, error='',
+            )
+        if claimed:
+            report.refresh_from_db()
+            return report
+
+
+def requeue_stale():
+    """
+    Put running reports whose worker died back on the queue.
+
+    Reports running for longer than REPORT_JOB_TIMEOUT seconds are assumed
+    abandoned.
+
+    Returns:
+        int: Number of requeued reports
+    """
+    timeout = getattr(settings, 'REPORT_JOB_TIMEOUT', 3600)
+    return AnalyticsReport.objects.filter(
+        status='running', started_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(status='queued', worker='', progress=0)
+
+
+def _jsonable(value):
+    """Convert a database value to a JSON friendly value."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def run_report(report):
+    """
+    Generate a claimed report, recording progress, result or failure.
+
+    Rows are read in chunks of REPORT_CHUNK_SIZE and streamed into a
+    compressed result file (see apps/analytics/report_files.py); progress is
+    saved after each chunk so clients can poll it.
+
+    Args:
+        report: AnalyticsReport claimed by the calling worker
+    """
+    chunk_size = getattr(settings, 'REPORT_CHUNK_SIZE', 2000)
+    queryset = AnalyticsReport.objects.filter(pk=report.pk)
+    try:
+        rows_query, columns = build_report(report.report_type, report.parameters)
+        total = rows_query.count()
+
+        writer = ReportFileWriter(columns, chunk_size)
+        for values in rows_query.iterator(chunk_size=chunk_size):
+            writer.write([_jsonable(value) for value in values])
+            if writer.row_count % chunk_size == 0:
+                queryset.update(progress=min(99, writer.row_count * 100 // max(total, 1)))
+        path, manifest = writer.save(report_file_name(report))
+
+        queryset.update(
+            status='completed',
+            progress=100,
+            row_count=writer.row_count,
+            result_file=path,
+            result_manifest=manifest,
+            finished_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.exception("Report %s failed", report.pk)
+        queryset.update(status='failed', error=str(e), finished_at=timezone.now())
+
+
+class ReportWorkerPool:
+    """
+    Pool of threads executing queued reports.
+
+    Several pools (e.g. one per `manage.py run_report_workers` process) can
+    share the queue; claims are exclusive. Every REPORT_REQUEUE_INTERVAL
+    seconds one worker requeues reports abandoned by crashed workers, so they
+    do not wait for a pool restart.
+    """
+
+    def __init__(self, workers=2, poll_interval=2.0):
+        """
+        Args:
+            workers: Number of worker threads
+            poll_interval: Seconds an idle worker waits before polling again
+        """
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stopping = threading.Event()
+        self.threads = []
+        self.prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.requeue_interval = getattr(settings, 'REPORT_REQUEUE_INTERVAL', 60)
+        self.next_requeue = 0.0
+        self.requeue_lock = threading.Lock()
+
+    def start(self):
+        """Start the worker threads."""
+        self._requeue_stale()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._loop, args=(f"{self.prefix}:{index}",),
+                name=f"report-worker-{index}", daemon=True,
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask the workers to stop after their current report and wait for them."""
+        self.stopping.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def _requeue_stale(self):
+        """Requeue abandoned reports, at most once per requeue interval across the pool's workers."""
+        with self.requeue_lock:
+            now = time.monotonic()
+            if now < self.next_requeue:
+                return
+            self.next_requeue = now + self.requeue_interval
+        requeued = requeue_stale()
+        if requeued:
+            logger.warning("Requeued %s abandoned report(s)", requeued)
+
+    def _loop(self, worker):
+        """Claim and run reports until the pool is stopped."""
+        while not self.stopping.is_set():
+            try:
+                self._requeue_stale()
+                report = claim_next(worker)
+                if report is not None:
+                    run_report(report)
+            except Exception:
+                logger.exception("Report worker %s failed", worker)
+                report = None
+            finally:
+                connection.close()
+            if report is None:
+                self.stopping.wait(self.poll_interval)
+
+
+def run_pending(worker=None):
+    """
+    Run queued reports in the calling thread until the queue is empty.
+
+    Args:
+        worker: Worker identifier (defaults to host and process id)
+
+    Returns:
+        int: Number of reports run
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    requeue_stale()
+    count = 0
+    while True:
+        report = claim_next(worker)
+        if report is None:
+            return count
+        run_report(report)
+        count += 1
@@ -0,0 +1,153 @@
+from django.core.cache import cache
+from django.conf import settings
+from django.db.models import Avg, Count, F, FloatField, Q, Window
+from django.db.models.functions import Cast, Rank
+
+from apps.employees.models import Employee
+from utils.cache import get_versions
+from utils.periods import parse_period, previous_period
+
+
+def leaderboard_namespace(family, period, department_id):
+    """
+    Cache namespace for leaderboard snapshots of one department and period.
+
+    Args:
+        family: Source data family, "performance" or "attendance"
+        period: Period label (YYYY, YYYY-Hn or YYYY-Qn)
+        department_id: Department primary key
+    """
+    return f"leaderboard:{family}:{period}:{department_id}"
+
+
+def _ranked(queryset, limit):
+    """
+    Rank employees by metric within their department and keep the top entries.
+
+    Metrics are floats: SQLite cannot order window functions by a decimal
+    expression.
+    """
+    return (
+        queryset.annotate(rank=Window(
+            expression=Rank(),
+            partition_by=F('department_id'),
+            order_by=F('metric').desc(),
+        ))
+        .filter(rank__lte=limit)
+        .order_by('department_id', 'rank', 'last_name', 'first_name')
+        .values('id', 'employee_id', 'first_name', 'last_name', 'department_id', 'metric', 'samples', 'rank')
+    )
+
+
+def top_performers(period, department_ids, limit):
+    """Rank employees by average performance score in the period."""
+    start_date, end_date = parse_period(period)
+    in_period = Q(performances__review_date__range=(start_date, end_date))
+    queryset = Employee.objects.filter(department_id__in=department_ids).annotate(
+        metric=Cast(Avg('performances__performance_score', filter=in_period), FloatField()),
+        samples=Count('performances', filter=in_period),
+    ).filter(samples__gt=0)
+    return _ranked(queryset, limit)
+
+
+def most_improved(period, department_ids, limit):
+    """Rank employees by average score change against the previous period."""
+    start_date, end_date = parse_period(period)
+    previous_start, previous_end = parse_period(previous_period(period))
+    in_period = Q(performances__review_date__range=(start_date, end_date))
+    in_previous = Q(performances__review_date__range=(previous_start, previous_end))
+    queryset = Employee.objects.filter(department_id__in=department_ids).annotate(
+        current_score=Cast(Avg('performances__performance_score', filter=in_period), FloatField()),
+        previous_score=Cast(Avg('performances__performance_score', filter=in_previous), FloatField()),
+        samples=Count('performances', filter=in_period),
+        previous_samples=Count('performances', filter=in_previous),
+    ).filter(samples__gt=0, previous_samples__gt=0).annotate(
+        metric=F('current_score') - F('previous_score'),
+    )
+    return _ranked(queryset, limit)
+
+
+def best_attendance(period, department_ids, limit):
+    """Rank employees by the percentage of attendance records marked present."""
+    start_date, end_date = parse_period(period)
+    in_period = Q(attendances__date__range=(start_date, end_date))
+    queryset = Employee.objects.filter(department_id__in=department_ids, is_active=True).annotate(
+        samples=Count('attendances', filter=in_period),
+        present=Count('attendances', filter=in_period & Q(attendances__status='present')),
+    ).filter(samples__gt=0).annotate(
+        metric=Cast(F('present'), FloatField()) * 100 / F('samples'),
+    )
+    return _ranked(queryset, limit)
+
+
+# Leaderboard kind -> (source data family, ranking query)
+LEADERBOARDS = {
+    'top_performers': ('performance', top_performers),
+    'most_improved': ('performance', most_improved),
+    'best_attendance': ('attendance', best_attendance),
+}
+
+
+def get_leaderboard(kind, period, department_ids, limit=10):
+    """
+    Get leaderboard entries per department, served from cached snapshots.
+
+    Snapshots are cached per (kind, period, department). Writes only
+    invalidate the snapshots of the department and periods they touch, so a
+    request recomputes just the missing departments, in one ranking query.
+
+    Args:
+        kind: Leaderboard kind, one of LEADERBOARDS
+        period: Period label (YYYY, YYYY-Hn or YYYY-Qn)
+        department_ids: Departments to return
+        limit: Number of ranks per department
+
+    Returns:
+        dict: Department primary key -> list of entries
+
+    Raises:
+        ValueError: If the period label is invalid
+    """
+    family, query = LEADERBOARDS[kind]
+    parse_period(period)  # Reject invalid labels before reading the cache
+
+    # most_improved also depends on the previous period's reviews
+    periods = [period, previous_period(period)] if kind == 'most_improved' else [period]
+    namespaces = [
+        leaderboard_namespace(family, label, department_id)
+        for department_id in department_ids
+        for label in periods
+    ]
+    versions = iter(get_versions(*namespaces))
+    keys = {
+        department_id: "leaderboard:{}:{}:{}:{}:{}".format(
+            kind, period, limit, department_id, ':'.join(str(next(versions)) for _ in periods)
+        )
+        for department_id in department_ids
+    }
+
+    snapshots = cache.get_many(list(keys.values()))
+    entries = {
+        department_id: snapshots[key]
+        for department_id, key in keys.items() if key in snapshots
+    }
+
+    missing = [department_id for department_id in department_ids if department_id not in entries]
+    if missing:
+        fresh = {department_id: [] for department_id in missing}
+        for row in query(period, missing, limit):
+            fresh[row['department_id']].append({
+                'rank': row['rank'],
+                'employee': row['id'],
+                'employee_id': row['employee_id'],
+                'employee_name': f"{row['first_name']} {row['last_name']}",
+                'value': round(float(row['metric']), 2),
+                'samples': row['samples'],
+            })
+        cache.set_many(
+            {keys[department_id]: rows for department_id, rows in fresh.items()},
+            getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 300),
+        )
+        entries.update(fresh)
+
+    return entries
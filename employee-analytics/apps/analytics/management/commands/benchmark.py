@@ -0,0 +1,112 @@
+import json
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.benchmark import ENDPOINTS, HttpClient, InProcessClient, compare, run_benchmark
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the main API endpoints and compare the results with a baseline.
+
+    Usage:
+        python manage.py benchmark --output benchmarks/current.json
+        python manage.py benchmark --concurrency 8 --requests 500 employees dashboard_summary
+        python manage.py benchmark --writes --output benchmarks/writes.json
+        python manage.py benchmark --baseline benchmarks/baseline.json --fail-on-regression
+        python manage.py benchmark --url http://localhost:8000 --username admin --password secret
+    """
+    help = 'Measure latency percentiles, throughput and SQL query counts of the API endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('endpoints', nargs='*', help=f"Endpoints to run (default: all of {', '.join(ENDPOINTS)}, "
+                                                         "the ones writing rows only with --writes)")
+        parser.add_argument('--url', help='Benchmark a running server over HTTP (default: in-process)')
+        parser.add_argument('--username', help='User to authenticate as (default: the first superuser)')
+        parser.add_argument('--password', default=os.getenv('BENCHMARK_PASSWORD'),
+                            help='Password for --url (default: $BENCHMARK_PASSWORD)')
+        parser.add_argument('--requests', type=int, default=100, help='Measured requests per endpoint (default: 100)')
+        parser.add_argument('--concurrency', type=int, default=1, help='Concurrent clients (default: 1)')
+        parser.add_argument('--warmup', type=int, default=5, help='Unrecorded requests per endpoint (default: 5)')
+        parser.add_argument('--writes', action='store_true',
+                            help='Also run the endpoints writing rows (check_in, check_out); they grow the dataset')
+        parser.add_argument('--cold-cache', action='store_true', help='Clear the cache before every request (in-process only)')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare with the results in this JSON file')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Tolerated relative latency/throughput change against the baseline (default: 0.2)')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error when a metric regressed')
+
+    def handle(self, *args, **options):
+        unknown = sorted(set(options['endpoints']) - set(ENDPOINTS))
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(unknown)}")
+        if options['requests'] < 1 or options['concurrency'] < 1 or options['warmup'] < 0:
+            raise CommandError("--requests and --concurrency must be positive and --warmup not negative")
+
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as source:
+                    baseline = json.load(source)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read the baseline: {e}")
+
+        if options['username']:
+            user = User.objects.filter(username=options['username']).first()
+        else:
+            user = User.objects.filter(is_superuser=True, is_active=True).order_by('pk').first()
+        if user is None:
+            raise CommandError("No such user, pass --username or create a superuser")
+
+        try:
+            if options['url']:
+                if options['cold_cache']:
+                    raise CommandError("--cold-cache only works in-process")
+                if not options['password']:
+                    raise CommandError("--url needs --password or $BENCHMARK_PASSWORD")
+                client, mode = HttpClient(options['url'], user.username, options['password']), 'http'
+            else:
+                client, mode = InProcessClient(user, cold_cache=options['cold_cache']), 'inprocess'
+
+            def progress(name, metrics):
+                queries = '-' if metrics['queries_mean'] is None else f"{metrics['queries_mean']:g}"
+                self.stdout.write(
+                    f"  {name:<24} p50 {metrics['p50_ms']:>8.2f} ms  p95 {metrics['p95_ms']:>8.2f} ms  "
+                    f"p99 {metrics['p99_ms']:>8.2f} ms  {metrics['throughput']:>8.1f} req/s  "
+                    f"{queries:>6} queries  {metrics['errors']} errors"
+                )
+
+            results = run_benchmark(
+                client, mode, endpoints=options['endpoints'] or None, requests=options['requests'],
+                concurrency=options['concurrency'], warmup=options['warmup'], progress=progress,
+                writes=options['writes'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            os.makedirs(os.path.dirname(options['output']) or '.', exist_ok=True)
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if baseline is None:
+            return
+        rows, warnings = compare(results, baseline, options['threshold'])
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(warning))
+        regressions = [row for row in rows if row['regressed']]
+        for row in rows:
+            change = 'n/a' if row['change'] is None else f"{row['change']:+.1%}"
+            line = f"  {row['endpoint']:<24} {row['metric']:<13} {row['baseline']:>10} -> {row['current']:>10} ({change})"
+            self.stdout.write(self.style.ERROR(line) if row['regressed'] else line)
+        if regressions:
+            message = f"{len(regressions)} metric(s) regressed against {options['baseline']}"
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
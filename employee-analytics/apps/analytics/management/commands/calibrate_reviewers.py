@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.calibration import run_calibration
+
+
+class Command(BaseCommand):
+    """
+    Compute reviewer calibration statistics for one or more review cycles.
+
+    Usage:
+        python manage.py calibrate_reviewers 2024 2024-H2
+    """
+    help = 'Compute reviewer calibration statistics for review cycles (YYYY, YYYY-Hn or YYYY-Qn)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('cycles', nargs='+', help='Cycle labels to (re)compute')
+
+    def handle(self, *args, **options):
+        for cycle in options['cycles']:
+            try:
+                calibration = run_calibration(cycle)
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(
+                f"Calibrated {cycle}: {calibration.review_count} reviews, "
+                f"{calibration.reviewers.count()} reviewers"
+            ))
@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.analytics.snapshots import SNAPSHOTS, refresh_all
+
+
+class Command(BaseCommand):
+    """
+    Refresh the precomputed analytics snapshots.
+
+    Usage:
+        python manage.py refresh_analytics
+        python manage.py refresh_analytics department_stats attendance_daily
+        python manage.py refresh_analytics --loop --interval 300
+    """
+    help = 'Refresh analytics snapshots (materialized views on PostgreSQL, tables elsewhere)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"Snapshots to refresh (default: all of {', '.join(SNAPSHOTS)})")
+        parser.add_argument('--loop', action='store_true', help='Keep refreshing every --interval seconds until stopped')
+        parser.add_argument('--interval', type=int, default=settings.ANALYTICS_SNAPSHOT_REFRESH_INTERVAL,
+                            help='Seconds between refreshes with --loop (default: ANALYTICS_SNAPSHOT_REFRESH_INTERVAL)')
+
+    def handle(self, *args, **options):
+        names = options['names'] or list(SNAPSHOTS)
+        unknown = sorted(set(names) - set(SNAPSHOTS))
+        if unknown:
+            raise CommandError(f"Unknown snapshots: {', '.join(unknown)}")
+
+        if not options['loop']:
+            self.refresh(names)
+            return
+
+        if options['interval'] < 1:
+            raise CommandError("--interval must be at least 1 second")
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshing every {options['interval']} seconds, press CTRL-C to stop"
+        ))
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    self.refresh(names)
+                except CommandError as e:
+                    # Keep looping, the next refresh may succeed
+                    self.stderr.write(str(e))
+                finally:
+                    connection.close()
+                time.sleep(max(options['interval'] - (time.monotonic() - started), 0))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped")
+
+    def refresh(self, names):
+        refreshed = refresh_all(names)
+        for snapshot in refreshed:
+            self.stdout.write(self.style.SUCCESS(
+                f"Refreshed {snapshot.name}: {snapshot.row_count} rows in {snapshot.duration_ms} ms"
+            ))
+        if len(refreshed) < len(names):
+            raise CommandError(f"{len(names) - len(refreshed)} snapshot(s) failed to refresh, see the log")
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.jobs import ReportWorkerPool, run_pending
+
+
+class Command(BaseCommand):
+    """
+    Execute queued analytics reports.
+
+    Usage:
+        python manage.py run_report_workers --workers 4
+        python manage.py run_report_workers --once
+    """
+    help = 'Run a pool of workers executing queued analytics reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Number of worker threads')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds idle workers wait between polls')
+        parser.add_argument('--once', action='store_true', help='Run the queued reports in this thread and exit')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            count = run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} report(s)"))
+            return
+
+        pool = ReportWorkerPool(options['workers'], options['poll_interval'])
+        pool.start()
+        self.stdout.write(self.style.SUCCESS(f"Started {options['workers']} report worker(s), press CTRL-C to stop"))
+        try:
+            pool.stopping.wait()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping after the current reports...")
+            pool.stop()
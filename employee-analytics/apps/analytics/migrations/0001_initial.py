@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardWidget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100, verbose_name='Widget Title')),
+                ('widget_type', models.CharField(choices=[('chart', 'Chart'), ('metric', 'Metric'), ('table', 'Table'), ('text', 'Text')], max_length=20, verbose_name='Widget Type')),
+                ('position', models.IntegerField(default=0, verbose_name='Position')),
+                ('size', models.CharField(default='medium', max_length=20, verbose_name='Size')),
+                ('config', models.JSONField(default=dict, verbose_name='Widget Configuration')),
+                ('is_visible', models.BooleanField(default=True, verbose_name='Visible')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Dashboard Widget',
+                'verbose_name_plural': 'Dashboard Widgets',
+                'ordering': ('position',),
+            },
+        ),
+        migrations.CreateModel(
+            name='AnalyticsReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Report Title')),
+                ('report_type', models.CharField(choices=[('employee_summary', 'Employee Summary'), ('department_analysis', 'Department Analysis'), ('attendance_report', 'Attendance Report'), ('performance_report', 'Performance Report'), ('custom', 'Custom Report')], max_length=50, verbose_name='Report Type')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Description')),
+                ('parameters', models.JSONField(default=dict, verbose_name='Report Parameters')),
+                ('generated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Generated At')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Active')),
+                ('generated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='generated_reports', to=settings.AUTH_USER_MODEL, verbose_name='Generated By')),
+            ],
+            options={
+                'verbose_name': 'Analytics Report',
+                'verbose_name_plural': 'Analytics Reports',
+                'ordering': ('-generated_at',),
+            },
+        ),
+    ]
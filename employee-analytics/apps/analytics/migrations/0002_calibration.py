@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+        ('employees', '0002_alter_department_description_alter_department_name_and_more'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalibrationCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cycle', models.CharField(max_length=20, unique=True, verbose_name='Cycle')),
+                ('start_date', models.DateField(verbose_name='Start Date')),
+                ('end_date', models.DateField(verbose_name='End Date')),
+                ('review_count', models.IntegerField(default=0, verbose_name='Review Count')),
+                ('company_mean', models.FloatField(null=True, verbose_name='Company Mean Score')),
+                ('company_std', models.FloatField(null=True, verbose_name='Company Score Std. Deviation')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Computed At')),
+            ],
+            options={
+                'verbose_name': 'Calibration Cycle',
+                'verbose_name_plural': 'Calibration Cycles',
+                'ordering': ('-start_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewerCalibration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(verbose_name='Review Count')),
+                ('mean_score', models.FloatField(verbose_name='Mean Score')),
+                ('std_score', models.FloatField(null=True, verbose_name='Score Std. Deviation')),
+                ('department_mean', models.FloatField(null=True, verbose_name='Department Mean Score')),
+                ('department_std', models.FloatField(null=True, verbose_name='Department Score Std. Deviation')),
+                ('department_bias', models.FloatField(null=True, verbose_name='Bias vs Department (z)')),
+                ('company_bias', models.FloatField(null=True, verbose_name='Bias vs Company (z)')),
+                ('cycle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviewers', to='analytics.calibrationcycle', verbose_name='Cycle')),
+                ('department', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='employees.department', verbose_name='Department')),
+                ('reviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calibrations', to='employees.employee', verbose_name='Reviewer')),
+            ],
+            options={
+                'verbose_name': 'Reviewer Calibration',
+                'verbose_name_plural': 'Reviewer Calibrations',
+                'ordering': ('-department_bias',),
+                'unique_together': {('cycle', 'reviewer')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CalibratedScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('raw_score', models.DecimalField(decimal_places=1, max_digits=3, verbose_name='Raw Score')),
+                ('z_score', models.FloatField(verbose_name='Z-Score')),
+                ('normalized_score', models.FloatField(verbose_name='Normalized Score')),
+                ('cycle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='analytics.calibrationcycle', verbose_name='Cycle')),
+                ('performance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calibrated_scores', to='performance.performance', verbose_name='Performance Record')),
+                ('reviewer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='employees.employee', verbose_name='Reviewer')),
+            ],
+            options={
+                'verbose_name': 'Calibrated Score',
+                'verbose_name_plural': 'Calibrated Scores',
+                'unique_together': {('cycle', 'performance')},
+            },
+        ),
+    ]
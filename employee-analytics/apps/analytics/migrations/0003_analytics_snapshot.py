@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_calibration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Snapshot Name')),
+                ('refreshed_at', models.DateTimeField(verbose_name='Refreshed At')),
+                ('duration_ms', models.IntegerField(default=0, verbose_name='Refresh Duration (ms)')),
+                ('row_count', models.IntegerField(default=0, verbose_name='Row Count')),
+            ],
+            options={
+                'verbose_name': 'Analytics Snapshot',
+                'verbose_name_plural': 'Analytics Snapshots',
+                'ordering': ('name',),
+            },
+        ),
+    ]
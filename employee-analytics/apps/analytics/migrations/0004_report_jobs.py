@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_analytics_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='error',
+            field=models.TextField(blank=True, verbose_name='Error'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Finished At'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='parameters_hash',
+            field=models.CharField(blank=True, max_length=64, verbose_name='Parameters Hash'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Progress (%)'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='result',
+            field=models.JSONField(blank=True, null=True, verbose_name='Result'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='row_count',
+            field=models.IntegerField(blank=True, null=True, verbose_name='Row Count'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Started At'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20, verbose_name='Status'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='worker',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Worker'),
+        ),
+        migrations.AddIndex(
+            model_name='analyticsreport',
+            index=models.Index(fields=['status', 'generated_at'], name='report_status_generated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analyticsreport',
+            index=models.Index(fields=['report_type', 'parameters_hash', 'status'], name='report_type_params_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_report_jobs'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='analyticsreport',
+            name='result',
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='result_file',
+            field=models.FileField(blank=True, upload_to='reports/', verbose_name='Result File'),
+        ),
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='result_manifest',
+            field=models.JSONField(blank=True, null=True, verbose_name='Result Manifest'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:05
+
+from django.db import migrations
+
+# Snapshot storage as of this migration: table -> (defining query, unique columns).
+# Frozen here, so later changes to apps/analytics/snapshots.py need their own migration.
+SNAPSHOTS = {
+    'analytics_snapshot_department_stats': (
+        "SELECT d.id AS department_id, d.name AS department_name, "
+        "COUNT(e.id) AS employee_count, SUM(e.salary) AS salary_sum, "
+        "MIN(e.salary) AS min_salary, MAX(e.salary) AS max_salary "
+        "FROM employees_department d LEFT JOIN employees_employee e "
+        "ON e.department_id = d.id AND e.is_active = TRUE "
+        "GROUP BY d.id, d.name",
+        'department_id',
+    ),
+    'analytics_snapshot_employee_hires': (
+        "SELECT hire_date, COUNT(*) AS employee_count "
+        "FROM employees_employee WHERE is_active = TRUE GROUP BY hire_date",
+        'hire_date',
+    ),
+    'analytics_snapshot_attendance_daily': (
+        "SELECT date, status, COUNT(*) AS record_count, "
+        "SUM(hours_worked) AS hours_sum, SUM(overtime_hours) AS overtime_sum "
+        "FROM attendance_attendance GROUP BY date, status",
+        'date, status',
+    ),
+    'analytics_snapshot_performance_daily': (
+        "SELECT review_date, status, COUNT(*) AS review_count, "
+        "SUM(performance_score) AS score_sum, SUM(goals_achievement) AS goals_sum "
+        "FROM performance_performance GROUP BY review_date, status",
+        'review_date, status',
+    ),
+}
+
+
+def create_snapshots(apps, schema_editor):
+    """
+    Create the snapshot storage, previously created on first refresh: materialized
+    views with the unique index concurrent refreshes need on PostgreSQL, plain
+    tables with the same columns elsewhere.
+    """
+    materialized = schema_editor.connection.vendor == 'postgresql'
+    for table, (sql, columns) in SNAPSHOTS.items():
+        if materialized:
+            schema_editor.execute(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {table} AS {sql}")
+        else:
+            schema_editor.execute(f"CREATE TABLE IF NOT EXISTS {table} AS {sql} LIMIT 0")
+        schema_editor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_key ON {table} ({columns})")
+
+
+def drop_snapshots(apps, schema_editor):
+    """Drop the snapshot storage."""
+    kind = 'MATERIALIZED VIEW' if schema_editor.connection.vendor == 'postgresql' else 'TABLE'
+    for table in SNAPSHOTS:
+        schema_editor.execute(f"DROP {kind} IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_dashboard_widget_owner'),
+        ('attendance', '0002_attendance_anomaly'),
+        ('employees', '0005_department_position_counters'),
+        ('performance', '0002_goal_health_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_snapshots, drop_snapshots),
+    ]
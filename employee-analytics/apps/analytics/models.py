@@ -14,14 +14,33 @@ class AnalyticsReport(models.Model):
         ('custom', 'Custom Report'),
     ]
 
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
     title = models.CharField(max_length=200, verbose_name="Report Title")
     report_type = models.CharField(max_length=50, choices=REPORT_TYPES, verbose_name="Report Type")
     description = models.TextField(blank=True, null=True, verbose_name="Description")
     parameters = models.JSONField(default=dict, verbose_name="Report Parameters")
+    parameters_hash = models.CharField(max_length=64, blank=True, verbose_name="Parameters Hash")
     generated_at = models.DateTimeField(default=timezone.now, verbose_name="Generated At")
     generated_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, related_name="generated_reports", verbose_name="Generated By")
     is_active = models.BooleanField(default=True, verbose_name="Active")
 
+    # Job state, maintained by the report workers (see apps/analytics/jobs.py)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', verbose_name="Status")
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="Progress (%)")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Started At")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finished At")
+    worker = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    row_count = models.IntegerField(null=True, blank=True, verbose_name="Row Count")
+    result_file = models.FileField(upload_to='reports/', blank=True, verbose_name="Result File")
+    result_manifest = models.JSONField(null=True, blank=True, verbose_name="Result Manifest")
+    error = models.TextField(blank=True, verbose_name="Error")
+
     def __str__(self):
         return f"{self.title} ({self.report_type})"
 
@@ -29,6 +48,12 @@ class AnalyticsReport(models.Model):
         verbose_name = "Analytics Report"
         verbose_name_plural = "Analytics Reports"
         ordering = ('-generated_at',)
+        indexes = [
+            # Queue claims: oldest queued job first
+            models.Index(fields=['status', 'generated_at'], name='report_status_generated_idx'),
+            # Reuse lookups for identical requests
+            models.Index(fields=['report_type', 'parameters_hash', 'status'], name='report_type_params_idx'),
+        ]
 
 
 class DashboardWidget(models.Model):
@@ -48,6 +73,9 @@ class DashboardWidget(models.Model):
     size = models.CharField(max_length=20, default='medium', verbose_name="Size")
     config = models.JSONField(default=dict, verbose_name="Widget Configuration")
     is_visible = models.BooleanField(default=True, verbose_name="Visible")
+    # Personal widgets are only listed and rendered for their owner; shared
+    # widgets (no owner) are managed by staff
+    owner = models.ForeignKey('auth.User', on_delete=models.CASCADE, null=True, blank=True, related_name="dashboard_widgets", verbose_name="Owner")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
 
@@ -58,3 +86,93 @@ class DashboardWidget(models.Model):
         verbose_name = "Dashboard Widget"
         verbose_name_plural = "Dashboard Widgets"
         ordering = ('position',)
+
+
+class CalibrationCycle(models.Model):
+    """
+    Reviewer calibration results for one review cycle.
+
+    Rows are written by the calibration batch job (see apps/analytics/calibration.py)
+    so the calibration endpoint only reads precomputed statistics.
+    """
+    cycle = models.CharField(max_length=20, unique=True, verbose_name="Cycle")
+    start_date = models.DateField(verbose_name="Start Date")
+    end_date = models.DateField(verbose_name="End Date")
+    review_count = models.IntegerField(default=0, verbose_name="Review Count")
+    company_mean = models.FloatField(null=True, verbose_name="Company Mean Score")
+    company_std = models.FloatField(null=True, verbose_name="Company Score Std. Deviation")
+    computed_at = models.DateTimeField(default=timezone.now, verbose_name="Computed At")
+
+    def __str__(self):
+        return f"Calibration {self.cycle}"
+
+    class Meta:
+        verbose_name = "Calibration Cycle"
+        verbose_name_plural = "Calibration Cycles"
+        ordering = ('-start_date',)
+
+
+class ReviewerCalibration(models.Model):
+    """
+    Rating statistics of one reviewer compared with the department and company.
+    """
+    cycle = models.ForeignKey(CalibrationCycle, on_delete=models.CASCADE, related_name="reviewers", verbose_name="Cycle")
+    reviewer = models.ForeignKey('employees.Employee', on_delete=models.CASCADE, related_name="calibrations", verbose_name="Reviewer")
+    department = models.ForeignKey('employees.Department', on_delete=models.SET_NULL, null=True, related_name="+", verbose_name="Department")
+    review_count = models.IntegerField(verbose_name="Review Count")
+    mean_score = models.FloatField(verbose_name="Mean Score")
+    std_score = models.FloatField(null=True, verbose_name="Score Std. Deviation")
+    department_mean = models.FloatField(null=True, verbose_name="Department Mean Score")
+    department_std = models.FloatField(null=True, verbose_name="Department Score Std. Deviation")
+    department_bias = models.FloatField(null=True, verbose_name="Bias vs Department (z)")
+    company_bias = models.FloatField(null=True, verbose_name="Bias vs Company (z)")
+
+    def __str__(self):
+        return f"{self.cycle.cycle} - {self.reviewer.full_name}"
+
+    class Meta:
+        verbose_name = "Reviewer Calibration"
+        verbose_name_plural = "Reviewer Calibrations"
+        unique_together = ('cycle', 'reviewer')
+        ordering = ('-department_bias',)
+
+
+class CalibratedScore(models.Model):
+    """
+    Z-score normalized performance score of one reviewee within a calibration cycle.
+    """
+    cycle = models.ForeignKey(CalibrationCycle, on_delete=models.CASCADE, related_name="scores", verbose_name="Cycle")
+    performance = models.ForeignKey('performance.Performance', on_delete=models.CASCADE, related_name="calibrated_scores", verbose_name="Performance Record")
+    reviewer = models.ForeignKey('employees.Employee', on_delete=models.SET_NULL, null=True, related_name="+", verbose_name="Reviewer")
+    raw_score = models.DecimalField(max_digits=3, decimal_places=1, verbose_name="Raw Score")
+    z_score = models.FloatField(verbose_name="Z-Score")
+    normalized_score = models.FloatField(verbose_name="Normalized Score")
+
+    def __str__(self):
+        return f"{self.cycle.cycle} - {self.performance_id} - {self.normalized_score}"
+
+    class Meta:
+        verbose_name = "Calibrated Score"
+        verbose_name_plural = "Calibrated Scores"
+        unique_together = ('cycle', 'performance')
+
+
+class AnalyticsSnapshot(models.Model):
+    """
+    Refresh bookkeeping for a precomputed analytics snapshot.
+
+    The snapshot rows themselves live in a materialized view (PostgreSQL) or a
+    plain table (other databases) managed by apps/analytics/snapshots.py.
+    """
+    name = models.CharField(max_length=50, unique=True, verbose_name="Snapshot Name")
+    refreshed_at = models.DateTimeField(verbose_name="Refreshed At")
+    duration_ms = models.IntegerField(default=0, verbose_name="Refresh Duration (ms)")
+    row_count = models.IntegerField(default=0, verbose_name="Row Count")
+
+    def __str__(self):
+        return f"{self.name} ({self.refreshed_at})"
+
+    class Meta:
+        verbose_name = "Analytics Snapshot"
+        verbose_name_plural = "Analytics Snapshots"
+        ordering = ('name',)
@@ -0,0 +1,561 @@
+import json
+import re
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Aggregate, Avg, BooleanField, Count, F, FloatField, Max, Min, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncQuarter, TruncWeek, TruncYear
+
+from apps.attendance.models import Attendance
+from apps.employees.models import Employee
+from apps.performance.models import Performance
+
+
+class QueryError(ValueError):
+    """
+    Raised when an aggregation query uses fields or operations outside the whitelist.
+    """
+
+
+# Whitelisted data sources. Only the dimensions, measures and filters listed
+# here can be referenced by widget configs and ad-hoc queries; they map the
+# public names to ORM paths.
+SOURCES = {
+    'employees': {
+        'model': Employee,
+        'date': 'hire_date',
+        'dimensions': {
+            'department': 'department__name',
+            'position': 'position__title',
+            'gender': 'gender',
+            'is_active': 'is_active',
+        },
+        'measures': {
+            'salary': 'salary',
+        },
+        'filters': {
+            'department': 'department_id',
+            'position': 'position_id',
+            'gender': 'gender',
+            'is_active': 'is_active',
+            'hire_date': 'hire_date',
+            'salary': 'salary',
+        },
+    },
+    'attendance': {
+        'model': Attendance,
+        'date': 'date',
+        'dimensions': {
+            'department': 'employee__department__name',
+            'position': 'employee__position__title',
+            'gender': 'employee__gender',
+            'status': 'status',
+            'employee': 'employee__employee_id',
+        },
+        'measures': {
+            'hours_worked': 'hours_worked',
+            'overtime_hours': 'overtime_hours',
+        },
+        'filters': {
+            'department': 'employee__department_id',
+            'position': 'employee__position_id',
+            'gender': 'employee__gender',
+            'status': 'status',
+            'employee': 'employee__employee_id',
+            'date': 'date',
+            'hours_worked': 'hours_worked',
+        },
+    },
+    'performance': {
+        'model': Performance,
+        'date': 'review_date',
+        'dimensions': {
+            'department': 'employee__department__name',
+            'position': 'employee__position__title',
+            'gender': 'employee__gender',
+            'status': 'status',
+            'employee': 'employee__employee_id',
+            'reviewer': 'reviewer__employee_id',
+        },
+        'measures': {
+            'performance_score': 'performance_score',
+            'goals_achievement': 'goals_achievement',
+        },
+        'filters': {
+            'department': 'employee__department_id',
+            'position': 'employee__position_id',
+            'gender': 'employee__gender',
+            'status': 'status',
+            'employee': 'employee__employee_id',
+            'reviewer': 'reviewer__employee_id',
+            'review_date': 'review_date',
+            'performance_score': 'performance_score',
+        },
+    },
+}
+
+# Date bucket dimensions, truncating the source's date field
+DATE_BUCKETS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+    'year': TruncYear,
+}
+
+AGGREGATES = {
+    'count': Count,
+    'sum': Sum,
+    'avg': Avg,
+    'min': Min,
+    'max': Max,
+}
+
+# Percentile aggregates: "median" or "p<percentile>", e.g. "p95" or "p99.9"
+PERCENTILE_PATTERN = re.compile(r'^p(\d{1,2}(?:\.\d+)?)$')
+
+FILTER_OPERATORS = ('exact', 'in', 'gt', 'gte', 'lt', 'lte')
+
+# Query string spellings of boolean filter values
+BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+# Size limits of ad-hoc queries
+MAX_DIMENSIONS = 4
+MAX_METRICS = 10
+
+
+def source_namespace(source):
+    """Cache namespace invalidated by writes to a data source."""
+    return f"analytics_source:{source}"
+
+
+def _source(name):
+    """Get a whitelisted source definition."""
+    if name not in SOURCES:
+        raise QueryError(f"Unknown source '{name}'. Use one of: {', '.join(SOURCES)}")
+    return SOURCES[name]
+
+
+def parse_dimensions(source, dimensions):
+    """
+    Validate dimension names against a source.
+
+    Args:
+        source: Source name
+        dimensions: List of dimension names (source dimensions or date buckets)
+
+    Returns:
+        list: The dimension names
+
+    Raises:
+        QueryError: If a dimension is not whitelisted
+    """
+    definition = _source(source)
+    dimensions = list(dimensions or [])
+    for dimension in dimensions:
+        if dimension not in definition['dimensions'] and dimension not in DATE_BUCKETS:
+            raise QueryError(
+                f"Unknown dimension '{dimension}' for {source}. Use one of: "
+                f"{', '.join(list(definition['dimensions']) + list(DATE_BUCKETS))}"
+            )
+    if len(set(dimensions)) != len(dimensions):
+        raise QueryError("Dimensions must not repeat")
+    return dimensions
+
+
+def parse_metric(source, metric):
+    """
+    Parse a metric spec such as "count", "avg:hours_worked" or "p95:hours_worked".
+
+    Args:
+        source: Source name
+        metric: Metric spec
+
+    Returns:
+        tuple: (aggregate name, measure name or None)
+
+    Raises:
+        QueryError: If the aggregate or measure is not whitelisted
+    """
+    definition = _source(source)
+    aggregate, _, measure = str(metric).partition(':')
+    if aggregate not in AGGREGATES and percentile_fraction(aggregate) is None:
+        raise QueryError(
+            f"Unknown aggregate '{aggregate}'. Use one of: {', '.join(AGGREGATES)}, median, p<percentile>"
+        )
+    if aggregate == 'count' and not measure:
+        return aggregate, None
+    if measure not in definition['measures']:
+        raise QueryError(
+            f"Unknown measure '{measure}' for {source}. Use one of: {', '.join(definition['measures'])}"
+        )
+    return aggregate, measure
+
+
+def metric_alias(aggregate, measure):
+    """Result column name of a metric."""
+    return f"{aggregate}_{measure}" if measure else aggregate
+
+
+def _model_field(model, path):
+    """Get the model field an ORM path such as "employee__department_id" ends on."""
+    *relations, name = path.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def _filter_value(key, field, value):
+    """Convert a single filter value, parsing "true"/"false" for boolean fields."""
+    if isinstance(value, (list, dict)):
+        raise QueryError(f"Filter '{key}' expects a single value")
+    if isinstance(field, BooleanField) and isinstance(value, str):
+        if value.lower() not in BOOLEAN_VALUES:
+            raise QueryError(f"Filter '{key}' expects true or false")
+        return BOOLEAN_VALUES[value.lower()]
+    return value
+
+
+def parse_filters(source, filters):
+    """
+    Validate filters such as {"status": "present", "date__gte": "2024-01-01"}.
+
+    Args:
+        source: Source name
+        filters: Mapping of "<field>" or "<field>__<operator>" to values
+
+    Returns:
+        list: Sorted (field, operator, value) tuples
+
+    Raises:
+        QueryError: If a field or operator is not whitelisted, or a value
+            has the wrong shape
+    """
+    definition = _source(source)
+    if not isinstance(filters or {}, dict):
+        raise QueryError("Filters must be an object")
+    parsed = []
+    for key, value in (filters or {}).items():
+        field, _, operator = key.partition('__')
+        operator = operator or 'exact'
+        if field not in definition['filters']:
+            raise QueryError(
+                f"Unknown filter '{field}' for {source}. Use one of: {', '.join(definition['filters'])}"
+            )
+        if operator not in FILTER_OPERATORS:
+            raise QueryError(f"Unknown filter operator '{operator}'. Use one of: {', '.join(FILTER_OPERATORS)}")
+        model_field = _model_field(definition['model'], definition['filters'][field])
+        if operator == 'in':
+            if isinstance(value, str):
+                value = value.split(',')
+            elif not isinstance(value, list):
+                raise QueryError(f"Filter '{key}' expects a list or a comma-separated string")
+            value = [_filter_value(key, model_field, item) for item in value]
+        else:
+            value = _filter_value(key, model_field, value)
+        parsed.append((field, operator, value))
+    return sorted(parsed, key=lambda item: (item[0], item[1], str(item[2])))
+
+
+def build_queryset(source, dimensions, filters):
+    """
+    Build the filtered base query with dimension columns.
+
+    Args:
+        source: Source name
+        dimensions: Validated dimension names
+        filters: Validated (field, operator, value) filters
+
+    Returns:
+        QuerySet: Values queryset grouped by the dimensions
+
+    Raises:
+        QueryError: If a filter value does not fit its field
+    """
+    definition = _source(source)
+    try:
+        queryset = definition['model'].objects.filter(**{
+            f"{definition['filters'][field]}__{operator}": value
+            for field, operator, value in filters
+        })
+    except (ValidationError, ValueError, TypeError) as e:
+        raise QueryError(f"Invalid filter value: {' '.join(getattr(e, 'messages', [str(e)]))}")
+    columns = {
+        dimension: (
+            DATE_BUCKETS[dimension](definition['date'])
+            if dimension in DATE_BUCKETS else F(definition['dimensions'][dimension])
+        )
+        for dimension in dimensions
+    }
+    # Aliases must not clash with model fields, so expressions are added
+    # under a prefix and renamed when rows are read
+    return queryset.values(**{f"dim_{name}": column for name, column in columns.items()})
+
+
+class PercentileCont(Aggregate):
+    """
+    Continuous percentile of an expression (PostgreSQL's PERCENTILE_CONT).
+    """
+    function = 'PERCENTILE_CONT'
+    name = 'PercentileCont'
+    output_field = FloatField()
+    template = '%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+    def __init__(self, expression, fraction, **extra):
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+def native_percentiles():
+    """Whether the database computes percentiles in SQL."""
+    return connection.vendor == 'postgresql'
+
+
+def percentile_fraction(aggregate):
+    """
+    Get the fraction of a percentile aggregate ("median", "p90", "p99.9").
+
+    Returns:
+        float or None: Fraction between 0 and 1, None for other aggregates
+    """
+    if aggregate == 'median':
+        return 0.5
+    match = PERCENTILE_PATTERN.match(aggregate)
+    return float(match.group(1)) / 100 if match else None
+
+
+def metric_expression(source, aggregate, measure):
+    """Build the aggregate expression of a metric."""
+    definition = _source(source)
+    if measure is None:
+        return Count('pk')
+    fraction = percentile_fraction(aggregate)
+    if fraction is not None:
+        return PercentileCont(definition['measures'][measure], fraction)
+    return AGGREGATES[aggregate](definition['measures'][measure])
+
+
+def to_json_value(value, digits=2):
+    """Convert an aggregate or dimension value to a JSON friendly value."""
+    if isinstance(value, Decimal):
+        return round(float(value), digits)
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def compile_grouped(source, dimensions, filters, expressions):
+    """
+    Compile a grouped aggregation into a single statement.
+
+    Args:
+        source: Source name
+        dimensions: Validated dimension names (at least one)
+        filters: Validated filters
+        expressions: Metric alias -> aggregate expression
+
+    Returns:
+        QuerySet: Values queryset of dim_<dimension> and metric columns,
+            ordered by the dimensions
+    """
+    return build_queryset(source, dimensions, filters).annotate(**expressions).order_by(
+        *[f"dim_{name}" for name in dimensions]
+    )
+
+
+def check_cost(queryset, max_cost):
+    """
+    Reject a query whose planner cost estimate exceeds max_cost.
+
+    Only PostgreSQL exposes comparable cost estimates; elsewhere the check
+    is skipped and the row limit is the only guard.
+
+    Raises:
+        QueryError: If the estimated cost is too high
+    """
+    if not max_cost or connection.vendor != 'postgresql':
+        return
+    plan = json.loads(queryset.explain(format='json'))
+    cost = plan[0]['Plan']['Total Cost']
+    if cost > max_cost:
+        raise QueryError(
+            f"Query is too expensive (estimated cost {cost:.0f}, limit {max_cost}); "
+            "narrow the filters or use fewer dimensions"
+        )
+
+
+def _python_percentiles(source, dimensions, filters, metrics):
+    """
+    Compute percentile metrics with numpy, for databases without PERCENTILE_CONT.
+
+    Returns:
+        dict: Dimension value tuple -> {metric alias: value}
+    """
+    definition = _source(source)
+    measures = sorted({measure for _, measure in metrics})
+    queryset = build_queryset(source, dimensions, filters).values(
+        *[f"dim_{name}" for name in dimensions],
+        **{f"measure_{measure}": F(definition['measures'][measure]) for measure in measures},
+    )
+    samples = defaultdict(lambda: defaultdict(list))
+    for row in queryset.iterator():
+        key = tuple(row[f"dim_{name}"] for name in dimensions)
+        for measure in measures:
+            if row[f"measure_{measure}"] is not None:
+                samples[key][measure].append(float(row[f"measure_{measure}"]))
+
+    results = {}
+    for key, values in samples.items():
+        results[key] = {
+            metric_alias(aggregate, measure): (
+                float(np.percentile(values[measure], percentile_fraction(aggregate) * 100))
+                if values[measure] else None
+            )
+            for aggregate, measure in metrics
+        }
+    return results
+
+
+def run_grouped(source, dimensions, filters, metrics, max_rows=None, max_cost=None):
+    """
+    Run one grouped statement computing several metrics.
+
+    Percentiles are computed in the same statement on PostgreSQL; other
+    databases compute them with numpy from a second query.
+
+    Args:
+        source: Source name
+        dimensions: Validated dimension names
+        filters: Validated filters
+        metrics: Parsed (aggregate, measure) metrics
+        max_rows: Maximum number of groups (None for no limit)
+        max_cost: Maximum planner cost estimate (None for no limit)
+
+    Returns:
+        list: Rows as dicts of dimension values and metric aliases
+
+    Raises:
+        QueryError: If the result has more than max_rows groups or the
+            query is too expensive
+    """
+    in_sql = [
+        metric for metric in metrics
+        if native_percentiles() or percentile_fraction(metric[0]) is None
+    ]
+    in_python = [metric for metric in metrics if metric not in in_sql]
+    expressions = {
+        metric_alias(aggregate, measure): metric_expression(source, aggregate, measure)
+        for aggregate, measure in in_sql
+    }
+    if not expressions:
+        # Group rows still come from SQL; the row count is dropped afterwards
+        expressions['_rows'] = Count('pk')
+
+    if dimensions:
+        queryset = compile_grouped(source, dimensions, filters, expressions)
+        check_cost(queryset, max_cost)
+        rows = list(queryset[:max_rows + 1] if max_rows else queryset)
+        if max_rows and len(rows) > max_rows:
+            raise QueryError(
+                f"Result has more than {max_rows} groups; narrow the filters or use fewer dimensions"
+            )
+    else:
+        # Without dimensions the aggregate covers the whole filtered table
+        queryset = build_queryset(source, [], filters)
+        check_cost(queryset.annotate(**expressions), max_cost)
+        rows = [queryset.aggregate(**expressions)]
+
+    percentiles = _python_percentiles(source, dimensions, filters, in_python) if in_python else {}
+    results = []
+    for row in rows:
+        group = tuple(row[f"dim_{name}"] for name in dimensions)
+        row.update(percentiles.get(group, {
+            metric_alias(aggregate, measure): None for aggregate, measure in in_python
+        }))
+        row.pop('_rows', None)
+        results.append({
+            (key[len('dim_'):] if key.startswith('dim_') else key): to_json_value(value)
+            for key, value in row.items()
+        })
+    return results
+
+
+def parse_query(data):
+    """
+    Validate an ad-hoc aggregation query.
+
+    Example:
+        {"source": "attendance", "dimensions": ["department", "month"],
+         "metrics": ["count", "avg:hours_worked", "p95:hours_worked"],
+         "filters": {"date__gte": "2024-01-01", "status__in": ["present", "late"]}}
+
+    Dimensions and metrics may also be given as comma-separated strings.
+
+    Args:
+        data: Query mapping
+
+    Returns:
+        dict: Normalized query (source, dimensions, metrics, filters)
+
+    Raises:
+        QueryError: If the query is invalid or too large
+    """
+    if not isinstance(data, dict):
+        raise QueryError("The query must be an object")
+    source = data.get('source')
+    dimensions = data.get('dimensions') or []
+    metrics = data.get('metrics') or ['count']
+    if isinstance(dimensions, str):
+        dimensions = [name for name in dimensions.split(',') if name]
+    if isinstance(metrics, str):
+        metrics = [name for name in metrics.split(',') if name]
+    if not isinstance(dimensions, list) or not isinstance(metrics, list):
+        raise QueryError("Dimensions and metrics must be lists")
+    if len(dimensions) > MAX_DIMENSIONS:
+        raise QueryError(f"At most {MAX_DIMENSIONS} dimensions are allowed")
+    if len(metrics) > MAX_METRICS:
+        raise QueryError(f"At most {MAX_METRICS} metrics are allowed")
+    filters = data.get('filters')
+
+    parsed_metrics = []
+    for metric in metrics:
+        parsed = parse_metric(source, metric)
+        if parsed not in parsed_metrics:
+            parsed_metrics.append(parsed)
+    return {
+        'source': source,
+        'dimensions': parse_dimensions(source, dimensions),
+        'metrics': parsed_metrics,
+        'filters': parse_filters(source, filters),
+    }
+
+
+def run_query(query, max_rows=None, max_cost=None):
+    """
+    Run a parsed aggregation query and return columnar results.
+
+    Args:
+        query: Normalized query from parse_query()
+        max_rows: Maximum number of groups
+        max_cost: Maximum planner cost estimate
+
+    Returns:
+        dict: Row count and one list of values per column
+
+    Raises:
+        QueryError: If a limit is exceeded
+    """
+    rows = run_grouped(
+        query['source'], query['dimensions'], query['filters'], query['metrics'],
+        max_rows=max_rows, max_cost=max_cost,
+    )
+    names = query['dimensions'] + [metric_alias(*metric) for metric in query['metrics']]
+    return {
+        'row_count': len(rows),
+        'columns': {name: [row[name] for row in rows] for name in names},
+    }
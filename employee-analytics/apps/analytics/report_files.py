@@ -0,0 +1,165 @@
+import gzip
+import json
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+# Report files are gzip compressed NDJSON, one JSON array per row. Every chunk
+# of rows is an independent gzip member, so the file is a valid .ndjson.gz as a
+# whole while a page of rows only needs its own members read and decompressed.
+REPORT_FORMAT = 'ndjson+gzip'
+
+
+class ReportFileWriter:
+    """
+    Write report rows to a chunked, gzip compressed NDJSON file.
+
+    Rows are buffered one chunk at a time and spooled to a temporary file,
+    so memory use does not grow with the report size.
+    """
+
+    def __init__(self, columns, chunk_size=2000):
+        """
+        Args:
+            columns: Column names, in row order
+            chunk_size: Rows per gzip member
+        """
+        self.columns = list(columns)
+        self.chunk_size = chunk_size
+        self.file = tempfile.TemporaryFile()
+        self.chunks = []
+        self.buffer = []
+        self.row_count = 0
+
+    def write(self, row):
+        """Append a row (a list of JSON friendly values)."""
+        self.buffer.append(json.dumps(row, separators=(',', ':')))
+        self.row_count += 1
+        if len(self.buffer) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        """Compress the buffered rows as one gzip member."""
+        if not self.buffer:
+            return
+        data = gzip.compress(('\n'.join(self.buffer) + '\n').encode(), compresslevel=6)
+        self.chunks.append({
+            'offset': self.file.tell(),
+            'length': len(data),
+            'first_row': self.row_count - len(self.buffer),
+            'rows': len(self.buffer),
+        })
+        self.file.write(data)
+        self.buffer = []
+
+    def save(self, name):
+        """
+        Store the file in the default storage.
+
+        Args:
+            name: Storage path to save the file under
+
+        Returns:
+            tuple: (stored path, manifest describing columns and chunks)
+        """
+        self._flush()
+        self.file.seek(0)
+        try:
+            path = default_storage.save(name, File(self.file))
+        finally:
+            self.file.close()
+        manifest = {
+            'format': REPORT_FORMAT,
+            'columns': self.columns,
+            'row_count': self.row_count,
+            'size': sum(chunk['length'] for chunk in self.chunks),
+            'chunks': self.chunks,
+        }
+        return path, manifest
+
+
+def report_file_name(report):
+    """Storage path of the result file of a report."""
+    return f"reports/report-{report.pk}-{report.parameters_hash[:12]}.ndjson.gz"
+
+
+def project(columns, selected):
+    """
+    Resolve a column projection to row indexes.
+
+    Args:
+        columns: All column names of the report
+        selected: Column names to keep, in output order (None for all)
+
+    Returns:
+        tuple: (selected column names, their indexes)
+
+    Raises:
+        ValueError: If a selected column does not exist
+    """
+    if not selected:
+        return list(columns), list(range(len(columns)))
+    unknown = [name for name in selected if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return list(selected), [columns.index(name) for name in selected]
+
+
+def iter_rows(report, offset=0, limit=None, columns=None):
+    """
+    Read rows of a stored report, decompressing only the chunks needed.
+
+    Args:
+        report: Completed AnalyticsReport with a result file
+        offset: Index of the first row to return
+        limit: Maximum number of rows (None for all remaining rows)
+        columns: Column indexes to keep (None for all)
+
+    Yields:
+        list: Row values
+    """
+    manifest = report.result_manifest
+    end = manifest['row_count'] if limit is None else min(offset + limit, manifest['row_count'])
+    if offset >= end:
+        return
+
+    with default_storage.open(report.result_file.name, 'rb') as handle:
+        for chunk in manifest['chunks']:
+            chunk_end = chunk['first_row'] + chunk['rows']
+            if chunk_end <= offset:
+                continue
+            if chunk['first_row'] >= end:
+                break
+            handle.seek(chunk['offset'])
+            lines = gzip.decompress(handle.read(chunk['length'])).splitlines()
+            start = max(offset - chunk['first_row'], 0)
+            stop = min(end, chunk_end) - chunk['first_row']
+            for line in lines[start:stop]:
+                row = json.loads(line)
+                yield row if columns is None else [row[index] for index in columns]
+
+
+def iter_bytes(path, start=0, end=None, block_size=64 * 1024):
+    """
+    Stream a byte range of a stored file.
+
+    Args:
+        path: Storage path
+        start: First byte
+        end: Last byte, inclusive (None for the end of the file)
+        block_size: Bytes read per iteration
+
+    Yields:
+        bytes: File blocks
+    """
+    with default_storage.open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            block = handle.read(block_size if remaining is None else min(block_size, remaining))
+            if not block:
+                break
+            if remaining is not None:
+                remaining -= len(block)
+            yield block
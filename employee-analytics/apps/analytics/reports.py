@@ -0,0 +1,145 @@
+from django.db.models import Avg, Count, Q
+
+from apps.attendance.models import Attendance
+from apps.employees.models import Department, Employee
+from apps.performance.models import Performance
+from utils.periods import parse_date_param
+from .query_engine import (
+    QueryError, compile_grouped, metric_alias, metric_expression, native_percentiles,
+    parse_query, percentile_fraction,
+)
+
+
+def _department(parameters):
+    """Parse an optional department primary key report parameter."""
+    value = parameters.get('department')
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid department '{value}'")
+
+
+def employee_summary(parameters):
+    """One row per employee with department, position and salary."""
+    queryset = Employee.objects.order_by('id')
+    department = _department(parameters)
+    if department:
+        queryset = queryset.filter(department_id=department)
+    if not parameters.get('include_inactive'):
+        queryset = queryset.filter(is_active=True)
+    return queryset.values_list(
+        'employee_id', 'first_name', 'last_name', 'department__name', 'position__title',
+        'hire_date', 'salary', 'is_active',
+    ), [
+        'employee_id', 'first_name', 'last_name', 'department', 'position',
+        'hire_date', 'salary', 'is_active',
+    ]
+
+
+def department_analysis(parameters):
+    """One row per department with its positions and active headcount."""
+    active = Q(employees__is_active=True)
+    queryset = Department.objects.order_by('id').annotate(
+        employee_count=Count('employees', filter=active, distinct=True),
+        avg_salary=Avg('employees__salary', filter=active),
+        position_count=Count('positions', distinct=True),
+    )
+    return queryset.values_list(
+        'id', 'name', 'employee_count', 'avg_salary', 'position_count',
+    ), ['department_id', 'department', 'employee_count', 'avg_salary', 'position_count']
+
+
+def attendance_report(parameters):
+    """One row per attendance record in the date range."""
+    queryset = Attendance.objects.order_by('date', 'id')
+    start_date, end_date = parse_date_param(parameters.get('start_date'), 'start_date'), parse_date_param(parameters.get('end_date'), 'end_date')
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+    department = _department(parameters)
+    if department:
+        queryset = queryset.filter(employee__department_id=department)
+    return queryset.values_list(
+        'date', 'employee__employee_id', 'employee__department__name', 'status',
+        'check_in', 'check_out', 'hours_worked', 'overtime_hours',
+    ), [
+        'date', 'employee_id', 'department', 'status',
+        'check_in', 'check_out', 'hours_worked', 'overtime_hours',
+    ]
+
+
+def performance_report(parameters):
+    """One row per performance review in the date range."""
+    queryset = Performance.objects.order_by('review_date', 'id')
+    start_date, end_date = parse_date_param(parameters.get('start_date'), 'start_date'), parse_date_param(parameters.get('end_date'), 'end_date')
+    if start_date:
+        queryset = queryset.filter(review_date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(review_date__lte=end_date)
+    department = _department(parameters)
+    if department:
+        queryset = queryset.filter(employee__department_id=department)
+    return queryset.values_list(
+        'review_date', 'employee__employee_id', 'employee__department__name',
+        'reviewer__employee_id', 'performance_score', 'goals_achievement', 'status',
+    ), [
+        'review_date', 'employee_id', 'department', 'reviewer_id',
+        'performance_score', 'goals_achievement', 'status',
+    ]
+
+
+def custom_report(parameters):
+    """
+    One row per group of an aggregation query (see query_engine.parse_query).
+
+    Percentile metrics need PostgreSQL here, since the rows are streamed
+    from a single statement.
+    """
+    query = parse_query(parameters)
+    if not query['dimensions']:
+        raise QueryError("Custom reports need at least one dimension")
+    percentiles = [aggregate for aggregate, _ in query['metrics'] if percentile_fraction(aggregate) is not None]
+    if percentiles and not native_percentiles():
+        raise QueryError("Percentile metrics in custom reports require PostgreSQL")
+
+    aliases = [metric_alias(*metric) for metric in query['metrics']]
+    queryset = compile_grouped(query['source'], query['dimensions'], query['filters'], {
+        alias: metric_expression(query['source'], *metric)
+        for alias, metric in zip(aliases, query['metrics'])
+    })
+    return queryset.values_list(
+        *[f"dim_{name}" for name in query['dimensions']], *aliases
+    ), query['dimensions'] + aliases
+
+
+# Report type -> builder returning (values_list queryset, column names)
+REPORT_BUILDERS = {
+    'employee_summary': employee_summary,
+    'department_analysis': department_analysis,
+    'attendance_report': attendance_report,
+    'performance_report': performance_report,
+    'custom': custom_report,
+}
+
+
+def build_report(report_type, parameters):
+    """
+    Get the rows query and column names of a report.
+
+    Args:
+        report_type: One of AnalyticsReport.REPORT_TYPES
+        parameters: Report parameters (start_date, end_date, department, ...)
+
+    Returns:
+        tuple: (values_list queryset, column names)
+
+    Raises:
+        ValueError: If the report type is not supported or a parameter is invalid
+    """
+    builder = REPORT_BUILDERS.get(report_type)
+    if builder is None:
+        raise ValueError(f"Report type '{report_type}' cannot be generated")
+    return builder(parameters or {})
@@ -1,6 +1,10 @@
 
 from rest_framework import serializers
 
+from .query_engine import QueryError
+from .widgets import QUERY_WIDGET_TYPES, parse_widget_config
+from .models import AnalyticsReport, DashboardWidget, CalibrationCycle, ReviewerCalibration, CalibratedScore
+
 
 class EmployeeStatsSerializer(serializers.Serializer):
     """
@@ -49,3 +53,103 @@ class DashboardSummarySerializer(serializers.Serializer):
     department_stats = DepartmentStatsSerializer(many=True)
     attendance_stats = AttendanceStatsSerializer()
     performance_stats = PerformanceStatsSerializer()
+
+
+class ReviewerCalibrationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for reviewer calibration statistics.
+    """
+    reviewer_name = serializers.ReadOnlyField(source='reviewer.full_name')
+    department_name = serializers.ReadOnlyField(source='department.name')
+
+    class Meta:
+        model = ReviewerCalibration
+        fields = [
+            'reviewer', 'reviewer_name', 'department', 'department_name',
+            'review_count', 'mean_score', 'std_score', 'department_mean',
+            'department_std', 'department_bias', 'company_bias'
+        ]
+
+
+class CalibratedScoreSerializer(serializers.ModelSerializer):
+    """
+    Serializer for z-score normalized performance scores.
+    """
+    employee_name = serializers.ReadOnlyField(source='performance.employee.full_name')
+
+    class Meta:
+        model = CalibratedScore
+        fields = ['performance', 'employee_name', 'reviewer', 'raw_score', 'z_score', 'normalized_score']
+
+
+class CalibrationCycleSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a calibration cycle with its reviewer statistics.
+    """
+    reviewers = ReviewerCalibrationSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = CalibrationCycle
+        fields = [
+            'cycle', 'start_date', 'end_date', 'review_count',
+            'company_mean', 'company_std', 'computed_at', 'reviewers'
+        ]
+
+
+class AnalyticsReportSerializer(serializers.ModelSerializer):
+    """
+    Serializer for report jobs: the request and its pollable status.
+    """
+    generated_by_username = serializers.ReadOnlyField(source='generated_by.username')
+    reuse = serializers.BooleanField(
+        default=True, write_only=True,
+        help_text="Return an identical recent or in-progress report instead of generating a new one",
+    )
+
+    class Meta:
+        model = AnalyticsReport
+        fields = [
+            'id', 'title', 'report_type', 'description', 'parameters', 'reuse',
+            'status', 'progress', 'row_count', 'error', 'generated_at',
+            'started_at', 'finished_at', 'generated_by', 'generated_by_username'
+        ]
+        read_only_fields = [
+            'status', 'progress', 'row_count', 'error', 'generated_at',
+            'started_at', 'finished_at', 'generated_by'
+        ]
+        extra_kwargs = {'title': {'required': False}}
+
+    def validate_parameters(self, value):
+        """
+        Check that report parameters are a JSON object.
+        """
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Parameters must be an object.")
+        return value
+
+
+class DashboardWidgetSerializer(serializers.ModelSerializer):
+    """
+    Serializer for dashboard widgets and their query configs.
+    """
+
+    class Meta:
+        model = DashboardWidget
+        fields = [
+            'id', 'title', 'widget_type', 'position', 'size', 'config',
+            'is_visible', 'owner', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['owner', 'created_at', 'updated_at']
+
+    def validate(self, data):
+        """
+        Check that query widgets declare a valid metric, dimensions and filters.
+        """
+        widget_type = data.get('widget_type', getattr(self.instance, 'widget_type', None))
+        config = data.get('config', getattr(self.instance, 'config', {}))
+        if widget_type in QUERY_WIDGET_TYPES:
+            try:
+                parse_widget_config(config)
+            except QueryError as e:
+                raise serializers.ValidationError({'config': str(e)})
+        return data
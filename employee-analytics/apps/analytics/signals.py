@@ -0,0 +1,154 @@
+from datetime import date
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.attendance.models import Attendance
+from apps.employees.models import Department, Employee
+from apps.performance.models import Performance
+from utils.cache import bump_versions
+from utils.periods import period_labels
+from .leaderboards import leaderboard_namespace
+from .query_engine import source_namespace
+
+
+# Cache namespace for the dashboard summary
+DASHBOARD_NAMESPACE = 'dashboard'
+
+
+def _department_id(instance, origin=None):
+    """
+    Get the department of a record's employee.
+
+    Uses the employee when it is already loaded on the record, and otherwise
+    only reads its department_id, once per employee and delete operation.
+    """
+    if instance._meta.get_field('employee').is_cached(instance):
+        return instance.employee.department_id
+    known = origin.__dict__.setdefault('_analytics_department_ids', {}) if origin is not None else {}
+    if instance.employee_id not in known:
+        known[instance.employee_id] = (
+            Employee.objects.filter(pk=instance.employee_id).values_list('department_id', flat=True).first()
+        )
+    return known[instance.employee_id]
+
+
+def _bump(origin, *namespaces):
+    """
+    Bump namespaces; post_delete runs once per deleted row, so a delete
+    operation (origin) bumps each namespace only once.
+    """
+    if origin is not None:
+        bumped = origin.__dict__.setdefault('_analytics_bumped', set())
+        namespaces = [namespace for namespace in namespaces if namespace not in bumped]
+        bumped.update(namespaces)
+    if namespaces:
+        bump_versions(*namespaces)
+
+
+def _deleted_with_employee(origin):
+    """Whether a delete cascades from employees, whose receiver invalidates everything they ranked in."""
+    return isinstance(origin, Employee) or (isinstance(origin, QuerySet) and origin.model is Employee)
+
+
+def _invalidate_record(family, source, day, instance, origin):
+    """Invalidate the caches built from an attendance or performance record, and its department's leaderboards."""
+    if _deleted_with_employee(origin):
+        return
+    department_id = _department_id(instance, origin)
+    _bump(
+        origin, DASHBOARD_NAMESPACE, source_namespace(source),
+        *[leaderboard_namespace(family, label, department_id) for label in period_labels(day)],
+    )
+
+
+def _labels_since(first_day):
+    """Labels of every period from first_day's up to the current ones."""
+    labels = set()
+    # Walk quarter starts: every period label changes on one
+    day = date(first_day.year, 3 * ((first_day.month - 1) // 3) + 1, 1)
+    while day <= timezone.localdate():
+        labels.update(period_labels(day))
+        day = date(day.year + 1, 1, 1) if day.month == 10 else date(day.year, day.month + 3, 1)
+    return labels
+
+
+def _invalidate_employee_leaderboards(employee, department_ids, origin=None):
+    """
+    Invalidate the leaderboards of departments for every period since an
+    employee was hired. Leaderboards rank employees within their current
+    department, so transfers and deletes change all of them.
+    """
+    department_ids = {department_id for department_id in department_ids if department_id is not None}
+    if not department_ids:
+        return
+    labels = _labels_since(employee.hire_date)
+    _bump(origin, *[
+        leaderboard_namespace(family, label, department_id)
+        for family in ('performance', 'attendance')
+        for label in labels
+        for department_id in department_ids
+    ])
+
+
+def invalidate_bulk_changes(first_day):
+    """
+    Invalidate all analytics caches after bulk writes, which send no signals.
+
+    Args:
+        first_day: Earliest attendance or review date written
+    """
+    labels = _labels_since(first_day)
+    department_ids = list(Department.objects.values_list('pk', flat=True))
+    bump_versions(
+        DASHBOARD_NAMESPACE,
+        *[source_namespace(source) for source in ('employees', 'attendance', 'performance')],
+        *[
+            leaderboard_namespace(family, label, department_id)
+            for family in ('performance', 'attendance')
+            for label in labels
+            for department_id in department_ids
+        ],
+    )
+
+
+@receiver([post_save, post_delete], sender=Performance)
+def invalidate_performance_analytics(sender, instance, origin=None, **kwargs):
+    """Invalidate analytics caches built from performance records."""
+    _invalidate_record('performance', 'performance', instance.review_date, instance, origin)
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def invalidate_attendance_analytics(sender, instance, origin=None, **kwargs):
+    """Invalidate analytics caches built from attendance records."""
+    _invalidate_record('attendance', 'attendance', instance.date, instance, origin)
+
+
+@receiver(post_init, sender=Employee)
+def remember_department(sender, instance, **kwargs):
+    """Remember the department as loaded, to detect transfers on save."""
+    instance._leaderboard_department_id = instance.__dict__.get('department_id')
+
+
+@receiver(post_save, sender=Employee)
+def invalidate_employee_analytics(sender, instance, created, **kwargs):
+    """Invalidate analytics caches built from employee records, and both departments' leaderboards on transfers."""
+    bump_versions(DASHBOARD_NAMESPACE, source_namespace('employees'))
+    previous = instance._leaderboard_department_id
+    current = instance.__dict__.get('department_id')
+    instance._leaderboard_department_id = current
+    if not created and 'department_id' in instance.__dict__ and previous != current:
+        _invalidate_employee_leaderboards(instance, (previous, current))
+
+
+@receiver(post_delete, sender=Employee)
+def invalidate_deleted_employee_analytics(sender, instance, origin=None, **kwargs):
+    """
+    Invalidate analytics caches built from employee records, and the
+    leaderboards that ranked the employee. The attendance and performance
+    records deleted with the employee are covered here, once per delete.
+    """
+    _bump(origin, DASHBOARD_NAMESPACE, *[source_namespace(source) for source in ('employees', 'attendance', 'performance')])
+    _invalidate_employee_leaderboards(instance, (instance.department_id,), origin)
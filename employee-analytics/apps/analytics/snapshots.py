@@ -0,0 +1,275 @@
+import logging
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.attendance.models import Attendance
+from apps.employees.models import Department, Employee
+from apps.performance.models import Performance
+from .models import AnalyticsSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+# Snapshot name -> defining query and the columns uniquely identifying a row
+# (required by REFRESH MATERIALIZED VIEW CONCURRENTLY on PostgreSQL). The
+# storage is created by migrations: changing a definition needs a migration
+# recreating the view/table (see 0007_snapshot_storage).
+SNAPSHOTS = {
+    'department_stats': {
+        'sql': (
+            "SELECT d.id AS department_id, d.name AS department_name, "
+            "COUNT(e.id) AS employee_count, SUM(e.salary) AS salary_sum, "
+            "MIN(e.salary) AS min_salary, MAX(e.salary) AS max_salary "
+            "FROM {department} d LEFT JOIN {employee} e "
+            "ON e.department_id = d.id AND e.is_active = TRUE "
+            "GROUP BY d.id, d.name"
+        ),
+        'unique': ['department_id'],
+    },
+    'employee_hires': {
+        'sql': (
+            "SELECT hire_date, COUNT(*) AS employee_count "
+            "FROM {employee} WHERE is_active = TRUE GROUP BY hire_date"
+        ),
+        'unique': ['hire_date'],
+    },
+    'attendance_daily': {
+        'sql': (
+            "SELECT date, status, COUNT(*) AS record_count, "
+            "SUM(hours_worked) AS hours_sum, SUM(overtime_hours) AS overtime_sum "
+            "FROM {attendance} GROUP BY date, status"
+        ),
+        'unique': ['date', 'status'],
+    },
+    'performance_daily': {
+        'sql': (
+            "SELECT review_date, status, COUNT(*) AS review_count, "
+            "SUM(performance_score) AS score_sum, SUM(goals_achievement) AS goals_sum "
+            "FROM {performance} GROUP BY review_date, status"
+        ),
+        'unique': ['review_date', 'status'],
+    },
+}
+
+
+def snapshot_table(name):
+    """Database name of the view/table holding a snapshot."""
+    return f"analytics_snapshot_{name}"
+
+
+def _definition(name):
+    """Get the defining query of a snapshot with the real table names filled in."""
+    return SNAPSHOTS[name]['sql'].format(
+        department=Department._meta.db_table,
+        employee=Employee._meta.db_table,
+        attendance=Attendance._meta.db_table,
+        performance=Performance._meta.db_table,
+    )
+
+
+def _materialized():
+    """Whether snapshots are stored as materialized views on this database."""
+    return connection.vendor == 'postgresql'
+
+
+def refresh_snapshot(name):
+    """
+    Recompute a snapshot and record when it was refreshed.
+
+    Materialized views are refreshed CONCURRENTLY so readers are never
+    blocked; plain tables are rebuilt inside a transaction.
+
+    Args:
+        name: Snapshot name, one of SNAPSHOTS
+
+    Returns:
+        AnalyticsSnapshot: Refresh bookkeeping record
+    """
+    table = snapshot_table(name)
+    started = time.monotonic()
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if _materialized():
+                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {table}")
+            else:
+                cursor.execute(f"DELETE FROM {table}")
+                cursor.execute(f"INSERT INTO {table} {_definition(name)}")
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            row_count = cursor.fetchone()[0]
+
+        snapshot, _ = AnalyticsSnapshot.objects.update_or_create(
+            name=name,
+            defaults={
+                'refreshed_at': timezone.now(),
+                'duration_ms': int((time.monotonic() - started) * 1000),
+                'row_count': row_count,
+            },
+        )
+    return snapshot
+
+
+def refresh_all(names=None):
+    """
+    Refresh several snapshots, logging failures without stopping the others.
+
+    Args:
+        names: Snapshot names to refresh (default: all)
+
+    Returns:
+        list: AnalyticsSnapshot records of the refreshed snapshots
+    """
+    refreshed = []
+    for name in names or SNAPSHOTS:
+        try:
+            refreshed.append(refresh_snapshot(name))
+        except Exception:
+            logger.exception("Refreshing analytics snapshot %s failed", name)
+    return refreshed
+
+
+def parse_max_staleness(request):
+    """
+    Get the staleness (in seconds) the caller accepts from snapshot data.
+
+    Args:
+        request: HTTP request with an optional max_staleness parameter
+
+    Returns:
+        int or None: Accepted staleness, None when the caller wants live data
+    """
+    value = request.query_params.get('max_staleness')
+    try:
+        return max(int(value), 0) if value else None
+    except ValueError:
+        return None
+
+
+def snapshots_fresh(names, max_staleness):
+    """
+    Check that snapshots exist and were refreshed within max_staleness seconds.
+
+    Args:
+        names: Snapshot names the caller reads
+        max_staleness: Accepted staleness in seconds, None for live data only
+
+    Returns:
+        datetime or None: Oldest refresh time when all are fresh enough, else None
+    """
+    if max_staleness is None:
+        return None
+    refreshed = dict(
+        AnalyticsSnapshot.objects.filter(name__in=names).values_list('name', 'refreshed_at')
+    )
+    if len(refreshed) < len(names):
+        return None
+    oldest = min(refreshed.values())
+    if oldest < timezone.now() - timedelta(seconds=max_staleness):
+        return None
+    return oldest
+
+
+def _fetch(sql, params=()):
+    """Run a query against snapshot storage and return rows as dicts."""
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _date_filter(column, start_date, end_date):
+    """Build a WHERE clause and params restricting a date column."""
+    clauses, params = [], []
+    if start_date:
+        clauses.append(f"{column} >= %s")
+        params.append(str(start_date))
+    if end_date:
+        clauses.append(f"{column} <= %s")
+        params.append(str(end_date))
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+
+def _number(value, digits):
+    """Round a snapshot aggregate (which may come back as float) to a Decimal."""
+    return round(Decimal(str(value or 0)), digits)
+
+
+def employee_stats():
+    """Active headcount and new hires this month, from the employee_hires snapshot."""
+    first_of_month = timezone.localdate().replace(day=1)
+    row = _fetch(
+        "SELECT SUM(employee_count) AS total_employees, "
+        "SUM(CASE WHEN hire_date >= %s THEN employee_count ELSE 0 END) AS new_hires_this_month "
+        f"FROM {snapshot_table('employee_hires')}",
+        [str(first_of_month)],
+    )[0]
+    return {key: int(value or 0) for key, value in row.items()}
+
+
+def department_stats():
+    """Per-department headcount and salary statistics, from the department_stats snapshot."""
+    rows = _fetch(
+        "SELECT department_id, department_name, employee_count, salary_sum, min_salary, max_salary "
+        f"FROM {snapshot_table('department_stats')} ORDER BY employee_count DESC, department_name"
+    )
+    return [
+        {
+            'department_id': row['department_id'],
+            'department_name': row['department_name'],
+            'employee_count': row['employee_count'],
+            'avg_salary': _number(
+                (row['salary_sum'] or 0) / row['employee_count'] if row['employee_count'] else 0, 2
+            ),
+            'min_salary': _number(row['min_salary'], 2),
+            'max_salary': _number(row['max_salary'], 2),
+        }
+        for row in rows
+    ]
+
+
+def attendance_stats(start_date=None, end_date=None):
+    """Attendance status counts and hours for a date range, from the attendance_daily snapshot."""
+    where, params = _date_filter('date', start_date, end_date)
+    rows = _fetch(
+        "SELECT status, SUM(record_count) AS record_count, SUM(hours_sum) AS hours_sum, "
+        f"SUM(overtime_sum) AS overtime_sum FROM {snapshot_table('attendance_daily')} "
+        f"{where} GROUP BY status",
+        params,
+    )
+    counts = {row['status']: int(row['record_count']) for row in rows}
+    total = sum(counts.values())
+    hours = sum(float(row['hours_sum'] or 0) for row in rows)
+    overtime = sum(float(row['overtime_sum'] or 0) for row in rows)
+
+    stats = {'total_records': total}
+    for status_value, _ in Attendance.STATUS_CHOICES:
+        stats[f"{status_value}_count"] = counts.get(status_value, 0)
+    stats['avg_hours_worked'] = _number(hours / total if total else 0, 2)
+    stats['total_overtime_hours'] = _number(overtime, 2)
+    return stats
+
+
+def performance_stats(start_date=None, end_date=None):
+    """Review status counts and averages for a date range, from the performance_daily snapshot."""
+    where, params = _date_filter('review_date', start_date, end_date)
+    rows = _fetch(
+        "SELECT status, SUM(review_count) AS review_count, SUM(score_sum) AS score_sum, "
+        f"SUM(goals_sum) AS goals_sum FROM {snapshot_table('performance_daily')} "
+        f"{where} GROUP BY status",
+        params,
+    )
+    counts = {row['status']: int(row['review_count']) for row in rows}
+    total = sum(counts.values())
+    scores = sum(float(row['score_sum'] or 0) for row in rows)
+    goals = sum(float(row['goals_sum'] or 0) for row in rows)
+
+    stats = {'total_reviews': total}
+    stats['avg_performance_score'] = _number(scores / total if total else 0, 1)
+    stats['avg_goals_achievement'] = _number(goals / total if total else 0, 2)
+    for status_value, _ in Performance.STATUS_CHOICES:
+        stats[f"{status_value}_count"] = counts.get(status_value, 0)
+    return stats
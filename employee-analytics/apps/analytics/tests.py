@@ -0,0 +1,207 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.employees.models import Department, Employee
+from apps.performance.models import Performance
+from utils.query_budget import QueryBudgetExceeded, assert_query_budget
+from utils.testing import QueryBudgetTestMixin
+
+
+class DashboardQueryBudgetTests(QueryBudgetTestMixin, TransactionTestCase):
+    """
+    The dashboard stays within its query budget.
+
+    Dashboard sections run in pool threads with their own connections, which
+    only see committed data, hence a TransactionTestCase.
+    """
+
+    def setUp(self):
+        self.create_data()
+        super().setUp()
+
+    def test_dashboard(self):
+        response = self.assertWithinBudget('get', '/api/dashboard/')
+        self.assertFalse(response.data['partial'])
+        self.assertWithinBudget('get', '/api/dashboard/', {'start_date': '2020-01-01', 'end_date': '2099-12-31'})
+
+    def test_dashboard_counts_pooled_sections(self):
+        # The four sections run in pool threads; their queries must still count
+        cache.clear()
+        with self.assertRaises(QueryBudgetExceeded):
+            assert_query_budget(self.client, 'get', '/api/dashboard/', budget=3)
+
+    def test_dashboard_from_snapshots(self):
+        self.refresh_snapshots()
+        response = self.assertWithinBudget('get', '/api/dashboard/', {'max_staleness': 3600})
+        self.assertIn('snapshot_refreshed_at', response.data)
+        self.assertWithinBudget('get', '/api/dashboard/', {
+            'max_staleness': 3600, 'start_date': '2020-01-01', 'end_date': '2099-12-31',
+        })
+
+
+def create_employees(*employees):
+    """Bulk create employees from (code, department, hire_date, extra fields) tuples."""
+    return Employee.objects.bulk_create([
+        Employee(
+            employee_id=code, first_name='Test', last_name=code, email=f'{code.lower()}@example.com',
+            department=department, hire_date=hire_date, salary=Decimal('50000.00'), **fields,
+        )
+        for code, department, hire_date, fields in employees
+    ])
+
+
+class CalibrationTests(TestCase):
+    """Reviewer calibration statistics on hand-built reviews."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('calibration', 'calibration@example.com', 'calibration')
+        engineering = Department.objects.create(name='Engineering')
+        sales = Department.objects.create(name='Sales')
+        first, second, third, fourth, cls.lenient, cls.strict = create_employees(
+            *[(f'K00{number}', engineering, date(2023, 1, 1), {}) for number in range(1, 6)],
+            # No reviewees in the strict reviewer's department
+            ('K006', sales, date(2023, 1, 1), {}),
+        )
+        reviews = [
+            (first, cls.lenient, date(2024, 1, 10), '4.0'),
+            (second, cls.lenient, date(2024, 2, 10), '5.0'),
+            (third, cls.strict, date(2024, 2, 20), '2.0'),
+            (fourth, cls.strict, date(2024, 3, 10), '3.0'),
+            (first, None, date(2024, 3, 20), '3.0'),
+            # Outside the cycle
+            (second, cls.strict, date(2024, 4, 10), '1.0'),
+        ]
+        Performance.objects.bulk_create([
+            Performance(
+                employee=employee, reviewer=reviewer, review_date=review_date,
+                performance_score=Decimal(score), goals_achievement=Decimal('50.00'), status='good',
+            )
+            for employee, reviewer, review_date, score in reviews
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/analytics/calibration/', {'cycle': '2024-Q1'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_cycle_statistics(self):
+        response = self.client.get('/api/analytics/calibration/', {'cycle': '2024-Q1'})
+        self.assertEqual(response.data['review_count'], 5)
+        self.assertAlmostEqual(response.data['company_mean'], 3.4)
+        self.assertAlmostEqual(response.data['company_std'], 1.1402, places=4)
+
+        reviewers = {row['reviewer']: row for row in response.data['reviewers']}
+        self.assertEqual(set(reviewers), {self.lenient.pk, self.strict.pk})
+        lenient, strict = reviewers[self.lenient.pk], reviewers[self.strict.pk]
+        self.assertEqual((lenient['review_count'], lenient['mean_score']), (2, 4.5))
+        self.assertAlmostEqual(lenient['std_score'], 0.7071, places=4)
+        self.assertAlmostEqual(lenient['department_mean'], 3.4)
+        self.assertAlmostEqual(lenient['department_bias'], 0.9648, places=4)
+        self.assertAlmostEqual(lenient['company_bias'], 0.9648, places=4)
+        self.assertEqual(strict['mean_score'], 2.5)
+        self.assertIsNone(strict['department_mean'])
+        self.assertIsNone(strict['department_bias'])
+        self.assertAlmostEqual(strict['company_bias'], -0.7894, places=4)
+
+    def test_normalized_scores(self):
+        response = self.client.get('/api/analytics/calibration/', {'cycle': '2024-Q1', 'reviewer': self.lenient.pk})
+        scores = {row['raw_score']: row for row in response.data['scores']}
+        self.assertEqual(set(scores), {'4.0', '5.0'})
+        self.assertAlmostEqual(scores['4.0']['z_score'], -0.7071, places=4)
+        self.assertEqual(scores['4.0']['normalized_score'], 2.59)
+        self.assertEqual(scores['5.0']['normalized_score'], 4.21)
+
+    def test_recompute_replaces_results(self):
+        self.client.post('/api/analytics/calibration/', {'cycle': '2024-Q1'}, format='json')
+        response = self.client.get('/api/analytics/calibration/', {'cycle': '2024-Q1'})
+        self.assertEqual(len(response.data['reviewers']), 2)
+
+    def test_invalid_parameters(self):
+        response = self.client.get('/api/analytics/calibration/', {'cycle': '2024-Q1', 'reviewer': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/analytics/calibration/', {'cycle': '2024-Q5'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/analytics/calibration/', {'cycle': '2023'})
+        self.assertEqual(response.status_code, 404)
+
+
+class CohortRetentionTests(TestCase):
+    """Hire-cohort retention on hand-built employees."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('cohorts', 'cohorts@example.com', 'cohorts')
+        engineering = Department.objects.create(name='Engineering')
+        cls.sales = Department.objects.create(name='Sales')
+        create_employees(
+            ('Q001', engineering, date(2024, 1, 15), {'is_active': False, 'termination_date': date(2024, 3, 25)}),
+            ('Q002', engineering, date(2024, 2, 1), {'is_active': False, 'termination_date': date(2024, 8, 1)}),
+            # Inactive without a termination date: counted as leaving in the hire quarter
+            ('Q003', engineering, date(2024, 3, 10), {'is_active': False}),
+            ('Q004', cls.sales, date(2024, 3, 20), {}),
+            ('Q005', engineering, date(2024, 5, 1), {}),
+            ('Q006', engineering, date(2024, 5, 2), {'is_active': False, 'termination_date': date(2025, 1, 10)}),
+        )
+        today = timezone.localdate()
+        # Quarters from 2024-Q1 to the current quarter
+        cls.periods = (today.year - 2024) * 4 + (today.month - 1) // 3 + 1
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Retention is cached per day, across test data sets
+        cache.clear()
+
+    def cohorts(self, **params):
+        response = self.client.get('/api/analytics/cohorts/retention/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_quarterly_retention(self):
+        data = self.cohorts()
+        self.assertEqual(data['periods'], self.periods)
+        first, second = data['cohorts']
+        self.assertEqual((first['cohort'], first['start'], first['size']), ('2024-Q1', '2024-01-01', 4))
+        self.assertEqual(first['unknown_terminations'], 1)
+        self.assertEqual(first['retained'], [2, 2] + [1] * (self.periods - 2))
+        self.assertEqual(first['retention'][:3], [50.0, 50.0, 25.0])
+        self.assertEqual((second['cohort'], second['size']), ('2024-Q2', 2))
+        self.assertEqual(second['retained'], [2, 2, 2] + [1] * (self.periods - 4))
+        self.assertEqual(second['retention'][3], 50.0)
+
+    def test_monthly_cohorts(self):
+        data = self.cohorts(interval='month')
+        self.assertEqual(
+            [(cohort['cohort'], cohort['size']) for cohort in data['cohorts']],
+            [('2024-01', 1), ('2024-02', 1), ('2024-03', 2), ('2024-05', 2)],
+        )
+        self.assertEqual(data['cohorts'][0]['retained'][:3], [1, 1, 0])
+
+    def test_filters_and_departments(self):
+        second, = self.cohorts(start_date='2024-04-01')['cohorts']
+        self.assertEqual(second['cohort'], '2024-Q2')
+        cohort, = self.cohorts(department=self.sales.pk)['cohorts']
+        self.assertEqual((cohort['size'], cohort['retained'][-1]), (1, 1))
+
+        by_department = {
+            (cohort['cohort'], cohort['department_name']): cohort['retained'][:3]
+            for cohort in self.cohorts(group_by='department')['cohorts']
+        }
+        self.assertEqual(by_department, {
+            ('2024-Q1', 'Engineering'): [1, 1, 0],
+            ('2024-Q1', 'Sales'): [1, 1, 1],
+            ('2024-Q2', 'Engineering'): [2, 2, 2],
+        })
+
+    def test_invalid_parameters(self):
+        for params in ({'interval': 'year'}, {'group_by': 'position'}, {'start_date': '2024-02-30'}, {'department': 'abc'}):
+            response = self.client.get('/api/analytics/cohorts/retention/', params)
+            self.assertEqual(response.status_code, 400, params)
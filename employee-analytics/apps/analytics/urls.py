@@ -1,8 +1,22 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import (
+    health_check, dashboard_summary, calibration_summary, leaderboard, aggregate,
+    cohort_retention, attendance_performance, profiling_config, AnalyticsReportViewSet, DashboardWidgetViewSet
+)
 
-from django.urls import path
-from .views import health_check, dashboard_summary
+router = DefaultRouter()
+router.register(r'analytics/reports', AnalyticsReportViewSet)
+router.register(r'dashboard/widgets', DashboardWidgetViewSet)
 
 urlpatterns = [
+    path('', include(router.urls)),
     path('health/', health_check, name='health_check'),
     path('dashboard/', dashboard_summary, name='dashboard_summary'),
+    path('analytics/calibration/', calibration_summary, name='calibration_summary'),
+    path('analytics/leaderboards/<str:kind>/', leaderboard, name='leaderboard'),
+    path('analytics/aggregate/', aggregate, name='aggregate'),
+    path('analytics/profiling/', profiling_config, name='profiling_config'),
+    path('analytics/cohorts/retention/', cohort_retention, name='cohort_retention'),
+    path('analytics/correlations/attendance-performance/', attendance_performance, name='attendance_performance'),
 ]
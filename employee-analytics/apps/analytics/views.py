@@ -1,15 +1,48 @@
 
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Avg, Count, Min, Max, Sum
-from django.http import JsonResponse
+from django.conf import settings
+from django.db.models import Avg, Count, Min, Max, Sum, Q
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
+import itertools
+import json
+
+from django.db.models import Prefetch
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters
 
 from apps.employees.models import Employee, Department
 from apps.attendance.models import Attendance
 from apps.performance.models import Performance
+from utils.cache import make_key, get_or_refresh, get_or_set
+from utils.concurrency import get_executor, run_parallel
+from utils import profiling
+from utils.periods import parse_date_param, parse_period
+from utils.query_budget import query_budget
+from . import report_files, snapshots
+from .calibration import run_calibration
+from .cohorts import COHORT_INTERVALS, build_retention
+from .correlations import CORRELATION_METHODS, build_correlations
+from .jobs import submit_report
+from .query_engine import QueryError, parse_query, run_query, source_namespace
+from .widgets import evaluate_widgets
+from .leaderboards import LEADERBOARDS, get_leaderboard
+from .signals import DASHBOARD_NAMESPACE
+from .models import AnalyticsReport, CalibrationCycle, DashboardWidget, ReviewerCalibration
+from .serializers import (
+    AnalyticsReportSerializer, CalibrationCycleSerializer, CalibratedScoreSerializer,
+    DashboardWidgetSerializer
+)
+
+# Cohort matrices are cached for a day (the current date is part of the key)
+COHORT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Default and maximum number of scatter points of the correlation endpoint
+CORRELATION_POINTS = 500
+CORRELATION_MAX_POINTS = 5000
 
 
 @api_view(['GET'])
@@ -33,6 +66,165 @@ def health_check(request):
     })
 
 
+def dashboard_scope(request):
+    """
+    Get the permission scope the dashboard is computed for.
+
+    Every authenticated user currently sees organization-wide figures, so
+    there is a single scope. Cache keys include it so that scoped dashboards
+    never share entries.
+
+    Args:
+        request: HTTP request
+
+    Returns:
+        str: Scope identifier
+    """
+    return 'organization'
+
+
+def employee_stats():
+    """Active headcount and new hires this month, in one statement."""
+    first_of_month = timezone.localdate().replace(day=1)
+    return Employee.objects.aggregate(
+        total_employees=Count('id', filter=Q(is_active=True)),
+        new_hires_this_month=Count('id', filter=Q(is_active=True, hire_date__gte=first_of_month)),
+    )
+
+
+def department_stats():
+    """Active headcount and average salary per department, from the department counters."""
+    departments = Department.objects.only(
+        'id', 'name', 'active_employee_count', 'salary_sum'
+    ).order_by('-active_employee_count')
+
+    return [
+        {
+            'id': dept.id,
+            'name': dept.name,
+            'employee_count': dept.active_employee_count,
+            'avg_salary': round(dept.salary_sum / dept.active_employee_count, 2) if dept.active_employee_count else 0
+        }
+        for dept in departments
+    ]
+
+
+def attendance_stats(start_date=None, end_date=None):
+    """Attendance status counts and average hours, in one statement."""
+    queryset = Attendance.objects.all()
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+
+    stats = queryset.aggregate(
+        total_records=Count('id'),
+        present_count=Count('id', filter=Q(status='present')),
+        late_count=Count('id', filter=Q(status='late')),
+        absent_count=Count('id', filter=Q(status='absent')),
+        avg_hours_worked=Avg('hours_worked'),
+    )
+    stats['avg_hours_worked'] = round(stats['avg_hours_worked'] or 0, 2)
+    return stats
+
+
+def performance_stats(start_date=None, end_date=None):
+    """Review counts and average score, in one statement."""
+    queryset = Performance.objects.all()
+    if start_date:
+        queryset = queryset.filter(review_date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(review_date__lte=end_date)
+
+    stats = queryset.aggregate(
+        total_reviews=Count('id'),
+        avg_performance_score=Avg('performance_score'),
+        excellent_count=Count('id', filter=Q(status='excellent')),
+        needs_improvement_count=Count('id', filter=Q(status='needs_improvement')),
+    )
+    stats['avg_performance_score'] = round(stats['avg_performance_score'] or 0, 1)
+    return stats
+
+
+def build_dashboard(start_date=None, end_date=None):
+    """
+    Build the dashboard summary payload.
+
+    Args:
+        start_date: Optional start of the attendance/performance date range
+        end_date: Optional end of the attendance/performance date range
+
+    The sections are independent statements and run concurrently on the
+    dashboard thread pool (DASHBOARD_PARALLEL_WORKERS), each thread using its
+    own database connection. Sections that fail or do not finish within
+    DASHBOARD_SECTION_TIMEOUT seconds are returned as None and listed in
+    missing_sections, with partial set.
+
+    Returns:
+        dict: Dashboard summary statistics
+    """
+    sections = {
+        'employee_stats': employee_stats,
+        'department_stats': department_stats,
+        'attendance_stats': lambda: attendance_stats(start_date, end_date),
+        'performance_stats': lambda: performance_stats(start_date, end_date),
+    }
+    workers = settings.DASHBOARD_PARALLEL_WORKERS
+    results, timed_out, failed = run_parallel(
+        sections,
+        executor=get_executor('dashboard', workers) if workers > 0 else None,
+        timeout=settings.DASHBOARD_SECTION_TIMEOUT,
+    )
+
+    data = {name: results.get(name) for name in sections}
+    missing = [name for name in sections if name not in results]
+    data['partial'] = bool(missing)
+    if missing:
+        data['missing_sections'] = missing
+        data['timed_out_sections'] = timed_out
+    return data
+
+
+# Snapshots read by the dashboard when callers accept bounded staleness
+DASHBOARD_SNAPSHOTS = ['employee_hires', 'department_stats', 'attendance_daily', 'performance_daily']
+
+
+def build_dashboard_from_snapshots(start_date=None, end_date=None):
+    """
+    Build the dashboard summary payload from analytics snapshots.
+
+    Args:
+        start_date: Optional start of the attendance/performance date range
+        end_date: Optional end of the attendance/performance date range
+
+    Returns:
+        dict: Dashboard summary statistics, same shape as build_dashboard()
+    """
+    attendance = snapshots.attendance_stats(start_date, end_date)
+    performance = snapshots.performance_stats(start_date, end_date)
+    return {
+        'employee_stats': snapshots.employee_stats(),
+        'department_stats': [
+            {
+                'id': dept['department_id'],
+                'name': dept['department_name'],
+                'employee_count': dept['employee_count'],
+                'avg_salary': dept['avg_salary'],
+            }
+            for dept in snapshots.department_stats()
+        ],
+        'attendance_stats': {
+            key: attendance[key]
+            for key in ('total_records', 'present_count', 'late_count', 'absent_count', 'avg_hours_worked')
+        },
+        'performance_stats': {
+            key: performance[key]
+            for key in ('total_reviews', 'avg_performance_score', 'excellent_count', 'needs_improvement_count')
+        },
+    }
+
+
+@query_budget(5)  # One statement per section, plus the snapshot freshness check with max_staleness
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def dashboard_summary(request):
@@ -45,8 +237,16 @@ def dashboard_summary(request):
     - Attendance statistics
     - Performance statistics
 
+    Each section is computed in a single statement. The payload is cached per
+    date range and permission scope; Employee, Attendance and Performance
+    writes mark it stale, after which it is served stale while one request
+    recomputes it in the background. Callers passing max_staleness (seconds)
+    are served from the analytics snapshots when they are recent enough.
+    Sections are computed in parallel; a payload missing slow or failing
+    sections is flagged partial and not cached.
+
     Args:
-        request: HTTP request with optional date range parameters
+        request: HTTP request with optional date range and max_staleness parameters
 
     Returns:
         Response: JSON response with dashboard summary statistics
@@ -55,65 +255,640 @@ def dashboard_summary(request):
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
 
-    # Employee statistics
-    total_employees = Employee.objects.filter(is_active=True).count()
-    new_hires_this_month = Employee.objects.filter(
-        hire_date__gte=timezone.now().replace(day=1),
-        is_active=True
-    ).count()
-
-    # Department statistics
-    department_stats = Department.objects.annotate(
-        employee_count=Count('employees', filter=models.Q(employees__is_active=True)),
-        avg_salary=Avg('employees__salary', filter=models.Q(employees__is_active=True))
-    ).order_by('-employee_count')
-
-    # Attendance statistics
-    attendance_queryset = Attendance.objects.all()
-    if start_date:
-        attendance_queryset = attendance_queryset.filter(date__gte=start_date)
-    if end_date:
-        attendance_queryset = attendance_queryset.filter(date__lte=end_date)
-
-    attendance_stats = {
-        'total_records': attendance_queryset.count(),
-        'present_count': attendance_queryset.filter(status='present').count(),
-        'late_count': attendance_queryset.filter(status='late').count(),
-        'absent_count': attendance_queryset.filter(status='absent').count(),
-        'avg_hours_worked': round(attendance_queryset.aggregate(Avg('hours_worked'))['hours_worked__avg'] or 0, 2),
-    }
+    # Serve from precomputed snapshots when the caller accepts their staleness
+    snapshot_at = snapshots.snapshots_fresh(DASHBOARD_SNAPSHOTS, snapshots.parse_max_staleness(request))
+    if snapshot_at:
+        data = build_dashboard_from_snapshots(start_date, end_date)
+        data['snapshot_refreshed_at'] = snapshot_at
+        return Response(data)
 
-    # Performance statistics
-    performance_queryset = Performance.objects.all()
-    if start_date:
-        performance_queryset = performance_queryset.filter(review_date__gte=start_date)
-    if end_date:
-        performance_queryset = performance_queryset.filter(review_date__lte=end_date)
+    cache_key = make_key(
+        'dashboard_summary',
+        scope=dashboard_scope(request),
+        start_date=start_date,
+        end_date=end_date,
+    )
+    data = get_or_refresh(
+        cache_key,
+        lambda: build_dashboard(start_date, end_date),
+        namespaces=(DASHBOARD_NAMESPACE,),
+        timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+        stale_timeout=settings.DASHBOARD_STALE_TIMEOUT,
+        should_cache=lambda payload: not payload.get('partial'),
+    )
 
-    performance_stats = {
-        'total_reviews': performance_queryset.count(),
-        'avg_performance_score': round(performance_queryset.aggregate(Avg('performance_score'))['performance_score__avg'] or 0, 1),
-        'excellent_count': performance_queryset.filter(status='excellent').count(),
-        'needs_improvement_count': performance_queryset.filter(status='needs_improvement').count(),
-    }
+    return Response(data)
 
-    # Build response data
-    data = {
-        'employee_stats': {
-            'total_employees': total_employees,
-            'new_hires_this_month': new_hires_this_month,
-        },
-        'department_stats': [
-            {
-                'id': dept.id,
-                'name': dept.name,
-                'employee_count': dept.employee_count,
-                'avg_salary': round(dept.avg_salary or 0, 2)
-            }
-            for dept in department_stats
+
+@api_view(['GET', 'POST'])
+@permission_classes([permissions.IsAuthenticated])
+def calibration_summary(request):
+    """
+    Get reviewer calibration statistics for a review cycle.
+
+    Statistics are precomputed by the calibration batch job
+    (manage.py calibrate_reviewers), so reads do not aggregate reviews.
+    Staff users can POST a cycle to recompute it.
+
+    Args:
+        request: HTTP request with optional cycle (defaults to the latest
+            computed cycle) and reviewer parameters; passing reviewer adds
+            the normalized scores of that reviewer's reviewees
+
+    Returns:
+        Response: JSON response with cycle, reviewer and score statistics
+    """
+    cycle = request.query_params.get('cycle') or request.data.get('cycle')
+
+    if request.method == 'POST':
+        if not request.user.is_staff:
+            return Response({
+                'status': 'error',
+                'message': 'Only staff users can recompute calibrations'
+            }, status=status.HTTP_403_FORBIDDEN)
+        try:
+            run_calibration(cycle)
+        except ValueError as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = CalibrationCycle.objects.prefetch_related(
+        Prefetch('reviewers', queryset=ReviewerCalibration.objects.select_related('reviewer', 'department'))
+    )
+    calibration = queryset.filter(cycle=cycle).first() if cycle else queryset.first()
+    if calibration is None:
+        return Response({
+            'status': 'error',
+            'message': 'No calibration has been computed for this cycle'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    data = CalibrationCycleSerializer(calibration).data
+
+    reviewer = request.query_params.get('reviewer')
+    if reviewer:
+        try:
+            reviewer = int(reviewer)
+        except ValueError:
+            return Response({
+                'status': 'error',
+                'message': 'reviewer must be an employee id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        scores = calibration.scores.filter(reviewer_id=reviewer).select_related('performance__employee')
+        data['scores'] = CalibratedScoreSerializer(scores, many=True).data
+
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def leaderboard(request, kind):
+    """
+    Get a ranked leaderboard per department.
+
+    Ranks are computed with RANK() OVER (PARTITION BY department) and cached
+    per period and department; writes only invalidate the affected snapshots.
+
+    Args:
+        request: HTTP request with optional period (YYYY, YYYY-Hn or YYYY-Qn,
+            default: current year), department and limit (default 10) parameters
+        kind: Leaderboard kind (top_performers, most_improved, best_attendance)
+
+    Returns:
+        Response: JSON response with ranked entries per department
+    """
+    if kind not in LEADERBOARDS:
+        return Response({
+            'status': 'error',
+            'message': f"Unknown leaderboard, expected one of: {', '.join(LEADERBOARDS)}"
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    period = request.query_params.get('period') or str(timezone.localdate().year)
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= 100:
+        return Response({
+            'status': 'error',
+            'message': 'limit must be an integer between 1 and 100'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    departments = Department.objects.order_by('name')
+    department = request.query_params.get('department')
+    if department:
+        try:
+            department = int(department)
+        except ValueError:
+            return Response({
+                'status': 'error',
+                'message': 'department must be a department id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        departments = departments.filter(pk=department)
+    departments = list(departments.values_list('id', 'name'))
+
+    try:
+        entries = get_leaderboard(kind, period, [pk for pk, _ in departments], limit)
+    except ValueError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'kind': kind,
+        'period': period,
+        'limit': limit,
+        'departments': [
+            {'department_id': pk, 'department_name': name, 'entries': entries[pk]}
+            for pk, name in departments
         ],
-        'attendance_stats': attendance_stats,
-        'performance_stats': performance_stats,
-    }
+    })
+
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def cohort_retention(request):
+    """
+    Get hire-cohort retention and attrition curves.
+
+    Employees are grouped into cohorts by hire month or quarter (optionally
+    per department); each cohort reports the number and percentage of
+    employees still employed after each tenure period. Results are cached
+    per day and recomputed when employees change.
+
+    Args:
+        request: HTTP request with optional interval (month, quarter),
+            start_date, end_date (hire date range), department and
+            group_by=department parameters
+
+    Returns:
+        Response: JSON response with one retention curve per cohort
+    """
+    interval = request.query_params.get('interval', 'quarter')
+    if interval not in COHORT_INTERVALS:
+        return Response(
+            {'status': 'error', 'message': f"Invalid interval. Use one of: {', '.join(COHORT_INTERVALS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    group_by = request.query_params.get('group_by')
+    if group_by not in (None, '', 'department'):
+        return Response(
+            {'status': 'error', 'message': "Invalid group_by. Use: department"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        start_date = parse_date_param(request.query_params.get('start_date'))
+        end_date = parse_date_param(request.query_params.get('end_date'))
+        department = int(request.query_params['department']) if request.query_params.get('department') else None
+    except ValueError:
+        return Response(
+            {'status': 'error', 'message': "Invalid start_date, end_date or department"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    params = {
+        'interval': interval,
+        'start_date': start_date,
+        'end_date': end_date,
+        'department': department,
+        'by_department': group_by == 'department',
+    }
+    data = get_or_set(
+        make_key(
+            'cohort_retention',
+            namespaces=(source_namespace('employees'),),
+            day=timezone.localdate(),
+            **params
+        ),
+        lambda: build_retention(**params),
+        timeout=COHORT_CACHE_TIMEOUT,
+    )
     return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def attendance_performance(request):
+    """
+    Get correlations between attendance behaviour and performance.
+
+    Builds per-employee features (late and absence rates, average hours and
+    overtime, average review score and goals achievement) from two grouped
+    queries and returns correlation matrices company-wide and per
+    department, plus a downsampled set of scatter points. Results are
+    cached per period until attendance, reviews or employees change.
+
+    Args:
+        request: HTTP request with optional period (YYYY, YYYY-Hn or YYYY-Qn,
+            default: current year), department, method (pearson, spearman)
+            and points (maximum scatter points, default 500) parameters
+
+    Returns:
+        Response: JSON response with feature names, matrices and points
+    """
+    period = request.query_params.get('period') or str(timezone.localdate().year)
+    method = request.query_params.get('method', 'pearson')
+    if method not in CORRELATION_METHODS:
+        return Response(
+            {'status': 'error', 'message': f"Invalid method. Use one of: {', '.join(CORRELATION_METHODS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        start_date, end_date = parse_period(period)
+    except ValueError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        department = int(request.query_params['department']) if request.query_params.get('department') else None
+        max_points = int(request.query_params.get('points', CORRELATION_POINTS))
+    except ValueError:
+        return Response(
+            {'status': 'error', 'message': "Invalid department or points"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not 0 <= max_points <= CORRELATION_MAX_POINTS:
+        return Response(
+            {'status': 'error', 'message': f"points must be between 0 and {CORRELATION_MAX_POINTS}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    data = get_or_set(
+        make_key(
+            'attendance_performance',
+            namespaces=(source_namespace('attendance'), source_namespace('performance'), source_namespace('employees')),
+            period=period,
+            department=department,
+            method=method,
+            points=max_points,
+        ),
+        lambda: build_correlations(start_date, end_date, department, method, max_points),
+    )
+    return Response({
+        'period': period,
+        'start_date': start_date,
+        'end_date': end_date,
+        **data,
+    })
+
+
+# Query parameters of the aggregation endpoint that are not filters
+AGGREGATE_PARAMETERS = ('source', 'dimensions', 'metrics', 'format')
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([permissions.IsAuthenticated])
+def aggregate(request):
+    """
+    Run an ad-hoc aggregation over employee, attendance or performance facts.
+
+    The query is compiled into a single grouped statement over whitelisted
+    dimensions (department, position, gender, status, date buckets, ...) and
+    metrics (count, sum, avg, min, max, median, p<percentile>). Results are
+    returned as columns and cached until the source data changes.
+
+    Args:
+        request: GET request with source, dimensions, metrics and filter
+            parameters (e.g. status=present&date__gte=2024-01-01), or POST
+            request with the same fields and a filters object
+
+    Returns:
+        Response: Columnar results, or 400 if the query is invalid or exceeds
+            the row or cost limits
+    """
+    if request.method == 'POST':
+        data = request.data
+    else:
+        data = {key: request.query_params.get(key) for key in AGGREGATE_PARAMETERS}
+        data['filters'] = {
+            key: value for key, value in request.query_params.items()
+            if key not in AGGREGATE_PARAMETERS
+        }
+
+    try:
+        query = parse_query(data)
+        namespaces = {source_namespace(query['source']), source_namespace('employees')}
+        result = get_or_set(
+            make_key('aggregate', namespaces=sorted(namespaces), query=query),
+            lambda: run_query(
+                query,
+                max_rows=settings.AGGREGATE_MAX_ROWS,
+                max_cost=settings.AGGREGATE_MAX_COST,
+            ),
+        )
+    except QueryError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'source': query['source'],
+        'dimensions': query['dimensions'],
+        'metrics': list(result['columns'])[len(query['dimensions']):],
+        **result,
+    })
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([permissions.IsAuthenticated])
+def profiling_config(request):
+    """
+    Get or change the request profiling configuration at runtime.
+
+    Changes apply to every process sharing the cache within
+    PROFILING_CONFIG_TTL seconds, without a redeploy. Staff only.
+
+    Args:
+        request: GET request, or POST request with server_timing (bool),
+            sample_rate (0-1) and/or profiler ("sampling" or "cprofile");
+            reset=true drops earlier overrides and restores the settings
+
+    Returns:
+        Response: The current configuration, or 400 if a value is invalid
+    """
+    if not request.user.is_staff:
+        return Response({
+            'status': 'error',
+            'message': 'Only staff users can manage profiling'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    if request.method == 'GET':
+        return Response(profiling.get_config())
+
+    changes = {key: value for key, value in request.data.items() if key != 'reset'}
+    try:
+        config = profiling.set_config(changes, reset=request.data.get('reset') is True)
+    except ValueError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(config)
+
+
+# Default and maximum number of rows per report result page
+REPORT_PAGE_SIZE = 1000
+REPORT_MAX_PAGE_SIZE = 10000
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range HTTP Range header.
+
+    Args:
+        header: Range header value, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-512"
+        size: Size of the resource in bytes
+
+    Returns:
+        tuple or str or None: (first byte, last byte), 'invalid' when the
+            range cannot be satisfied, None to serve the whole resource
+            (no header, or a multi-range request)
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return 'invalid'
+    return start, end
+
+
+class AnalyticsReportViewSet(viewsets.ModelViewSet):
+    """
+    API endpoint for asynchronous report generation.
+
+    Creating a report enqueues a job for the report workers
+    (`manage.py run_report_workers`); clients poll the report for its status
+    and progress, then page through the rows (result action) or stream the
+    compressed result file (download action).
+    """
+    queryset = AnalyticsReport.objects.filter(is_active=True).select_related('generated_by').defer('result_manifest')
+    serializer_class = AnalyticsReportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['report_type', 'status', 'generated_by']
+    ordering_fields = ['generated_at', 'finished_at']
+    ordering = ['-generated_at']
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    def create(self, request, *args, **kwargs):
+        """
+        Enqueue a report, reusing an identical recent or in-progress one.
+
+        Args:
+            request: HTTP request with report_type, parameters and optional
+                title, description and reuse
+
+        Returns:
+            Response: The report job; 202 when newly queued, 200 when reused
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            report, reused = submit_report(
+                data['report_type'],
+                data.get('parameters', {}),
+                user=request.user,
+                title=data.get('title'),
+                description=data.get('description'),
+                reuse=data['reuse'],
+            )
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response_data = self.get_serializer(report).data
+        response_data['reused'] = reused
+        return Response(response_data, status=status.HTTP_200_OK if reused else status.HTTP_202_ACCEPTED)
+
+    def perform_destroy(self, instance):
+        """
+        Hide the report instead of deleting it, so running workers can finish.
+        """
+        instance.is_active = False
+        instance.save(update_fields=['is_active'])
+
+    def get_completed_report(self):
+        """
+        Get the requested report, or an error response if it has no result yet.
+
+        Returns:
+            tuple: (AnalyticsReport, None) or (None, error Response)
+        """
+        report = self.get_object()
+        if report.status != 'completed' or not report.result_file:
+            return None, Response(
+                {'status': 'error', 'message': f"Report is {report.status}", 'progress': report.progress},
+                status=status.HTTP_409_CONFLICT
+            )
+        return report, None
+
+    def get_projection(self, report):
+        """
+        Parse the columns, offset and limit query parameters.
+
+        Args:
+            report: Completed report
+
+        Returns:
+            tuple: (column names, column indexes, offset, limit)
+
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        selected = [name for name in self.request.query_params.get('columns', '').split(',') if name]
+        names, indexes = report_files.project(report.result_manifest['columns'], selected)
+        try:
+            offset = max(int(self.request.query_params.get('offset', 0)), 0)
+            limit = self.request.query_params.get('limit')
+            limit = None if limit in (None, '') else max(int(limit), 0)
+        except ValueError:
+            raise ValueError("offset and limit must be integers")
+        return names, indexes, offset, limit
+
+    @action(detail=True, methods=['get'])
+    def result(self, request, pk=None):
+        """
+        Get a page of rows of a completed report.
+
+        Only the compressed chunks overlapping the page are read.
+
+        Args:
+            request: HTTP request with optional offset, limit (default 1000,
+                max 10000) and comma-separated columns parameters
+            pk: Report primary key
+
+        Returns:
+            Response: Columns and rows, or 409 while the report is not completed
+        """
+        report, error = self.get_completed_report()
+        if error:
+            return error
+        try:
+            names, indexes, offset, limit = self.get_projection(report)
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(REPORT_PAGE_SIZE if limit is None else limit, REPORT_MAX_PAGE_SIZE)
+
+        return Response({
+            'columns': names,
+            'row_count': report.row_count,
+            'offset': offset,
+            'limit': limit,
+            'rows': list(report_files.iter_rows(report, offset, limit, indexes)),
+        })
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """
+        Stream the result file of a completed report.
+
+        Without parameters the stored gzip compressed NDJSON file is streamed
+        as is, honouring single HTTP Range requests. With offset, limit or
+        columns the selected rows are streamed as uncompressed NDJSON, after
+        a header line holding the column names.
+
+        Args:
+            request: HTTP request with optional Range header and offset,
+                limit and columns parameters
+            pk: Report primary key
+
+        Returns:
+            StreamingHttpResponse: File or row stream
+        """
+        report, error = self.get_completed_report()
+        if error:
+            return error
+
+        if {'offset', 'limit', 'columns'} & set(request.query_params):
+            try:
+                names, indexes, offset, limit = self.get_projection(report)
+            except ValueError as e:
+                return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            lines = (
+                json.dumps(row, separators=(',', ':')) + '\n'
+                for row in itertools.chain([names], report_files.iter_rows(report, offset, limit, indexes))
+            )
+            response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+            response['Content-Disposition'] = f'attachment; filename="report-{report.pk}.ndjson"'
+            return response
+
+        size = report.result_manifest['size']
+        byte_range = parse_range(request.headers.get('Range'), size)
+        if byte_range == 'invalid':
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        start, end = byte_range or (0, size - 1)
+        response = StreamingHttpResponse(
+            report_files.iter_bytes(report.result_file.name, start, end),
+            content_type='application/gzip',
+            status=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = f'attachment; filename="report-{report.pk}.ndjson.gz"'
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        return response
+
+
+class DashboardWidgetViewSet(viewsets.ModelViewSet):
+    """
+    API endpoint for configuring dashboard widgets and rendering them.
+
+    A widget config declares a source, a metric, dimensions and filters over
+    the whitelisted fields of apps/analytics/query_engine.py. Widgets created
+    by staff are shared with everyone; other users create personal widgets,
+    listed and rendered only for themselves.
+    """
+    queryset = DashboardWidget.objects.all()
+    serializer_class = DashboardWidgetSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['widget_type', 'is_visible']
+
+    def get_queryset(self):
+        """
+        Shared widgets plus the user's own; staff manage every widget.
+        """
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(Q(owner__isnull=True) | Q(owner=self.request.user))
+
+    def perform_create(self, serializer):
+        serializer.save(owner=None if self.request.user.is_staff else self.request.user)
+
+    def check_object_permissions(self, request, obj):
+        super().check_object_permissions(request, obj)
+        if request.method not in permissions.SAFE_METHODS and not request.user.is_staff and obj.owner_id != request.user.id:
+            self.permission_denied(request, message='Only staff users can change shared widgets')
+
+    @action(detail=False, methods=['get'])
+    def render(self, request):
+        """
+        Render all visible widgets of the user (shared and own) in one batch.
+
+        Widgets sharing a source, dimensions and filters are computed by one
+        grouped statement; each widget's result is cached separately.
+
+        Args:
+            request: HTTP request with an optional comma-separated ids parameter
+
+        Returns:
+            Response: Rendered widgets in position order
+        """
+        widgets = self.get_queryset().filter(is_visible=True)
+        ids = request.query_params.get('ids')
+        if ids:
+            try:
+                widgets = widgets.filter(id__in=[int(value) for value in ids.split(',')])
+            except ValueError:
+                return Response(
+                    {'status': 'error', 'message': "ids must be a comma-separated list of integers"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        rendered, statements = evaluate_widgets(list(widgets))
+        return Response({'widgets': rendered, 'statements': statements})
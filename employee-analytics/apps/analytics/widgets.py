@@ -0,0 +1,147 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.cache import make_key
+from .query_engine import (
+    QueryError, parse_dimensions, parse_filters, parse_metric, metric_alias, run_grouped,
+    source_namespace,
+)
+
+# Widget types rendered from a query; text widgets only carry their config
+QUERY_WIDGET_TYPES = ('chart', 'metric', 'table')
+
+
+def parse_widget_config(config):
+    """
+    Validate a widget config and normalize it into a query spec.
+
+    Example config:
+        {"source": "attendance", "metric": "avg:hours_worked",
+         "dimensions": ["department"], "filters": {"date__gte": "2024-01-01"},
+         "order": "-value", "limit": 10}
+
+    Args:
+        config: DashboardWidget.config
+
+    Returns:
+        dict: Normalized spec (source, dimensions, filters, metric, order, limit)
+
+    Raises:
+        QueryError: If the config is invalid
+    """
+    if not isinstance(config, dict):
+        raise QueryError("Widget config must be an object")
+    source = config.get('source')
+    dimensions = parse_dimensions(source, config.get('dimensions'))
+    spec = {
+        'source': source,
+        'dimensions': dimensions,
+        'filters': parse_filters(source, config.get('filters')),
+        'metric': parse_metric(source, config.get('metric', 'count')),
+        'order': config.get('order'),
+        'limit': config.get('limit'),
+    }
+    if spec['order'] and spec['order'].lstrip('-') not in ['value'] + dimensions:
+        raise QueryError("Widget order must be 'value' or one of its dimensions, optionally prefixed with '-'")
+    if spec['limit'] is not None and (not isinstance(spec['limit'], int) or spec['limit'] < 1):
+        raise QueryError("Widget limit must be a positive integer")
+    return spec
+
+
+def _widget_key(spec):
+    """Cache key of a widget result; identical configs share an entry."""
+    namespaces = [source_namespace(spec['source'])]
+    if spec['source'] != 'employees':
+        # Employee moves between departments/positions change the dimensions
+        namespaces.append(source_namespace('employees'))
+    return make_key('dashboard_widget', namespaces=namespaces, spec=spec)
+
+
+def _shape(spec, rows):
+    """Turn the shared statement rows into one widget's result."""
+    alias = metric_alias(*spec['metric'])
+    if not spec['dimensions']:
+        return {'value': rows[0][alias] if rows else None}
+
+    data = [{**{name: row[name] for name in spec['dimensions']}, 'value': row[alias]} for row in rows]
+    if spec['order']:
+        field = spec['order'].lstrip('-')
+        data.sort(
+            key=lambda item: (item[field] is None, item[field]),
+            reverse=spec['order'].startswith('-'),
+        )
+    if spec['limit']:
+        data = data[:spec['limit']]
+    return {'rows': data}
+
+
+def evaluate_widgets(widgets):
+    """
+    Render several widgets in one batch.
+
+    Widget results are cached individually. The widgets missing from the
+    cache are grouped by (source, dimensions, filters), and each group is
+    evaluated with a single grouped statement computing all of its metrics,
+    within the AGGREGATE_MAX_ROWS and AGGREGATE_MAX_COST limits of ad-hoc
+    aggregations.
+
+    Args:
+        widgets: DashboardWidget instances
+
+    Returns:
+        tuple: (list of rendered widgets in input order, number of statements run)
+    """
+    rendered, specs, keys = {}, {}, {}
+    for widget in widgets:
+        base = {
+            'id': widget.id,
+            'title': widget.title,
+            'widget_type': widget.widget_type,
+            'position': widget.position,
+            'size': widget.size,
+        }
+        rendered[widget.id] = base
+        if widget.widget_type not in QUERY_WIDGET_TYPES:
+            base['config'] = widget.config
+            continue
+        try:
+            specs[widget.id] = parse_widget_config(widget.config)
+        except QueryError as e:
+            base['error'] = str(e)
+            continue
+        keys[widget.id] = _widget_key(specs[widget.id])
+
+    cached = cache.get_many(list(set(keys.values())))
+    groups = defaultdict(list)
+    for widget_id, key in keys.items():
+        if key in cached:
+            rendered[widget_id].update(cached[key])
+        else:
+            spec = specs[widget_id]
+            groups[(spec['source'], tuple(spec['dimensions']), repr(spec['filters']))].append(widget_id)
+
+    fresh, statements = {}, 0
+    for widget_ids in groups.values():
+        first = specs[widget_ids[0]]
+        metrics = sorted({specs[widget_id]['metric'] for widget_id in widget_ids}, key=str)
+        try:
+            rows = run_grouped(
+                first['source'], first['dimensions'], first['filters'], metrics,
+                max_rows=getattr(settings, 'AGGREGATE_MAX_ROWS', None),
+                max_cost=getattr(settings, 'AGGREGATE_MAX_COST', None),
+            )
+        except QueryError as e:
+            for widget_id in widget_ids:
+                rendered[widget_id]['error'] = str(e)
+            continue
+        statements += 1
+        for widget_id in widget_ids:
+            result = _shape(specs[widget_id], rows)
+            rendered[widget_id].update(result)
+            fresh[keys[widget_id]] = result
+
+    if fresh:
+        cache.set_many(fresh, getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 300))
+    return [rendered[widget.id] for widget in widgets], statements
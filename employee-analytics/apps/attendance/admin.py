@@ -1,6 +1,6 @@
 
 from django.contrib import admin
-from .models import Attendance, TimeLog
+from .models import Attendance, AttendanceAnomaly, TimeLog
 
 
 @admin.register(Attendance)
@@ -17,3 +17,11 @@ class TimeLogAdmin(admin.ModelAdmin):
     list_filter = ['log_type']
     search_fields = ['attendance__employee__first_name', 'attendance__employee__last_name']
     date_hierarchy = 'timestamp'
+
+
+@admin.register(AttendanceAnomaly)
+class AttendanceAnomalyAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'date', 'anomaly_type', 'score', 'detected_at']
+    list_filter = ['anomaly_type']
+    search_fields = ['employee__first_name', 'employee__last_name', 'employee__employee_id']
+    date_hierarchy = 'date'
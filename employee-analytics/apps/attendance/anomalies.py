@@ -0,0 +1,325 @@
+from datetime import datetime, timezone
+from itertools import islice
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+from utils.stats import robust_z_scores
+from .models import Attendance, AttendanceAnomaly, TimeLog
+
+# Employees with fewer worked days are compared with their department instead
+MIN_EMPLOYEE_SAMPLES = 5
+
+# Time log types checked for clustered timestamps, in code order
+CLUSTER_LOG_TYPES = ('check_in', 'check_out')
+
+# Separates the log types when all logs are sorted on one key (exceeds any epoch second)
+CLUSTER_TYPE_OFFSET = 1e11
+
+# Poisson tail terms summed for a run's probability
+CLUSTER_TAIL_TERMS = 100
+
+
+def _epoch(value):
+    """Seconds since the epoch of a datetime, NaN for None."""
+    return value.timestamp() if value is not None else np.nan
+
+
+def _read_chunks(rows, chunk_size, convert):
+    """
+    Read an iterator of rows in chunks, converting each chunk to column arrays.
+
+    Args:
+        rows: Row iterator (e.g. values_list(...).iterator())
+        chunk_size: Rows per chunk
+        convert: Callable turning a list of rows into a tuple of arrays
+
+    Returns:
+        list: Concatenated column arrays (empty arrays when there are no rows)
+    """
+    chunks = []
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            break
+        chunks.append(convert(batch))
+    if not chunks:
+        return [np.array(column) for column in convert([])]
+    return [np.concatenate(columns) for columns in zip(*chunks)]
+
+
+def read_attendance(start_date, end_date, chunk_size):
+    """
+    Attendance columns for a date range, ordered by id.
+
+    Returns:
+        list: ids, employee ids, department ids (0 for none), dates,
+            check-in and check-out epoch seconds (NaN if missing), hours worked
+    """
+    rows = Attendance.objects.filter(date__range=(start_date, end_date)).order_by('id').values_list(
+        'id', 'employee_id', 'employee__department_id', 'date', 'check_in', 'check_out', 'hours_worked',
+    ).iterator(chunk_size=chunk_size)
+
+    def convert(batch):
+        return (
+            np.array([row[0] for row in batch], dtype=np.int64),
+            np.array([row[1] for row in batch], dtype=np.int64),
+            np.array([row[2] or 0 for row in batch], dtype=np.int64),
+            np.array([row[3] for row in batch], dtype='datetime64[D]'),
+            np.array([_epoch(row[4]) for row in batch], dtype=float),
+            np.array([_epoch(row[5]) for row in batch], dtype=float),
+            np.array([row[6] or 0 for row in batch], dtype=float),
+        )
+
+    return _read_chunks(rows, chunk_size, convert)
+
+
+def read_time_logs(start_date, end_date, chunk_size):
+    """
+    Check-in and check-out time logs of the attendance records in a date range.
+
+    Returns:
+        list: attendance ids, employee ids, log type codes (index in
+            CLUSTER_LOG_TYPES), epoch seconds
+    """
+    rows = TimeLog.objects.filter(
+        attendance__date__range=(start_date, end_date), log_type__in=CLUSTER_LOG_TYPES,
+    ).order_by().values_list(
+        'attendance_id', 'attendance__employee_id', 'log_type', 'timestamp',
+    ).iterator(chunk_size=chunk_size)
+
+    def convert(batch):
+        return (
+            np.array([row[0] for row in batch], dtype=np.int64),
+            np.array([row[1] for row in batch], dtype=np.int64),
+            np.array([CLUSTER_LOG_TYPES.index(row[2]) for row in batch], dtype=np.int64),
+            np.array([row[3].timestamp() for row in batch], dtype=float),
+        )
+
+    return _read_chunks(rows, chunk_size, convert)
+
+
+def hours_outliers(employees, departments, hours, threshold):
+    """
+    Flag worked days whose hours are far from the employee's usual hours.
+
+    Scores are robust z-scores against the employee's median and MAD; the
+    department's distribution is used for employees with too few worked
+    days or no spread.
+
+    Args:
+        employees: Employee id per record
+        departments: Department id per record
+        hours: Hours worked per record (only records with hours are scored)
+        threshold: Absolute z-score above which a record is flagged
+
+    Returns:
+        tuple: (flagged record indexes, their z-scores, medians, MADs, whether
+            the department baseline was used)
+    """
+    worked = np.flatnonzero(hours > 0)
+    employee_z, employee_median, employee_mad, employee_count = robust_z_scores(employees[worked], hours[worked])
+    department_z, department_median, department_mad, _ = robust_z_scores(departments[worked], hours[worked])
+
+    by_department = (employee_count < MIN_EMPLOYEE_SAMPLES) | ~np.isfinite(employee_z)
+    scores = np.where(by_department, department_z, employee_z)
+    medians = np.where(by_department, department_median, employee_median)
+    mads = np.where(by_department, department_mad, employee_mad)
+    flagged = np.isfinite(scores) & (np.abs(scores) > threshold)
+    return worked[flagged], scores[flagged], medians[flagged], mads[flagged], by_department[flagged]
+
+
+def _poisson_tail(counts, expected):
+    """
+    P(X >= count) for X ~ Poisson(expected), elementwise.
+
+    Only used where count > expected, so the tail terms decrease and
+    CLUSTER_TAIL_TERMS of them are enough.
+    """
+    ks = counts[:, None] + np.arange(CLUSTER_TAIL_TERMS)[None, :]
+    log_factorials = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, ks.max() + 1)))])
+    log_pmf = ks * np.log(expected)[:, None] - expected[:, None] - log_factorials[ks]
+    return np.exp(log_pmf).sum(axis=1)
+
+
+def clustered_timestamps(employees, log_types, seconds, resolution, min_employees, window, max_p):
+    """
+    Find time logs sharing a timestamp with logs of many other employees.
+
+    Logs are sorted by (log type, timestamp bucket, employee) so identical
+    timestamps form contiguous runs. Busy periods (everyone checking in
+    around 9:00) produce coincidences by chance, so each run is compared
+    with the logs of the same type within `window` seconds around it: the
+    run is flagged when it spans at least min_employees distinct employees
+    and that many is improbable (p < max_p) under a Poisson model of the
+    surrounding density. Timestamps mostly recorded to the minute are
+    modelled with one-minute buckets, so whole-minute clocks do not make
+    every minute look suspicious.
+
+    Args:
+        employees: Employee id per log
+        log_types: Log type code per log
+        seconds: Epoch seconds per log
+        resolution: Bucket size in seconds (1 for identical to the second)
+        min_employees: Distinct employees needed to flag a run
+        window: Seconds before and after a run counted for its expected size
+        max_p: Probability under which a run is flagged
+
+    Returns:
+        tuple: (flagged log indexes, distinct employees of their run,
+            expected logs per bucket around their run)
+    """
+    if not len(seconds):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+    buckets = np.floor(seconds / resolution).astype(np.int64)
+    order = np.lexsort((employees, buckets, log_types))
+    sorted_buckets, sorted_types, sorted_employees = buckets[order], log_types[order], employees[order]
+
+    new_run = np.ones(len(order), dtype=bool)
+    new_run[1:] = (sorted_buckets[1:] != sorted_buckets[:-1]) | (sorted_types[1:] != sorted_types[:-1])
+    new_employee = new_run.copy()
+    new_employee[1:] |= sorted_employees[1:] != sorted_employees[:-1]
+
+    run_starts = np.flatnonzero(new_run)
+    run_sizes = np.diff(np.append(run_starts, len(order)))
+    distinct = np.add.reduceat(new_employee.astype(np.int64), run_starts)
+    candidates = np.flatnonzero(distinct >= min_employees)
+
+    # Logs of the same type around each candidate run, excluding the run
+    # itself, spread over the time they actually cover (at least `window`
+    # seconds) so runs at the edge of a busy period are not favoured
+    positions = np.sort(log_types.astype(float) * CLUSTER_TYPE_OFFSET + seconds)
+    run_keys = (
+        sorted_types[run_starts[candidates]].astype(float) * CLUSTER_TYPE_OFFSET
+        + sorted_buckets[run_starts[candidates]].astype(float) * resolution
+    )
+    first = np.searchsorted(positions, run_keys - window, side='left')
+    last = np.searchsorted(positions, run_keys + resolution + window, side='left')
+    nearby = last - first - run_sizes[candidates]
+    whole_minutes = np.mean(seconds % 60 == 0) > 0.5
+    bucket = max(resolution, 60) if whole_minutes else resolution
+    covered = np.maximum(positions[last - 1] - positions[first] + bucket, window)
+    expected = np.maximum(nearby, 1) * bucket / covered
+
+    improbable = np.ones(len(candidates), dtype=bool)
+    unusual = distinct[candidates] > expected
+    improbable[~unusual] = False
+    if unusual.any():
+        improbable[unusual] = _poisson_tail(distinct[candidates][unusual], expected[unusual]) < max_p
+    flagged_runs = candidates[improbable]
+
+    run_ids = np.cumsum(new_run) - 1
+    flagged = np.isin(run_ids, flagged_runs)
+    expected_by_run = np.zeros(len(run_starts))
+    expected_by_run[candidates] = expected
+    return order[flagged], distinct[run_ids[flagged]], expected_by_run[run_ids[flagged]]
+
+
+def scan_anomalies(start_date, end_date):
+    """
+    Scan attendance records and time logs of a date range for anomalies.
+
+    Records are read in chunks of ANOMALY_SCAN_CHUNK_SIZE rows into column
+    arrays, all checks are vectorized, and the anomalies previously stored
+    for the range are replaced in one transaction. Checks:
+
+    - hours_outlier: hours worked with a robust z-score above ANOMALY_Z_THRESHOLD
+    - long_day: more than ANOMALY_LONG_DAY_HOURS worked, or between check-in and check-out
+    - missing_check_in: a check-out (record or time log) without a check-in
+    - clustered_timestamp: a check-in/out time log identical (to
+      ANOMALY_CLUSTER_RESOLUTION seconds) to those of at least
+      ANOMALY_CLUSTER_MIN_EMPLOYEES employees, more than the surrounding
+      ANOMALY_CLUSTER_WINDOW seconds make likely (p < ANOMALY_CLUSTER_MAX_P)
+
+    Args:
+        start_date: First day of the range
+        end_date: Last day of the range
+
+    Returns:
+        dict: Number of scanned records and time logs, anomalies per type
+    """
+    chunk_size = getattr(settings, 'ANOMALY_SCAN_CHUNK_SIZE', 5000)
+    threshold = getattr(settings, 'ANOMALY_Z_THRESHOLD', 3.5)
+    long_day = getattr(settings, 'ANOMALY_LONG_DAY_HOURS', 16)
+    resolution = getattr(settings, 'ANOMALY_CLUSTER_RESOLUTION', 1)
+    min_employees = getattr(settings, 'ANOMALY_CLUSTER_MIN_EMPLOYEES', 3)
+    cluster_window = getattr(settings, 'ANOMALY_CLUSTER_WINDOW', 900)
+    cluster_max_p = getattr(settings, 'ANOMALY_CLUSTER_MAX_P', 1e-6)
+
+    ids, employees, departments, dates, check_in, check_out, hours = read_attendance(start_date, end_date, chunk_size)
+    anomalies = []
+
+    def flag(index, anomaly_type, score, details):
+        anomalies.append(AttendanceAnomaly(
+            attendance_id=int(ids[index]),
+            employee_id=int(employees[index]),
+            date=dates[index].astype(object),
+            anomaly_type=anomaly_type,
+            score=round(float(score), 3),
+            details=details,
+        ))
+
+    for index, score, median, mad, by_department in zip(*hours_outliers(employees, departments, hours, threshold)):
+        flag(index, 'hours_outlier', score, {
+            'hours_worked': float(hours[index]),
+            'median': round(float(median), 2),
+            'mad': round(float(mad), 2),
+            'baseline': 'department' if by_department else 'employee',
+        })
+
+    span = (check_out - check_in) / 3600
+    with np.errstate(invalid='ignore'):
+        long_days = np.flatnonzero((hours > long_day) | (span > long_day))
+    for index in long_days:
+        flag(index, 'long_day', np.fmax(hours[index], span[index]), {
+            'hours_worked': float(hours[index]),
+            'span_hours': None if np.isnan(span[index]) else round(float(span[index]), 2),
+        })
+
+    # Check-outs without a check-in, on the record itself or in its time logs
+    log_counts = TimeLog.objects.filter(attendance__date__range=(start_date, end_date)).values('attendance_id').annotate(
+        check_ins=Count('id', filter=Q(log_type='check_in')),
+        check_outs=Count('id', filter=Q(log_type='check_out')),
+    ).filter(check_ins=0, check_outs__gt=0).order_by()
+    unmatched_logs = np.array([row['attendance_id'] for row in log_counts], dtype=np.int64)
+    missing = np.isnan(check_in) & ~np.isnan(check_out)
+    from_logs = np.isin(ids, unmatched_logs)
+    for index in np.flatnonzero(missing | from_logs):
+        flag(index, 'missing_check_in', 0, {
+            'record': bool(missing[index]),
+            'time_logs': bool(from_logs[index]),
+        })
+
+    log_attendance, log_employees, log_types, log_seconds = read_time_logs(start_date, end_date, chunk_size)
+    flagged_logs, distinct, expected = clustered_timestamps(
+        log_employees, log_types, log_seconds, resolution, min_employees, cluster_window, cluster_max_p,
+    )
+    # One anomaly per record and log type, even if an employee punched twice
+    _, first = np.unique(np.stack([log_attendance[flagged_logs], log_types[flagged_logs]], axis=1), axis=0, return_index=True)
+    positions = np.searchsorted(ids, log_attendance[flagged_logs])
+    for log, employee_count, run_expected, index in zip(
+        flagged_logs[first], distinct[first], expected[first], positions[first],
+    ):
+        flag(index, 'clustered_timestamp', employee_count, {
+            'log_type': CLUSTER_LOG_TYPES[log_types[log]],
+            'timestamp': datetime.fromtimestamp(log_seconds[log], tz=timezone.utc).isoformat(),
+            'employees': int(employee_count),
+            'expected': round(float(run_expected), 3),
+        })
+
+    with transaction.atomic():
+        AttendanceAnomaly.objects.filter(date__range=(start_date, end_date)).delete()
+        AttendanceAnomaly.objects.bulk_create(anomalies, batch_size=chunk_size)
+
+    counts = {anomaly_type: 0 for anomaly_type, _ in AttendanceAnomaly.ANOMALY_TYPES}
+    for anomaly in anomalies:
+        counts[anomaly.anomaly_type] += 1
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'records': len(ids),
+        'time_logs': len(log_seconds),
+        'anomalies': counts,
+    }
@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.attendance.anomalies import scan_anomalies
+
+
+class Command(BaseCommand):
+    """
+    Scan attendance records and time logs for anomalies.
+
+    Usage:
+        python manage.py scan_attendance_anomalies
+        python manage.py scan_attendance_anomalies --start-date 2024-01-01 --end-date 2024-12-31
+        python manage.py scan_attendance_anomalies --days 7 --window 31
+    """
+    help = 'Flag unusual hours, long days, check-outs without check-in and clustered timestamps'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', help='First day to scan (YYYY-MM-DD)')
+        parser.add_argument('--end-date', help='Last day to scan (YYYY-MM-DD, default: today)')
+        parser.add_argument('--days', type=int, default=30, help='Days to scan when no start date is given (default: 30)')
+        parser.add_argument(
+            '--window', type=int, default=0,
+            help='Scan the range in windows of this many days (default: all at once); '
+                 'statistics are computed per window',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            end_date = date.fromisoformat(options['end_date']) if options['end_date'] else date.today()
+            start_date = (
+                date.fromisoformat(options['start_date']) if options['start_date']
+                else end_date - timedelta(days=options['days'] - 1)
+            )
+        except ValueError:
+            raise CommandError("Dates must use YYYY-MM-DD")
+        if start_date > end_date:
+            raise CommandError("The start date must not be after the end date")
+
+        window = timedelta(days=options['window'] or (end_date - start_date).days + 1)
+        current = start_date
+        while current <= end_date:
+            last = min(current + window - timedelta(days=1), end_date)
+            result = scan_anomalies(current, last)
+            found = ', '.join(f"{count} {name}" for name, count in result['anomalies'].items())
+            self.stdout.write(self.style.SUCCESS(
+                f"{current} - {last}: scanned {result['records']} records and "
+                f"{result['time_logs']} time logs, found {found}"
+            ))
+            current = last + timedelta(days=1)
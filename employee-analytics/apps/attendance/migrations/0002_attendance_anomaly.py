@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_department_position_counters'),
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('anomaly_type', models.CharField(choices=[('hours_outlier', 'Unusual Hours Worked'), ('long_day', 'Long Working Day'), ('missing_check_in', 'Check-out Without Check-in'), ('clustered_timestamp', 'Clustered Identical Timestamps')], max_length=30, verbose_name='Anomaly Type')),
+                ('score', models.FloatField(default=0, help_text='Robust z-score, hours or cluster size, depending on the type', verbose_name='Score')),
+                ('details', models.JSONField(blank=True, default=dict, verbose_name='Details')),
+                ('detected_at', models.DateTimeField(auto_now_add=True, verbose_name='Detected At')),
+                ('attendance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='anomalies', to='attendance.attendance', verbose_name='Attendance Record')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_anomalies', to='employees.employee', verbose_name='Employee')),
+            ],
+            options={
+                'verbose_name': 'Attendance Anomaly',
+                'verbose_name_plural': 'Attendance Anomalies',
+                'ordering': ('-date', '-id'),
+                'indexes': [models.Index(fields=['date', 'id'], name='anomaly_date_idx'), models.Index(fields=['anomaly_type', 'date', 'id'], name='anomaly_type_date_idx'), models.Index(fields=['employee', 'date'], name='anomaly_employee_date_idx')],
+            },
+        ),
+    ]
@@ -57,3 +57,42 @@ class TimeLog(models.Model):
         verbose_name = "Time Log"
         verbose_name_plural = "Time Logs"
         ordering = ('timestamp',)
+
+
+class AttendanceAnomaly(models.Model):
+    """
+    Suspicious attendance record flagged by the anomaly scanner
+    (apps/attendance/anomalies.py).
+
+    Rows are replaced for the scanned date range on every scan. employee and
+    date are copied from the attendance record so listings filter and page
+    on this table alone.
+    """
+    ANOMALY_TYPES = [
+        ('hours_outlier', 'Unusual Hours Worked'),
+        ('long_day', 'Long Working Day'),
+        ('missing_check_in', 'Check-out Without Check-in'),
+        ('clustered_timestamp', 'Clustered Identical Timestamps'),
+    ]
+
+    attendance = models.ForeignKey(Attendance, on_delete=models.CASCADE, related_name="anomalies", verbose_name="Attendance Record")
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="attendance_anomalies", verbose_name="Employee")
+    date = models.DateField(verbose_name="Date")
+    anomaly_type = models.CharField(max_length=30, choices=ANOMALY_TYPES, verbose_name="Anomaly Type")
+    score = models.FloatField(default=0, verbose_name="Score", help_text="Robust z-score, hours or cluster size, depending on the type")
+    details = models.JSONField(default=dict, blank=True, verbose_name="Details")
+    detected_at = models.DateTimeField(auto_now_add=True, verbose_name="Detected At")
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.date} - {self.get_anomaly_type_display()}"
+
+    class Meta:
+        verbose_name = "Attendance Anomaly"
+        verbose_name_plural = "Attendance Anomalies"
+        ordering = ('-date', '-id')
+        indexes = [
+            # Keyset paging over all anomalies and per type (ORDER BY date DESC, id DESC)
+            models.Index(fields=['date', 'id'], name='anomaly_date_idx'),
+            models.Index(fields=['anomaly_type', 'date', 'id'], name='anomaly_type_date_idx'),
+            models.Index(fields=['employee', 'date'], name='anomaly_employee_date_idx'),
+        ]
@@ -1,6 +1,6 @@
 
 from rest_framework import serializers
-from .models import Attendance, TimeLog
+from .models import Attendance, AttendanceAnomaly, TimeLog
 
 
 class TimeLogSerializer(serializers.ModelSerializer):
@@ -42,4 +42,20 @@ class AttendanceSummarySerializer(serializers.Serializer):
     absent_count = serializers.IntegerField()
     leave_count = serializers.IntegerField()
     avg_hours_worked = serializers.DecimalField(max_digits=5, decimal_places=2)
-    total_overtime_hours = serializers.DecimalField(max_digits=5, decimal_places=2)
+    total_overtime_hours = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class AttendanceAnomalySerializer(serializers.ModelSerializer):
+    """
+    Serializer for AttendanceAnomaly model.
+    """
+    employee_name = serializers.ReadOnlyField(source='employee.full_name')
+    employee_id = serializers.ReadOnlyField(source='employee.employee_id')
+
+    class Meta:
+        model = AttendanceAnomaly
+        fields = [
+            'id', 'attendance', 'employee', 'employee_name', 'employee_id', 'date',
+            'anomaly_type', 'score', 'details', 'detected_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,163 @@
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.attendance.models import Attendance, AttendanceAnomaly, TimeLog
+from apps.employees.models import Department, Employee
+from utils.testing import QueryBudgetTestMixin
+
+
+class AttendanceQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Attendance endpoints stay within their query budgets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_data()
+        cls.refresh_snapshots()
+        attendance = Attendance.objects.first()
+        AttendanceAnomaly.objects.create(
+            attendance=attendance, employee_id=attendance.employee_id, date=attendance.date,
+            anomaly_type=AttendanceAnomaly.ANOMALY_TYPES[0][0],
+        )
+
+    def test_attendances(self):
+        self.assertWithinBudget('get', '/api/attendances/')
+        self.assertWithinBudget('get', f'/api/attendances/{Attendance.objects.first().pk}/')
+
+    def test_check_in_and_out(self):
+        # The generated history ends yesterday, so the employee has no record today
+        employee = Employee.objects.filter(is_active=True).first()
+        self.assertWithinBudget('post', '/api/attendances/check_in/', {'employee_id': employee.pk}, format='json')
+        self.assertWithinBudget('post', '/api/attendances/check_out/', {'employee_id': employee.pk}, format='json')
+
+    def test_time_logs(self):
+        self.assertWithinBudget('get', '/api/time_logs/')
+        self.assertWithinBudget('get', f'/api/time_logs/{TimeLog.objects.first().pk}/')
+
+    def test_anomalies(self):
+        self.assertWithinBudget('get', '/api/attendance_anomalies/')
+        self.assertWithinBudget('get', f'/api/attendance_anomalies/{AttendanceAnomaly.objects.first().pk}/')
+
+    def test_summary(self):
+        self.assertWithinBudget('get', '/api/summary/attendance/')
+        self.assertWithinBudget('get', '/api/summary/attendance/', {'start_date': '2020-01-01', 'end_date': '2099-12-31'})
+
+    def test_summary_from_snapshot(self):
+        self.assertWithinBudget('get', '/api/summary/attendance/', {'max_staleness': 3600})
+        self.assertWithinBudget('get', '/api/summary/attendance/', {
+            'max_staleness': 3600, 'start_date': '2020-01-01', 'end_date': '2099-12-31',
+        })
+
+
+class AnomalyScanTests(TestCase):
+    """The anomaly scanner flags planted anomalies and nothing else."""
+
+    FIRST_DAY = date(2024, 3, 1)
+    DAYS = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('anomalies', 'anomalies@example.com', 'anomalies')
+        department = Department.objects.create(name='Engineering')
+        cls.employees = Employee.objects.bulk_create([
+            Employee(
+                employee_id=f'A{number:03d}', first_name='Test', last_name=str(number),
+                email=f'a{number}@example.com', department=department,
+                hire_date=date(2023, 1, 1), salary=Decimal('50000.00'),
+            )
+            for number in range(6)
+        ])
+        # Employee number and day number -> (check-in, check-out, hours worked)
+        days = {}
+        for day in range(cls.DAYS):
+            nine = datetime.combine(cls.FIRST_DAY + timedelta(days=day), time(9), dt_timezone.utc)
+            for number in range(6):
+                hours = 8 + (number + day) % 3 * 0.25
+                # Spread check-ins over half an hour, to the second
+                check_in = nine + timedelta(seconds=(number * 617 + day * 131) % 1800)
+                days[number, day] = (check_in, check_in + timedelta(hours=hours), hours)
+
+        check_in, _, _ = days[0, 5]
+        days[0, 5] = (check_in, check_in + timedelta(hours=13), 13)
+        check_in = days[1, 6][0] - timedelta(hours=3)
+        days[1, 6] = (check_in, check_in + timedelta(hours=17.5), 17.5)
+        days[2, 7] = (None, days[2, 7][1], 0)
+        # Three employees checking in at the same second; two is not enough
+        planted = days[3, 8][0]
+        for number in (3, 4, 5):
+            _, check_out, hours = days[number, 8]
+            days[number, 8] = (planted, check_out, hours)
+        _, check_out, hours = days[1, 9]
+        days[1, 9] = (days[0, 9][0], check_out, hours)
+
+        records = Attendance.objects.bulk_create([
+            Attendance(
+                employee=cls.employees[number], date=cls.FIRST_DAY + timedelta(days=day),
+                check_in=check_in, check_out=check_out, hours_worked=Decimal(str(hours)),
+            )
+            for (number, day), (check_in, check_out, hours) in days.items()
+        ])
+        TimeLog.objects.bulk_create([
+            TimeLog(attendance=record, log_type=log_type, timestamp=timestamp)
+            for record in records
+            for log_type, timestamp in (('check_in', record.check_in), ('check_out', record.check_out))
+            if timestamp is not None
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def scan(self, **data):
+        response = self.client.post('/api/attendance_anomalies/scan/', data, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def flagged(self, anomaly_type):
+        return set(
+            AttendanceAnomaly.objects.filter(anomaly_type=anomaly_type)
+            .values_list('employee__employee_id', 'date')
+        )
+
+    def day(self, number):
+        return self.FIRST_DAY + timedelta(days=number)
+
+    def test_planted_anomalies(self):
+        end_date = self.day(self.DAYS - 1)
+        result = self.scan(start_date=self.FIRST_DAY.isoformat(), end_date=end_date.isoformat())
+        self.assertEqual((result['records'], result['time_logs']), (60, 119))
+        self.assertEqual(result['anomalies'], {
+            'hours_outlier': 2, 'long_day': 1, 'missing_check_in': 1, 'clustered_timestamp': 3,
+        })
+
+        self.assertEqual(self.flagged('hours_outlier'), {('A000', self.day(5)), ('A001', self.day(6))})
+        self.assertEqual(self.flagged('long_day'), {('A001', self.day(6))})
+        self.assertEqual(self.flagged('missing_check_in'), {('A002', self.day(7))})
+        self.assertEqual(
+            self.flagged('clustered_timestamp'),
+            {('A003', self.day(8)), ('A004', self.day(8)), ('A005', self.day(8))},
+        )
+        details = AttendanceAnomaly.objects.filter(anomaly_type='clustered_timestamp').first().details
+        self.assertEqual((details['log_type'], details['employees']), ('check_in', 3))
+
+        # Scanning again replaces the anomalies of the range
+        self.scan(start_date=self.FIRST_DAY.isoformat(), end_date=end_date.isoformat())
+        self.assertEqual(AttendanceAnomaly.objects.count(), 7)
+
+    def test_range(self):
+        result = self.scan(start_date=self.day(0).isoformat(), end_date=self.day(6).isoformat())
+        self.assertEqual(result['records'], 42)
+        self.assertEqual(result['anomalies']['clustered_timestamp'], 0)
+        # Defaults to the last 30 days
+        self.assertEqual(self.scan()['records'], 0)
+
+    def test_invalid_requests(self):
+        for data in ({'end_date': '2024-03-32'}, {'start_date': '2023-01-01', 'end_date': '2024-03-10'}):
+            response = self.client.post('/api/attendance_anomalies/scan/', data, format='json')
+            self.assertEqual(response.status_code, 400, data)
+        self.client.force_authenticate(User.objects.create_user('staffless', 'staffless@example.com', 'x'))
+        response = self.client.post('/api/attendance_anomalies/scan/', {}, format='json')
+        self.assertEqual(response.status_code, 403)
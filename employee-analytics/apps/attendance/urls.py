@@ -1,11 +1,12 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AttendanceViewSet, TimeLogViewSet, attendance_summary
+from .views import AttendanceViewSet, AttendanceAnomalyViewSet, TimeLogViewSet, attendance_summary
 
 router = DefaultRouter()
 router.register(r'attendances', AttendanceViewSet)
 router.register(r'time_logs', TimeLogViewSet)
+router.register(r'attendance_anomalies', AttendanceAnomalyViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
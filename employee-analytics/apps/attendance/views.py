@@ -2,13 +2,24 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Avg, Count, Sum
+from django.db.models import Avg, Count, Q, Sum
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from datetime import datetime
+from datetime import timedelta
+from django.utils import timezone
 
-from .models import Attendance, TimeLog
-from .serializers import AttendanceSerializer, TimeLogSerializer, AttendanceSummarySerializer
+from apps.analytics import snapshots
+from utils.pagination import DateCursorPagination
+from utils.periods import parse_date_param
+from utils.query_budget import query_budget
+from .anomalies import scan_anomalies
+from .models import Attendance, AttendanceAnomaly, TimeLog
+from .serializers import (
+    AttendanceSerializer, TimeLogSerializer, AttendanceSummarySerializer, AttendanceAnomalySerializer
+)
+
+# Longest date range the scan action processes within a request
+ANOMALY_SCAN_MAX_DAYS = 366
 
 
 class AttendanceViewSet(viewsets.ModelViewSet):
@@ -26,6 +37,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     search_fields = ['employee__first_name', 'employee__last_name', 'employee__employee_id', 'notes']
     ordering_fields = ['date', 'check_in', 'check_out', 'hours_worked']
     ordering = ['-date']
+    query_budgets = {'list': 3, 'retrieve': 2}
 
     def get_queryset(self):
         """
@@ -51,9 +63,10 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         if end_date:
             queryset = queryset.filter(date__lte=end_date)
 
-        # Optimize query by selecting related employee data
-        return queryset.select_related('employee')
+        # Optimize query by selecting related employee data and nested time logs
+        return queryset.select_related('employee').prefetch_related('time_logs')
 
+    @query_budget(8)
     @action(detail=False, methods=['post'])
     def check_in(self, request):
         """
@@ -66,25 +79,27 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             Response: JSON response with check-in status
         """
         employee_id = request.data.get('employee_id')
-        today = datetime.now().date()
+        today = timezone.localdate()
 
         try:
-            # Get or create attendance record for today
-            attendance, created = Attendance.objects.get_or_create(
+            # Get or create attendance record for today, checked in now
+            now = timezone.now()
+            attendance, created = Attendance.objects.select_related('employee').get_or_create(
                 employee_id=employee_id,
                 date=today,
-                defaults={'status': 'present'}
+                defaults={'status': 'present', 'check_in': now}
             )
 
-            # Update check-in time
-            attendance.check_in = datetime.now()
-            attendance.save()
+            # Update check-in time of an existing record
+            if not created:
+                attendance.check_in = now
+                attendance.save()
 
             # Create time log
             TimeLog.objects.create(
                 attendance=attendance,
                 log_type='check_in',
-                timestamp=datetime.now()
+                timestamp=timezone.now()
             )
 
             serializer = AttendanceSerializer(attendance)
@@ -96,6 +111,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 'message': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
+    @query_budget(5)
     @action(detail=False, methods=['post'])
     def check_out(self, request):
         """
@@ -108,17 +124,17 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             Response: JSON response with check-out status
         """
         employee_id = request.data.get('employee_id')
-        today = datetime.now().date()
+        today = timezone.localdate()
 
         try:
             # Get attendance record for today
-            attendance = Attendance.objects.get(
+            attendance = Attendance.objects.select_related('employee').get(
                 employee_id=employee_id,
                 date=today
             )
 
             # Update check-out time
-            attendance.check_out = datetime.now()
+            attendance.check_out = timezone.now()
 
             # Calculate hours worked
             if attendance.check_in:
@@ -136,7 +152,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             TimeLog.objects.create(
                 attendance=attendance,
                 log_type='check_out',
-                timestamp=datetime.now()
+                timestamp=timezone.now()
             )
 
             serializer = AttendanceSerializer(attendance)
@@ -168,8 +184,82 @@ class TimeLogViewSet(viewsets.ModelViewSet):
     search_fields = ['attendance__employee__first_name', 'attendance__employee__last_name', 'notes']
     ordering_fields = ['timestamp']
     ordering = ['timestamp']
+    query_budgets = {'list': 2, 'retrieve': 1}
+
+
+class AttendanceAnomalyViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for browsing attendance anomalies.
+
+    Anomalies are written by the batch scanner (`manage.py
+    scan_attendance_anomalies` or the scan action) and paged with a cursor
+    ordered by date, so deep pages stay as cheap as the first one.
+    """
+    queryset = AttendanceAnomaly.objects.all()
+    serializer_class = AttendanceAnomalySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DateCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['employee', 'anomaly_type']
+    query_budgets = {'list': 1, 'retrieve': 1}
+
+    def get_queryset(self):
+        """
+        Get the list of anomalies for this view.
 
+        Returns:
+            QuerySet: Anomalies filtered by the optional start_date and end_date parameters
+        """
+        queryset = AttendanceAnomaly.objects.all()
+        start_date = self.request.query_params.get('start_date', None)
+        end_date = self.request.query_params.get('end_date', None)
+
+        if start_date:
+            queryset = queryset.filter(date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(date__lte=end_date)
+
+        return queryset.select_related('employee')
 
+    @action(detail=False, methods=['post'])
+    def scan(self, request):
+        """
+        Scan a date range for anomalies, replacing those stored for it.
+
+        Only staff users can scan, and at most ANOMALY_SCAN_MAX_DAYS days per
+        request; use `manage.py scan_attendance_anomalies` for longer ranges.
+
+        Args:
+            request: HTTP request with optional start_date and end_date
+                (default: the last 30 days)
+
+        Returns:
+            Response: JSON response with the number of anomalies per type
+        """
+        if not request.user.is_staff:
+            return Response({
+                'status': 'error',
+                'message': 'Only staff users can scan for anomalies'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            end_date = parse_date_param(request.data.get('end_date'), 'end_date') or timezone.localdate()
+            start_date = (
+                parse_date_param(request.data.get('start_date'), 'start_date')
+                or end_date - timedelta(days=29)
+            )
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= (end_date - start_date).days < ANOMALY_SCAN_MAX_DAYS:
+            return Response({
+                'status': 'error',
+                'message': f'The scanned range must span 1 to {ANOMALY_SCAN_MAX_DAYS} days'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(scan_anomalies(start_date, end_date))
+
+
+@query_budget(2)  # The aggregate, plus the snapshot freshness check with max_staleness
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def attendance_summary(request):
@@ -180,7 +270,8 @@ def attendance_summary(request):
     including counts by status and aggregated hours data.
 
     Args:
-        request: HTTP request with optional start_date and end_date parameters
+        request: HTTP request with optional start_date, end_date and
+            max_staleness (seconds of snapshot staleness accepted) parameters
 
     Returns:
         Response: JSON response with attendance statistics
@@ -189,6 +280,11 @@ def attendance_summary(request):
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
 
+    # Serve from the attendance snapshot when the caller accepts its staleness
+    if snapshots.snapshots_fresh(['attendance_daily'], snapshots.parse_max_staleness(request)):
+        serializer = AttendanceSummarySerializer(snapshots.attendance_stats(start_date, end_date))
+        return Response(serializer.data)
+
     # Build base query
     queryset = Attendance.objects.all()
 
@@ -199,26 +295,28 @@ def attendance_summary(request):
     if end_date:
         queryset = queryset.filter(date__lte=end_date)
 
-    # Calculate statistics by attendance status
-    total_records = queryset.count()
-    present_count = queryset.filter(status='present').count()
-    late_count = queryset.filter(status='late').count()
-    early_leave_count = queryset.filter(status='early_leave').count()
-    absent_count = queryset.filter(status='absent').count()
-    leave_count = queryset.filter(status='leave').count()
-
-    # Calculate aggregated hours data
-    avg_hours_worked = queryset.aggregate(Avg('hours_worked'))['hours_worked__avg'] or 0
-    total_overtime_hours = queryset.aggregate(Sum('overtime_hours'))['overtime_hours__sum'] or 0
+    # Calculate statistics by attendance status and aggregated hours in one query
+    stats = queryset.aggregate(
+        total_records=Count('id'),
+        present_count=Count('id', filter=Q(status='present')),
+        late_count=Count('id', filter=Q(status='late')),
+        early_leave_count=Count('id', filter=Q(status='early_leave')),
+        absent_count=Count('id', filter=Q(status='absent')),
+        leave_count=Count('id', filter=Q(status='leave')),
+        avg_hours_worked=Avg('hours_worked'),
+        total_overtime_hours=Sum('overtime_hours'),
+    )
+    avg_hours_worked = stats['avg_hours_worked'] or 0
+    total_overtime_hours = stats['total_overtime_hours'] or 0
 
     # Build response data structure
     data = {
-        'total_records': total_records,
-        'present_count': present_count,
-        'late_count': late_count,
-        'early_leave_count': early_leave_count,
-        'absent_count': absent_count,
-        'leave_count': leave_count,
+        'total_records': stats['total_records'],
+        'present_count': stats['present_count'],
+        'late_count': stats['late_count'],
+        'early_leave_count': stats['early_leave_count'],
+        'absent_count': stats['absent_count'],
+        'leave_count': stats['leave_count'],
         'avg_hours_worked': round(avg_hours_worked, 2),
         'total_overtime_hours': round(total_overtime_hours, 2)
     }
@@ -1,11 +1,11 @@
 
 from django.contrib import admin
-from .models import Employee, Department, Position
+from .models import Employee, Department, Position, EmploymentHistory
 
 
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
-    list_display = ['name', 'description']
+    list_display = ['name', 'description', 'active_employee_count', 'salary_sum']
     search_fields = ['name']
     list_filter = ['name']
 
@@ -31,3 +31,11 @@ class EmployeeAdmin(admin.ModelAdmin):
     def get_position_title(self, obj):
         return obj.position.title if obj.position else "N/A"
     get_position_title.short_description = 'Position'
+
+
+@admin.register(EmploymentHistory)
+class EmploymentHistoryAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'department', 'position', 'salary', 'valid_from', 'valid_to']
+    list_filter = ['department']
+    search_fields = ['employee__first_name', 'employee__last_name', 'employee__employee_id']
+    raw_id_fields = ['employee', 'manager']
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class EmployeesConfig(AppConfig):
+    """
+    App configuration for the employees app.
+    """
+    name = 'apps.employees'
+    verbose_name = 'Employees'
+
+    def ready(self):
+        # Register employment history signal handlers
+        from . import signals  # noqa: F401
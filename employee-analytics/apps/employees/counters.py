@@ -0,0 +1,225 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import (
+    Case, Count, DecimalField, F, Max, Min, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import Department, Employee, Position
+
+# Models carrying denormalized active employee counters, by Employee foreign key
+COUNTER_MODELS = {
+    'department': Department,
+    'position': Position,
+}
+
+COUNTER_FIELDS = ('active_employee_count', 'salary_sum', 'salary_min', 'salary_max')
+
+# Employee fields whose changes move an employee between counters
+COUNTED_FIELDS = {'department', 'department_id', 'position', 'position_id', 'salary', 'is_active'}
+
+COUNTED_STATE = ('department_id', 'position_id', 'salary', 'is_active')
+
+
+def _decimal(value):
+    """Salary as a Decimal (model attributes may hold strings or floats)."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _active_salaries(key):
+    """Subquery base: active employees of the outer department or position."""
+    return Employee.objects.filter(is_active=True, **{key: OuterRef('pk')}).order_by()
+
+
+def _adjust(key, pk, count=0, total=0, low=None, high=None, removed=None):
+    """
+    Apply a change to the counters of one department or position in a single
+    UPDATE, using F() expressions so concurrent changes do not overwrite
+    each other.
+
+    Args:
+        key: 'department' or 'position'
+        pk: Primary key of the row to update
+        count: Change of the active employee count
+        total: Change of the salary sum
+        low: Lowest salary added (None if nothing was added)
+        high: Highest salary added (None if nothing was added)
+        removed: Salaries removed, to decide whether min/max must be looked up again
+    """
+    if pk is None:
+        return
+    updates = {}
+    if count:
+        updates['active_employee_count'] = F('active_employee_count') + count
+    if total:
+        updates['salary_sum'] = F('salary_sum') + total
+
+    for field, bound, added, order, boundary in (
+        ('salary_min', Least, low, 'salary', 'lte'),
+        ('salary_max', Greatest, high, '-salary', 'gte'),
+    ):
+        expression = F(field)
+        if added is not None:
+            added = Value(_decimal(added), output_field=DecimalField(max_digits=10, decimal_places=2))
+            expression = bound(Coalesce(F(field), added), added)
+        if removed:
+            # A removed salary at the boundary needs the remaining salaries; the
+            # employee rows are already written, so the subquery sees them
+            # (including added salaries)
+            edge = min(removed) if field == 'salary_min' else max(removed)
+            expression = Case(
+                When(Q(**{f'{field}__{boundary}': edge}),
+                     then=Subquery(_active_salaries(key).order_by(order).values('salary')[:1])),
+                default=expression,
+            )
+        if added is not None or removed:
+            updates[field] = expression
+
+    if updates:
+        COUNTER_MODELS[key].objects.filter(pk=pk).update(**updates)
+
+
+def update_counters(previous, current):
+    """
+    Move an employee between counters after it was saved or deleted.
+
+    Args:
+        previous: Counted field values as loaded before the change (None for new employees)
+        current: Counted field values as saved (None for deleted employees)
+    """
+    if previous is not None and any(field not in previous for field in COUNTED_STATE):
+        # Fields were deferred when loaded, the previous groups are unknown
+        recount()
+        return
+
+    for key in COUNTER_MODELS:
+        old = (previous[f'{key}_id'], _decimal(previous['salary'])) if previous and previous['is_active'] else None
+        new = (current[f'{key}_id'], _decimal(current['salary'])) if current and current['is_active'] else None
+        if old == new:
+            continue
+        if old and new and old[0] == new[0]:
+            # Same group, only the salary changed
+            _adjust(key, new[0], total=new[1] - old[1], low=new[1], high=new[1], removed=[old[1]])
+            continue
+        if old:
+            _adjust(key, old[0], count=-1, total=-old[1], removed=[old[1]])
+        if new:
+            _adjust(key, new[0], count=1, total=new[1], low=new[1], high=new[1])
+
+
+def add_employees(employees):
+    """
+    Add newly inserted employees to their counters, one UPDATE per group.
+
+    Args:
+        employees: Employee instances that were just created
+    """
+    for key in COUNTER_MODELS:
+        groups = defaultdict(list)
+        for employee in employees:
+            if employee.is_active:
+                groups[getattr(employee, f'{key}_id')].append(_decimal(employee.salary))
+        for pk, salaries in groups.items():
+            _adjust(key, pk, count=len(salaries), total=sum(salaries), low=min(salaries), high=max(salaries))
+
+
+def recount(department_ids=None, position_ids=None):
+    """
+    Recompute counters from the employee table.
+
+    Args:
+        department_ids: Departments to recount (None for all)
+        position_ids: Positions to recount (None for all)
+    """
+    for key, ids in (('department', department_ids), ('position', position_ids)):
+        queryset = COUNTER_MODELS[key].objects.all()
+        if ids is not None:
+            ids = {pk for pk in ids if pk is not None}
+            if not ids:
+                continue
+            queryset = queryset.filter(pk__in=ids)
+
+        active = _active_salaries(key).values(key)
+        queryset.update(
+            active_employee_count=Coalesce(Subquery(active.annotate(value=Count('id')).values('value')), 0),
+            salary_sum=Coalesce(Subquery(active.annotate(value=Sum('salary')).values('value')), Value(Decimal(0))),
+            salary_min=Subquery(active.annotate(value=Min('salary')).values('value')),
+            salary_max=Subquery(active.annotate(value=Max('salary')).values('value')),
+        )
+
+
+def _pk(value):
+    """Primary key from a foreign key value (instance, pk or None)."""
+    return getattr(value, 'pk', value)
+
+
+def recount_updated(groups, changes):
+    """
+    Recount the groups touched by a QuerySet.update() of employees.
+
+    Args:
+        groups: (department_id, position_id) pairs of the updated rows before the update
+        changes: Keyword arguments passed to update()
+    """
+    targets = {}
+    for key in COUNTER_MODELS:
+        ids = {pair[0 if key == 'department' else 1] for pair in groups}
+        for name in (key, f'{key}_id'):
+            if name not in changes:
+                continue
+            if hasattr(changes[name], 'resolve_expression'):
+                # Rows may have moved anywhere
+                ids = None
+                break
+            ids.add(_pk(changes[name]))
+        targets[f'{key}_ids'] = ids
+    recount(**targets)
+
+
+def actual_counters(key):
+    """
+    Counters computed from the employee table, in one grouped query.
+
+    Args:
+        key: 'department' or 'position'
+
+    Returns:
+        dict: Primary key -> (active_employee_count, salary_sum, salary_min, salary_max)
+    """
+    rows = Employee.objects.filter(is_active=True, **{f'{key}__isnull': False}).values(f'{key}_id').annotate(
+        count=Count('id'), total=Sum('salary'), low=Min('salary'), high=Max('salary'),
+    ).order_by()
+    return {row[f'{key}_id']: (row['count'], row['total'], row['low'], row['high']) for row in rows}
+
+
+def _normalize(counters):
+    """Comparable counter values (decimals quantized to cents)."""
+    return tuple(
+        value.quantize(Decimal('0.01')) if isinstance(value, Decimal) else value
+        for value in counters
+    )
+
+
+def find_drift(key):
+    """
+    Compare stored counters with the employee table.
+
+    Args:
+        key: 'department' or 'position'
+
+    Returns:
+        list: (instance, stored counters, actual counters) for rows that differ
+    """
+    actual = actual_counters(key)
+    empty = (0, Decimal(0), None, None)
+    drift = []
+    queryset = COUNTER_MODELS[key].objects.order_by('pk')
+    if key == 'position':
+        queryset = queryset.select_related('department')
+    for instance in queryset:
+        stored = tuple(getattr(instance, field) for field in COUNTER_FIELDS)
+        expected = actual.get(instance.pk, empty)
+        if _normalize(stored) != _normalize(expected):
+            drift.append((instance, stored, expected))
+    return drift
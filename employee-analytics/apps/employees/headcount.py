@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Q
+
+from utils.periods import period_starts
+from .models import EmploymentHistory
+
+
+def headcount_series(start_date, end_date, interval='month', department=None):
+    """
+    Headcount per department at the end of each period of a date range.
+
+    History records overlapping the range are read in one query. Each
+    record adds one to every sample date in [valid_from, valid_to): its
+    first and last sample positions are found by binary search, marked in
+    a difference array and a cumulative sum over the dates turns the marks
+    into headcounts, so the cost does not depend on the number of periods.
+
+    Args:
+        start_date: First day of the range
+        end_date: Last day of the range
+        interval: Period size, one of "week", "month", "quarter" or "year"
+        department: Only count this department
+
+    Returns:
+        dict: Sample dates, total headcount and per-department headcount series
+
+    Raises:
+        ValueError: If the interval is not supported
+    """
+    starts = period_starts(start_date, end_date, interval)
+    ends = [next_start - timedelta(days=1) for next_start in starts[1:]] + [end_date]
+    dates = [min(day, end_date) for day in ends]
+    points = np.array(dates, dtype='datetime64[D]')
+
+    queryset = EmploymentHistory.objects.filter(valid_from__lte=dates[-1]).filter(
+        Q(valid_to__isnull=True) | Q(valid_to__gt=dates[0])
+    )
+    if department:
+        queryset = queryset.filter(department_id=department)
+    rows = list(queryset.values_list('department_id', 'department__name', 'valid_from', 'valid_to'))
+
+    result = {'interval': interval, 'dates': [day.isoformat() for day in dates]}
+    if not rows:
+        return {**result, 'total': [0] * len(dates), 'departments': []}
+
+    department_ids, department_names, valid_from, valid_to = zip(*rows)
+    keys = np.array([-1 if value is None else value for value in department_ids])
+    unique_keys, index = np.unique(keys, return_inverse=True)
+    names = dict(zip(keys.tolist(), department_names))
+
+    # Sample dates covered by each record: valid_from <= date < valid_to
+    first = np.searchsorted(points, np.array(valid_from, dtype='datetime64[D]'), side='left')
+    open_ended = np.array([value is None for value in valid_to])
+    until = np.array([value or dates[-1] for value in valid_to], dtype='datetime64[D]')
+    last = np.where(open_ended, len(points), np.searchsorted(points, until, side='left'))
+
+    marks = np.zeros((len(unique_keys), len(points) + 1), dtype=int)
+    np.add.at(marks, (index, first), 1)
+    np.add.at(marks, (index, last), -1)
+    counts = np.cumsum(marks, axis=1)[:, :len(points)]
+
+    return {
+        **result,
+        'total': counts.sum(axis=0).tolist(),
+        'departments': [
+            {
+                'department_id': None if key == -1 else int(key),
+                'department_name': names[int(key)],
+                'headcount': counts[position].tolist(),
+            }
+            for position, key in enumerate(unique_keys)
+        ],
+    }
@@ -0,0 +1,38 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.datasets import MANIFEST_NAME, dump_dataset
+
+
+class Command(BaseCommand):
+    """
+    Dump the employee, attendance and performance tables to a dataset directory.
+
+    Usage:
+        python manage.py dump_dataset datasets/large
+        python manage.py dump_dataset datasets/large --overwrite
+    """
+    help = 'Write the dataset tables as gzip compressed COPY files with a manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Dataset directory (created if missing)')
+        parser.add_argument('--overwrite', action='store_true', help='Replace an existing dataset in the directory')
+        parser.add_argument('--compress-level', type=int, default=6, choices=range(1, 10), metavar='1-9',
+                            help='gzip compression level (default: 6)')
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if os.path.exists(os.path.join(directory, MANIFEST_NAME)) and not options['overwrite']:
+            raise CommandError(f"{directory} already contains a dataset (use --overwrite)")
+
+        manifest = dump_dataset(directory, compresslevel=options['compress_level'])
+        for table in manifest['tables']:
+            self.stdout.write(
+                f"  {table['model']:<30} {table['rows']:>12,} rows {table['bytes'] / 1e6:>9.1f} MB {table['seconds']:>7}s"
+            )
+        rows = sum(table['rows'] for table in manifest['tables'])
+        size = sum(table['bytes'] for table in manifest['tables'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Dumped {rows:,} rows ({size / 1e6:.1f} MB) to {directory} in {manifest['seconds']}s"
+        ))
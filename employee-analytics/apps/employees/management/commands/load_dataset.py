@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.datasets import load_dataset
+
+
+class Command(BaseCommand):
+    """
+    Load a dataset directory written by dump_dataset.
+
+    Usage:
+        python manage.py load_dataset datasets/large
+        python manage.py load_dataset datasets/large --truncate
+    """
+    help = 'Restore the dataset tables with COPY (PostgreSQL) or batched inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Dataset directory')
+        parser.add_argument(
+            '--truncate', action='store_true',
+            help='Empty the dataset tables and the tables referencing them before loading',
+        )
+        parser.add_argument('--chunk-size', type=int, default=10000,
+                            help='Rows per insert batch without COPY (default: 10000)')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        def progress(entry, rows, seconds):
+            rate = rows / seconds if seconds else 0
+            self.stdout.write(f"  {entry['model']:<30} {rows:>12,} rows {seconds:>7.2f}s {rate:>12,.0f} rows/s")
+
+        try:
+            result = load_dataset(
+                options['directory'], truncate=options['truncate'],
+                chunk_size=options['chunk_size'], progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        rows = sum(result['rows'].values())
+        seconds = result['seconds'] or 1e-6
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {rows:,} rows in {result['seconds']}s ({rows / seconds:,.0f} rows/s)"
+        ))
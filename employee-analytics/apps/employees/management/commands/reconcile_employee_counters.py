@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.employees.counters import COUNTER_FIELDS, COUNTER_MODELS, find_drift, recount
+
+
+class Command(BaseCommand):
+    """
+    Verify the denormalized department/position employee counters and repair drift.
+
+    Usage:
+        python manage.py reconcile_employee_counters
+        python manage.py reconcile_employee_counters --check
+    """
+    help = 'Compare department/position employee counters with the employee table and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report drift and exit with an error if any is found',
+        )
+
+    def handle(self, *args, **options):
+        drifted = 0
+        for key, model in COUNTER_MODELS.items():
+            with transaction.atomic():
+                drift = find_drift(key)
+                for instance, stored, actual in drift:
+                    changes = ', '.join(
+                        f"{field} {old} -> {new}"
+                        for field, old, new in zip(COUNTER_FIELDS, stored, actual)
+                        if old != new
+                    )
+                    self.stdout.write(f"{model._meta.verbose_name} {instance.pk} ({instance}): {changes}")
+                if drift and not options['check']:
+                    recount(**{
+                        f'{name}_ids': {instance.pk for instance, _, _ in drift} if name == key else set()
+                        for name in COUNTER_MODELS
+                    })
+            drifted += len(drift)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Employee counters are consistent"))
+        elif options['check']:
+            raise CommandError(f"{drifted} counter row(s) drifted, run without --check to repair them")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {drifted} counter row(s)"))
@@ -0,0 +1,121 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('employees', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='department',
+            name='description',
+            field=models.TextField(blank=True, help_text='Optional description of the department', null=True),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='name',
+            field=models.CharField(help_text='Name of the department', max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='department',
+            field=models.ForeignKey(help_text='Department where employee works', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employees', to='employees.department', verbose_name='Department'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='email',
+            field=models.EmailField(help_text="Employee's email address", max_length=254, unique=True, verbose_name='Email'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='employee_id',
+            field=models.CharField(help_text='Unique employee identifier', max_length=20, unique=True, verbose_name='Employee ID'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='first_name',
+            field=models.CharField(help_text="Employee's first name", max_length=50, verbose_name='First Name'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='gender',
+            field=models.CharField(blank=True, choices=[('M', 'Male'), ('F', 'Female'), ('O', 'Other')], help_text="Employee's gender", max_length=1, null=True),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='hire_date',
+            field=models.DateField(help_text='Date when employee was hired', verbose_name='Hire Date'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='is_active',
+            field=models.BooleanField(default=True, help_text='Whether employee is currently active', verbose_name='Employment Status'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='last_name',
+            field=models.CharField(help_text="Employee's last name", max_length=50, verbose_name='Last Name'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='manager',
+            field=models.ForeignKey(blank=True, help_text="Employee's direct manager (optional)", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subordinates', to='employees.employee', verbose_name='Manager'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='phone',
+            field=models.CharField(blank=True, help_text="Employee's phone number", max_length=20, verbose_name='Phone Number'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='position',
+            field=models.ForeignKey(help_text="Employee's job position", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employees', to='employees.position', verbose_name='Position'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='profile_image',
+            field=models.ImageField(blank=True, help_text="Employee's profile photo", null=True, upload_to='profile_images/', verbose_name='Profile Image'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='salary',
+            field=models.DecimalField(decimal_places=2, help_text="Employee's current salary", max_digits=10, verbose_name='Salary'),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='user',
+            field=models.OneToOneField(blank=True, help_text='Django user account associated with this employee (optional)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='employee_profile', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='position',
+            name='department',
+            field=models.ForeignKey(help_text='Department this position belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='positions', to='employees.department'),
+        ),
+        migrations.AlterField(
+            model_name='position',
+            name='description',
+            field=models.TextField(blank=True, help_text='Optional description of the position', null=True),
+        ),
+        migrations.AlterField(
+            model_name='position',
+            name='max_salary',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Maximum salary for this position', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='position',
+            name='min_salary',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Minimum salary for this position', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='position',
+            name='title',
+            field=models.CharField(help_text='Job title (e.g., Software Developer)', max_length=100),
+        ),
+    ]
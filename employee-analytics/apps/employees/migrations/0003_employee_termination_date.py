@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_alter_department_description_alter_department_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='termination_date',
+            field=models.DateField(blank=True, help_text='Date when employment ended (optional, used for attrition analytics)', null=True, verbose_name='Termination Date'),
+        ),
+    ]
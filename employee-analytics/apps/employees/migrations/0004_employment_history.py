@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_history(apps, schema_editor):
+    """Open one history record per existing employee, starting at the hire date."""
+    Employee = apps.get_model('employees', 'Employee')
+    EmploymentHistory = apps.get_model('employees', 'EmploymentHistory')
+    records = []
+    for employee in Employee.objects.iterator():
+        if employee.termination_date:
+            valid_to = max(employee.termination_date, employee.hire_date)
+        elif not employee.is_active:
+            # End date unknown: treated as leaving at hire, like cohort retention
+            valid_to = employee.hire_date
+        else:
+            valid_to = None
+        records.append(EmploymentHistory(
+            employee_id=employee.pk,
+            department_id=employee.department_id,
+            position_id=employee.position_id,
+            manager_id=employee.manager_id,
+            salary=employee.salary,
+            valid_from=employee.hire_date,
+            valid_to=valid_to,
+        ))
+    EmploymentHistory.objects.bulk_create(records, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_employee_termination_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmploymentHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('salary', models.DecimalField(decimal_places=2, help_text='Salary during the interval', max_digits=10)),
+                ('valid_from', models.DateField(help_text='First day of the interval')),
+                ('valid_to', models.DateField(blank=True, help_text='Day after the interval ended (empty while current)', null=True)),
+                ('recorded_at', models.DateTimeField(auto_now_add=True, help_text='When the record was written')),
+                ('department', models.ForeignKey(help_text='Department during the interval', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employment_history', to='employees.department')),
+                ('employee', models.ForeignKey(help_text='Employee the record belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='history', to='employees.employee')),
+                ('manager', models.ForeignKey(blank=True, help_text='Manager during the interval', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='managed_history', to='employees.employee')),
+                ('position', models.ForeignKey(help_text='Position during the interval', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employment_history', to='employees.position')),
+            ],
+            options={
+                'verbose_name': 'Employment History',
+                'verbose_name_plural': 'Employment History',
+                'ordering': ('employee', 'valid_from'),
+                'indexes': [models.Index(fields=['employee', 'valid_from'], name='history_employee_from_idx'), models.Index(fields=['valid_from', 'valid_to', 'department'], name='history_range_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='employmenthistory',
+            constraint=models.UniqueConstraint(condition=models.Q(('valid_to__isnull', True)), fields=('employee',), name='history_one_current_per_employee'),
+        ),
+        migrations.RunPython(backfill_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:15
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    """Compute the active employee counters of existing departments and positions."""
+    Employee = apps.get_model('employees', 'Employee')
+    for model_name, key in (('Department', 'department'), ('Position', 'position')):
+        active = Employee.objects.filter(is_active=True, **{key: OuterRef('pk')}).order_by().values(key)
+        apps.get_model('employees', model_name).objects.update(
+            active_employee_count=Coalesce(Subquery(active.annotate(value=Count('id')).values('value')), 0),
+            salary_sum=Coalesce(Subquery(active.annotate(value=Sum('salary')).values('value')), Value(Decimal(0))),
+            salary_min=Subquery(active.annotate(value=Min('salary')).values('value')),
+            salary_max=Subquery(active.annotate(value=Max('salary')).values('value')),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employment_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='active_employee_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active employees'),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='salary_max',
+            field=models.DecimalField(decimal_places=2, editable=False, help_text='Highest salary of active employees', max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='salary_min',
+            field=models.DecimalField(decimal_places=2, editable=False, help_text='Lowest salary of active employees', max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='salary_sum',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Total salary of active employees', max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='active_employee_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active employees'),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='salary_max',
+            field=models.DecimalField(decimal_places=2, editable=False, help_text='Highest salary of active employees', max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='salary_min',
+            field=models.DecimalField(decimal_places=2, editable=False, help_text='Lowest salary of active employees', max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='salary_sum',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Total salary of active employees', max_digits=14),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
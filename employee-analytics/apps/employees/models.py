@@ -1,5 +1,5 @@
 
-from django.db import models  # Django's database models framework
+from django.db import models, transaction  # Django's database models framework
 from django.contrib.auth.models import User  # Django's built-in User model
 
 
@@ -13,6 +13,14 @@ class Department(models.Model):
     Attributes:
         name (CharField): The name of the department (must be unique)
         description (TextField): Optional description of the department
+        active_employee_count (PositiveIntegerField): Number of active employees
+        salary_sum (DecimalField): Total salary of active employees
+        salary_min (DecimalField): Lowest salary of active employees
+        salary_max (DecimalField): Highest salary of active employees
+
+    The counters are denormalized from Employee and maintained by
+    apps/employees/counters.py; `manage.py reconcile_employee_counters`
+    verifies and repairs them.
     
     Methods:
         __str__: Returns the department name as string representation
@@ -23,6 +31,28 @@ class Department(models.Model):
     """
     name = models.CharField(max_length=100, unique=True, help_text="Name of the department")
     description = models.TextField(blank=True, null=True, help_text="Optional description of the department")
+    active_employee_count = models.PositiveIntegerField(default=0, editable=False, help_text="Number of active employees")
+    salary_sum = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text="Total salary of active employees"
+    )
+    salary_min = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        editable=False,
+        help_text="Lowest salary of active employees"
+    )
+    salary_max = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        editable=False,
+        help_text="Highest salary of active employees"
+    )
 
     def __str__(self):
         """String representation of the Department model."""
@@ -46,6 +76,10 @@ class Position(models.Model):
         description (TextField): Optional description of the position
         min_salary (DecimalField): Minimum salary for this position
         max_salary (DecimalField): Maximum salary for this position
+        active_employee_count (PositiveIntegerField): Number of active employees
+        salary_sum (DecimalField): Total salary of active employees
+        salary_min (DecimalField): Lowest salary of active employees
+        salary_max (DecimalField): Highest salary of active employees
     
     Methods:
         __str__: Returns formatted position title and department name
@@ -75,6 +109,28 @@ class Position(models.Model):
         default=0,
         help_text="Maximum salary for this position"
     )
+    active_employee_count = models.PositiveIntegerField(default=0, editable=False, help_text="Number of active employees")
+    salary_sum = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text="Total salary of active employees"
+    )
+    salary_min = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        editable=False,
+        help_text="Lowest salary of active employees"
+    )
+    salary_max = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        editable=False,
+        help_text="Highest salary of active employees"
+    )
 
     def __str__(self):
         """String representation of the Position model."""
@@ -86,6 +142,54 @@ class Position(models.Model):
         unique_together = ('title', 'department')
 
 
+class EmployeeQuerySet(models.QuerySet):
+    """
+    Employee queryset keeping the department and position counters exact and
+    the employment history written on bulk writes, which do not send model
+    signals.
+    """
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False, update_conflicts=False,
+                    update_fields=None, unique_fields=None):
+        """Insert employees, add the active ones to their counters and open their history."""
+        from .counters import add_employees, recount
+        from .signals import open_employment_history
+
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(
+                objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts,
+                update_conflicts=update_conflicts, update_fields=update_fields, unique_fields=unique_fields,
+            )
+            if ignore_conflicts or update_conflicts:
+                # Which rows were inserted or overwritten is unknown
+                recount()
+            else:
+                add_employees(objs)
+                open_employment_history(objs, batch_size)
+        return objs
+
+    def update(self, **kwargs):
+        """Update employees, recount the groups they left or joined and record their history."""
+        from .counters import COUNTED_FIELDS, recount_updated
+        from .signals import HISTORY_UPDATE_FIELDS, sync_employment_history
+
+        counted = COUNTED_FIELDS.intersection(kwargs)
+        tracked = HISTORY_UPDATE_FIELDS.intersection(kwargs)
+        if not counted and not tracked:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            if counted:
+                groups = set(self.order_by().values_list('department_id', 'position_id').distinct())
+            if tracked:
+                employee_ids = list(self.order_by().values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+            if counted:
+                recount_updated(groups, kwargs)
+            if tracked:
+                sync_employment_history(employee_ids)
+        return rows
+
+
 class Employee(models.Model):
     """
     Employee model representing company employees.
@@ -107,7 +211,11 @@ class Employee(models.Model):
         salary (DecimalField): Employee's current salary
         manager (ForeignKey): Self-referencing field for reporting structure
         is_active (BooleanField): Whether employee is currently active
+        termination_date (DateField): Date when employment ended (optional)
         profile_image (ImageField): Employee's profile photo
+
+    Saves run in a transaction together with the signal handlers that keep
+    the department/position counters and the employment history in sync.
     
     Methods:
         __str__: Returns formatted employee name with ID
@@ -206,6 +314,12 @@ class Employee(models.Model):
         verbose_name="Employment Status",
         help_text="Whether employee is currently active"
     )
+    termination_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Termination Date",
+        help_text="Date when employment ended (optional, used for attrition analytics)"
+    )
     profile_image = models.ImageField(
         upload_to='profile_images/', 
         null=True, 
@@ -214,6 +328,8 @@ class Employee(models.Model):
         help_text="Employee's profile photo"
     )
 
+    objects = EmployeeQuerySet.as_manager()
+
     def __str__(self):
         """String representation of the Employee model."""
         return f"{self.first_name} {self.last_name} ({self.employee_id})"
@@ -228,7 +344,100 @@ class Employee(models.Model):
         """
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, **kwargs):
+        """Save the employee and its derived counters and history atomically."""
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Employee"
         verbose_name_plural = "Employees"
         ordering = ('last_name', 'first_name')
+
+
+class EmploymentHistory(models.Model):
+    """
+    Effective-dated employment record of an employee.
+
+    Each row holds the department, position, manager and salary an employee
+    had from valid_from (inclusive) until valid_to (exclusive). The current
+    row has no valid_to. Rows are written automatically when these fields
+    change, including through Employee.objects.bulk_create() and update()
+    (see apps/employees/signals.py).
+
+    Attributes:
+        employee (ForeignKey): Employee the record belongs to
+        department (ForeignKey): Department during the interval
+        position (ForeignKey): Position during the interval
+        manager (ForeignKey): Manager during the interval
+        salary (DecimalField): Salary during the interval
+        valid_from (DateField): First day of the interval
+        valid_to (DateField): Day after the interval ended (null while current)
+        recorded_at (DateTimeField): When the record was written
+
+    Meta:
+        indexes: As-of lookups per employee and per department
+        constraints: At most one current record per employee
+    """
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="history",
+        help_text="Employee the record belongs to"
+    )
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="employment_history",
+        help_text="Department during the interval"
+    )
+    position = models.ForeignKey(
+        Position,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="employment_history",
+        help_text="Position during the interval"
+    )
+    manager = models.ForeignKey(
+        Employee,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="managed_history",
+        help_text="Manager during the interval"
+    )
+    salary = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        help_text="Salary during the interval"
+    )
+    valid_from = models.DateField(help_text="First day of the interval")
+    valid_to = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Day after the interval ended (empty while current)"
+    )
+    recorded_at = models.DateTimeField(auto_now_add=True, help_text="When the record was written")
+
+    def __str__(self):
+        """String representation of the EmploymentHistory model."""
+        return f"{self.employee_id}: {self.valid_from} - {self.valid_to or 'current'}"
+
+    class Meta:
+        verbose_name = "Employment History"
+        verbose_name_plural = "Employment History"
+        ordering = ('employee', 'valid_from')
+        indexes = [
+            # As-of lookups for one employee: WHERE employee = ? AND valid_from <= ? ORDER BY valid_from DESC
+            models.Index(fields=['employee', 'valid_from'], name='history_employee_from_idx'),
+            # Headcount over a date range: intervals overlapping it, per department
+            models.Index(fields=['valid_from', 'valid_to', 'department'], name='history_range_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee'],
+                condition=models.Q(valid_to__isnull=True),
+                name='history_one_current_per_employee',
+            ),
+        ]
@@ -1,7 +1,7 @@
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Employee, Department, Position
+from .models import Employee, Department, Position, EmploymentHistory
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -17,25 +17,23 @@ class UserSerializer(serializers.ModelSerializer):
 class DepartmentSerializer(serializers.ModelSerializer):
     """
     Serializer for Department model with employee count.
+
+    The count of active employees is read from the denormalized counter.
     """
-    employee_count = serializers.SerializerMethodField()
+    employee_count = serializers.IntegerField(source='active_employee_count', read_only=True)
 
     class Meta:
         model = Department
         fields = ['id', 'name', 'description', 'employee_count']
         read_only_fields = ['id']
 
-    def get_employee_count(self, obj):
-        """Get count of active employees in the department."""
-        return obj.employees.filter(is_active=True).count()
-
 
 class PositionSerializer(serializers.ModelSerializer):
     """
     Serializer for Position model.
     """
     department_name = serializers.ReadOnlyField(source='department.name')
-    employee_count = serializers.SerializerMethodField()
+    employee_count = serializers.IntegerField(source='active_employee_count', read_only=True)
 
     class Meta:
         model = Position
@@ -43,10 +41,6 @@ class PositionSerializer(serializers.ModelSerializer):
                  'min_salary', 'max_salary', 'employee_count']
         read_only_fields = ['id']
 
-    def get_employee_count(self, obj):
-        """Get count of employees in this position."""
-        return obj.employees.filter(is_active=True).count()
-
 
 class EmployeeSerializer(serializers.ModelSerializer):
     """
@@ -63,10 +57,20 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'id', 'employee_id', 'user', 'first_name', 'last_name', 'full_name',
             'gender', 'email', 'phone', 'department', 'department_name',
             'position', 'position_title', 'hire_date', 'salary', 'manager', 
-            'manager_name', 'is_active', 'profile_image'
+            'manager_name', 'is_active', 'termination_date', 'profile_image'
         ]
         read_only_fields = ['id']
 
+    def validate(self, data):
+        """
+        Check that the termination date does not precede the hire date.
+        """
+        hire_date = data.get('hire_date', getattr(self.instance, 'hire_date', None))
+        termination_date = data.get('termination_date', getattr(self.instance, 'termination_date', None))
+        if hire_date and termination_date and termination_date < hire_date:
+            raise serializers.ValidationError({'termination_date': "Termination date cannot precede the hire date."})
+        return data
+
 
 class EmployeeDetailSerializer(EmployeeSerializer):
     """
@@ -93,3 +97,20 @@ class DepartmentSummarySerializer(serializers.Serializer):
     avg_salary = serializers.DecimalField(max_digits=10, decimal_places=2)
     min_salary = serializers.DecimalField(max_digits=10, decimal_places=2)
     max_salary = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class EmploymentHistorySerializer(serializers.ModelSerializer):
+    """
+    Serializer for effective-dated employment records.
+    """
+    department_name = serializers.ReadOnlyField(source='department.name')
+    position_title = serializers.ReadOnlyField(source='position.title')
+    manager_name = serializers.ReadOnlyField(source='manager.full_name')
+
+    class Meta:
+        model = EmploymentHistory
+        fields = [
+            'id', 'department', 'department_name', 'position', 'position_title',
+            'manager', 'manager_name', 'salary', 'valid_from', 'valid_to'
+        ]
+        read_only_fields = fields
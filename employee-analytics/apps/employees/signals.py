@@ -0,0 +1,200 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .counters import update_counters
+from .models import Employee, EmploymentHistory
+
+# Employee fields whose changes open a new employment history record
+HISTORY_FIELDS = ('department_id', 'position_id', 'manager_id', 'salary')
+
+# Fields deciding whether the employee is still employed
+STATUS_FIELDS = ('is_active', 'termination_date')
+
+
+# Every field whose loaded value is remembered (counters also use is_active)
+TRACKED_FIELDS = HISTORY_FIELDS + STATUS_FIELDS
+
+# QuerySet.update() arguments changing the employment history
+HISTORY_UPDATE_FIELDS = {name for field in TRACKED_FIELDS for name in (field, field.removesuffix('_id'))}
+
+
+def _loaded_state(instance):
+    """Tracked field values loaded on an instance (deferred fields are skipped)."""
+    return {
+        field: instance.__dict__[field]
+        for field in TRACKED_FIELDS
+        if field in instance.__dict__
+    }
+
+
+def employment_end(employee):
+    """
+    Get the date an employee's employment ended.
+
+    Returns:
+        date or None: The termination date, today for inactive employees
+            without one, None while employed
+    """
+    if employee.termination_date:
+        return employee.termination_date
+    if not employee.is_active:
+        return timezone.localdate()
+    return None
+
+
+def history_values(employee):
+    """Values of the tracked fields, as stored on a history record."""
+    return {
+        'department_id': employee.department_id,
+        'position_id': employee.position_id,
+        'manager_id': employee.manager_id,
+        'salary': employee.salary,
+    }
+
+
+@receiver(post_init, sender=Employee)
+def remember_tracked_state(sender, instance, **kwargs):
+    """Remember the tracked fields as loaded, to detect changes on save."""
+    instance._tracked_state = _loaded_state(instance)
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Update the department/position counters and the employment history.
+
+    Both handlers compare against the state remembered when the employee
+    was loaded (or last saved), so they run from this single receiver.
+    """
+    if raw:
+        return
+
+    previous = instance._tracked_state
+    current = _loaded_state(instance)
+    instance._tracked_state = current
+    if not created and all(previous.get(field) == value for field, value in current.items()):
+        return
+
+    update_counters(None if created else previous, current)
+    record_employment_history(instance, created)
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, **kwargs):
+    """Remove a deleted employee from its department/position counters."""
+    update_counters(instance._tracked_state, None)
+
+
+def record_employment_history(instance, created):
+    """
+    Keep the effective-dated employment history in sync with the employee.
+
+    New employees get a record starting at their hire date. Changes to the
+    department, position, manager or salary close the current record today
+    and open a new one (a record opened today is updated in place).
+    Terminations close the current record at the termination date.
+
+    Args:
+        instance: Saved employee whose tracked fields changed
+        created: Whether the employee was just created
+    """
+    today = timezone.localdate()
+    end = employment_end(instance)
+    record = EmploymentHistory.objects.filter(employee=instance, valid_to__isnull=True).first()
+
+    if end is not None:
+        if record is not None:
+            record.valid_to = max(end, record.valid_from)
+            record.save(update_fields=['valid_to'])
+        elif created:
+            EmploymentHistory.objects.create(
+                employee=instance, valid_from=instance.hire_date,
+                valid_to=max(end, instance.hire_date), **history_values(instance),
+            )
+        return
+
+    values = history_values(instance)
+    if record is None:
+        # New hire, rehire, or an employee recorded before history existed
+        valid_from = instance.hire_date
+        if not created and EmploymentHistory.objects.filter(employee=instance).exists():
+            valid_from = today
+        EmploymentHistory.objects.create(employee=instance, valid_from=valid_from, **values)
+    elif any(getattr(record, field) != value for field, value in values.items()):
+        if record.valid_from >= today:
+            EmploymentHistory.objects.filter(pk=record.pk).update(**values)
+        else:
+            record.valid_to = today
+            record.save(update_fields=['valid_to'])
+            EmploymentHistory.objects.create(employee=instance, valid_from=today, **values)
+
+
+def open_employment_history(employees, batch_size=None):
+    """
+    Write the first history record of employees inserted with bulk_create,
+    which sends no post_save (see record_employment_history).
+
+    Args:
+        employees: Employee instances that were just created
+        batch_size: Rows per INSERT statement
+    """
+    records = []
+    for employee in employees:
+        end = employment_end(employee)
+        records.append(EmploymentHistory(
+            employee_id=employee.pk, valid_from=employee.hire_date,
+            valid_to=max(end, employee.hire_date) if end is not None else None,
+            **history_values(employee),
+        ))
+    EmploymentHistory.objects.bulk_create(records, batch_size=batch_size)
+
+
+def sync_employment_history(employee_ids):
+    """
+    Bring the history of employees changed by QuerySet.update(), which sends
+    no post_save, in line with their rows: the batch equivalent of
+    record_employment_history, in four queries whatever the number of
+    employees.
+
+    Args:
+        employee_ids: Primary keys of the updated employees
+    """
+    today = timezone.localdate()
+    employees = Employee.objects.filter(pk__in=employee_ids).only('hire_date', *TRACKED_FIELDS)
+    records = {
+        record.employee_id: record
+        for record in EmploymentHistory.objects.filter(employee_id__in=employee_ids, valid_to__isnull=True)
+    }
+    with_history = set(
+        EmploymentHistory.objects.filter(employee_id__in=employee_ids)
+        .values_list('employee_id', flat=True).distinct()
+    )
+
+    changed, created = [], []
+    for employee in employees:
+        end = employment_end(employee)
+        record = records.get(employee.pk)
+        if end is not None:
+            if record is not None:
+                record.valid_to = max(end, record.valid_from)
+                changed.append(record)
+            continue
+
+        values = history_values(employee)
+        if record is None:
+            # Rehire, or an employee recorded before history existed
+            valid_from = today if employee.pk in with_history else employee.hire_date
+            created.append(EmploymentHistory(employee_id=employee.pk, valid_from=valid_from, **values))
+        elif any(getattr(record, field) != value for field, value in values.items()):
+            if record.valid_from >= today:
+                for field, value in values.items():
+                    setattr(record, field, value)
+            else:
+                record.valid_to = today
+                created.append(EmploymentHistory(employee_id=employee.pk, valid_from=today, **values))
+            changed.append(record)
+
+    # Close the current records before opening new ones (one current record per employee)
+    EmploymentHistory.objects.bulk_update(changed, ['valid_to', *HISTORY_FIELDS])
+    EmploymentHistory.objects.bulk_create(created)
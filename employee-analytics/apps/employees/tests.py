@@ -0,0 +1,189 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.employees.counters import find_drift
+from apps.employees.models import Department, Employee, EmploymentHistory, Position
+from utils.testing import QueryBudgetTestMixin
+
+
+class EmployeeQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Employee, department and position endpoints stay within their query budgets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_data()
+        cls.refresh_snapshots()
+
+    def test_employees(self):
+        employee = Employee.objects.first()
+        self.assertWithinBudget('get', '/api/employees/')
+        self.assertWithinBudget('get', f'/api/employees/{employee.pk}/')
+        self.assertWithinBudget('get', '/api/employees/by_department/')
+        self.assertWithinBudget('get', f'/api/employees/{employee.pk}/history/')
+        self.assertWithinBudget('get', f'/api/employees/{employee.pk}/history/', {'as_of': employee.hire_date.isoformat()})
+
+    def test_departments(self):
+        self.assertWithinBudget('get', '/api/departments/')
+        self.assertWithinBudget('get', f'/api/departments/{Department.objects.first().pk}/')
+        self.assertWithinBudget('get', '/api/departments/summary/')
+
+    def test_department_summary_from_snapshot(self):
+        response = self.assertWithinBudget('get', '/api/departments/summary/', {'max_staleness': 3600})
+        self.assertEqual(len(response.data), Department.objects.count())
+
+    def test_positions(self):
+        self.assertWithinBudget('get', '/api/positions/')
+        self.assertWithinBudget('get', f'/api/positions/{Position.objects.first().pk}/')
+
+
+class EmploymentHistoryTests(TestCase):
+    """Employment history is written on every kind of write and read back as of a date."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('history', 'history@example.com', 'history')
+        cls.engineering = Department.objects.create(name='Engineering')
+        cls.sales = Department.objects.create(name='Sales')
+        cls.developer = Position.objects.create(title='Developer', department=cls.engineering)
+        cls.account_manager = Position.objects.create(title='Account Manager', department=cls.sales)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @staticmethod
+    def employee(code, position, hire_date, **fields):
+        """Unsaved employee of the position's department."""
+        return Employee(
+            employee_id=code, first_name='Test', last_name=code, email=f'{code.lower()}@example.com',
+            department=position.department, position=position, hire_date=hire_date,
+            salary=Decimal('50000.00'), **fields,
+        )
+
+    def as_of(self, employee, day):
+        response = self.client.get(f'/api/employees/{employee.pk}/history/', {'as_of': day.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_save_records_transfers(self):
+        employee = self.employee('H001', self.developer, date(2024, 1, 15))
+        employee.save()
+        employee.department, employee.position = self.sales, self.account_manager
+        employee.save()
+
+        self.assertEqual(self.as_of(employee, date(2024, 1, 14)), [])
+        self.assertEqual(self.as_of(employee, date(2024, 2, 1))[0]['department'], self.engineering.pk)
+        self.assertEqual(self.as_of(employee, timezone.localdate())[0]['department'], self.sales.pk)
+
+    def test_bulk_create_opens_history(self):
+        active, terminated = Employee.objects.bulk_create([
+            self.employee('H002', self.developer, date(2024, 1, 15)),
+            self.employee('H003', self.developer, date(2024, 3, 1), is_active=False, termination_date=date(2024, 6, 30)),
+        ])
+        self.assertEqual(
+            list(EmploymentHistory.objects.filter(employee__in=[active, terminated])
+                 .order_by('employee_id').values_list('department_id', 'valid_from', 'valid_to')),
+            [
+                (self.engineering.pk, date(2024, 1, 15), None),
+                (self.engineering.pk, date(2024, 3, 1), date(2024, 6, 30)),
+            ],
+        )
+
+    def test_update_records_transfers_and_terminations(self):
+        moved, left = Employee.objects.bulk_create([
+            self.employee('H004', self.developer, date(2024, 1, 15)),
+            self.employee('H005', self.developer, date(2024, 1, 15)),
+        ])
+        Employee.objects.filter(pk=moved.pk).update(department=self.sales, position=self.account_manager)
+        Employee.objects.filter(pk=left.pk).update(is_active=False, termination_date=date(2024, 6, 30))
+
+        today = timezone.localdate()
+        self.assertEqual(self.as_of(moved, date(2024, 2, 1))[0]['department'], self.engineering.pk)
+        self.assertEqual(self.as_of(moved, today)[0]['department'], self.sales.pk)
+        self.assertEqual(EmploymentHistory.objects.filter(employee=moved, valid_to__isnull=True).count(), 1)
+        self.assertEqual(self.as_of(left, date(2024, 6, 29))[0]['department'], self.engineering.pk)
+        self.assertEqual(self.as_of(left, date(2024, 6, 30)), [])
+
+    def test_headcount(self):
+        Employee.objects.bulk_create([
+            self.employee('H006', self.developer, date(2024, 1, 15)),
+            self.employee('H007', self.developer, date(2024, 3, 10), is_active=False, termination_date=date(2024, 5, 20)),
+            self.employee('H008', self.account_manager, date(2024, 2, 1)),
+        ])
+        response = self.client.get('/api/employees/headcount/', {'start_date': '2024-01-01', 'end_date': '2024-06-30'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data['dates'],
+            ['2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30', '2024-05-31', '2024-06-30'],
+        )
+        self.assertEqual(response.data['total'], [1, 2, 3, 3, 2, 2])
+        self.assertEqual(
+            {row['department_name']: row['headcount'] for row in response.data['departments']},
+            {'Engineering': [1, 1, 2, 2, 1, 1], 'Sales': [0, 1, 1, 1, 1, 1]},
+        )
+
+
+class EmployeeCounterTests(TestCase):
+    """Department and position counters stay exact through saves, bulk writes and deletes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.engineering = Department.objects.create(name='Engineering')
+        cls.sales = Department.objects.create(name='Sales')
+        cls.developer = Position.objects.create(title='Developer', department=cls.engineering)
+        cls.account_manager = Position.objects.create(title='Account Manager', department=cls.sales)
+        Employee.objects.bulk_create([
+            Employee(
+                employee_id=f'C{number:03d}', first_name='Test', last_name=str(number),
+                email=f'c{number}@example.com', department=position.department, position=position,
+                hire_date=date(2024, 1, 1), salary=Decimal(salary),
+            )
+            for number, (position, salary) in enumerate([
+                (cls.developer, '40000.00'), (cls.developer, '55000.50'),
+                (cls.account_manager, '38000.00'), (cls.account_manager, '61000.30'),
+            ])
+        ])
+
+    def assertNoDrift(self):
+        for key in ('department', 'position'):
+            self.assertEqual(find_drift(key), [], key)
+
+    def test_bulk_create(self):
+        self.assertNoDrift()
+        self.engineering.refresh_from_db()
+        self.assertEqual(self.engineering.active_employee_count, 2)
+        self.assertEqual(self.engineering.salary_sum, Decimal('95000.50'))
+        self.assertEqual(self.engineering.salary_min, Decimal('40000.00'))
+        self.assertEqual(self.engineering.salary_max, Decimal('55000.50'))
+
+    def test_update(self):
+        Employee.objects.filter(salary__gt=50000).update(salary=F('salary') + 1000)
+        self.assertNoDrift()
+        Employee.objects.filter(position=self.developer).update(department=self.sales, position=self.account_manager)
+        self.assertNoDrift()
+        Employee.objects.filter(salary__lt=40000).update(is_active=False)
+        self.assertNoDrift()
+
+    def test_save_and_delete(self):
+        employee = Employee.objects.get(salary=Decimal('40000.00'))
+        employee.department, employee.position = self.sales, self.account_manager
+        employee.save()
+        self.assertNoDrift()
+        Employee.objects.get(salary=Decimal('61000.30')).delete()
+        self.assertNoDrift()
+
+    def test_department_summary(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser('counters', 'counters@example.com', 'counters'))
+        response = client.get('/api/departments/summary/')
+        self.assertEqual(
+            {row['department_name']: (row['employee_count'], row['avg_salary']) for row in response.data},
+            {'Engineering': (2, '47500.25'), 'Sales': (2, '49500.15')},
+        )
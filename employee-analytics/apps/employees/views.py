@@ -2,14 +2,21 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Avg, Count, Min, Max
+from django.db.models import F, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-
-from .models import Employee, Department, Position
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from datetime import date
+
+from apps.analytics import snapshots
+from utils.query_budget import query_budget
+from .headcount import headcount_series
+from .models import Employee, Department, Position, EmploymentHistory
 from .serializers import (
     UserSerializer, EmployeeSerializer, EmployeeDetailSerializer,
-    DepartmentSerializer, PositionSerializer, DepartmentSummarySerializer
+    DepartmentSerializer, PositionSerializer, DepartmentSummarySerializer,
+    EmploymentHistorySerializer
 )
 
 
@@ -28,6 +35,21 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     search_fields = ['first_name', 'last_name', 'employee_id', 'email']
     ordering_fields = ['last_name', 'first_name', 'hire_date', 'salary']
     ordering = ['last_name', 'first_name']
+    query_budgets = {'list': 2, 'retrieve': 1}
+
+    def get_queryset(self):
+        """
+        Get the list of employees for this view.
+
+        Returns:
+            QuerySet: Employees with the relations read by their serializer
+        """
+        queryset = Employee.objects.select_related('department', 'position', 'manager')
+        if self.action == 'retrieve':
+            queryset = queryset.select_related(
+                'user', 'position__department', 'manager__department', 'manager__position', 'manager__manager'
+            )
+        return queryset
 
     def get_serializer_class(self):
         """
@@ -41,25 +63,105 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return EmployeeDetailSerializer
         return EmployeeSerializer
 
+    @query_budget(2)
     @action(detail=False, methods=['get'])
     def by_department(self, request):
         """
         Get employees grouped by department.
 
+        Active employees of all departments are loaded in one query and
+        grouped in memory.
+
         Returns:
             Response: JSON response with employees grouped by department
         """
-        departments = Department.objects.all()
-        result = {}
-
-        for dept in departments:
-            employees = Employee.objects.filter(department=dept, is_active=True)
-            serializer = EmployeeSerializer(employees, many=True)
-            result[dept.name] = serializer.data
+        result = {name: [] for name in Department.objects.values_list('name', flat=True)}
+        employees = list(
+            Employee.objects.filter(is_active=True, department__isnull=False)
+            .select_related('department', 'position', 'manager')
+        )
+        for employee, data in zip(employees, EmployeeSerializer(employees, many=True).data):
+            result[employee.department.name].append(data)
 
         return Response(result)
 
 
+    @query_budget(2)
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """
+        Get the employment history of an employee.
+
+        Args:
+            request: HTTP request with an optional as_of (YYYY-MM-DD) parameter
+                returning only the record effective on that date
+            pk: Employee primary key
+
+        Returns:
+            Response: JSON response with the employee's history records
+        """
+        employee = self.get_object()
+        records = EmploymentHistory.objects.filter(employee=employee).select_related(
+            'department', 'position', 'manager'
+        )
+        as_of = request.query_params.get('as_of')
+        if as_of:
+            as_of = parse_date(as_of)
+            if as_of is None:
+                return Response(
+                    {'status': 'error', 'message': "as_of must be a date (YYYY-MM-DD)"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            records = records.filter(valid_from__lte=as_of).filter(
+                Q(valid_to__isnull=True) | Q(valid_to__gt=as_of)
+            ).order_by('-valid_from')[:1]
+
+        serializer = EmploymentHistorySerializer(records, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def headcount(self, request):
+        """
+        Get headcount per department at the end of each period.
+
+        Computed from the employment history in a single query.
+
+        Args:
+            request: HTTP request with optional start_date and end_date
+                (default: the last 12 months), interval (week, month, quarter,
+                year; default month) and department parameters
+
+        Returns:
+            Response: JSON response with sample dates, total and per-department headcounts
+        """
+        end_date = request.query_params.get('end_date')
+        end_date = parse_date(end_date) if end_date else timezone.localdate()
+        start_date = request.query_params.get('start_date')
+        if start_date:
+            start_date = parse_date(start_date)
+        elif end_date:
+            # First day of the month eleven months before end_date
+            month = end_date.year * 12 + end_date.month - 12
+            start_date = date(month // 12, month % 12 + 1, 1)
+        if start_date is None or end_date is None or start_date > end_date:
+            return Response(
+                {'status': 'error', 'message': "start_date and end_date must be dates (YYYY-MM-DD), start_date first"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        department = request.query_params.get('department')
+        try:
+            data = headcount_series(
+                start_date,
+                end_date,
+                request.query_params.get('interval', 'month'),
+                int(department) if department else None,
+            )
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+
 class DepartmentViewSet(viewsets.ModelViewSet):
     """
     API endpoint for viewing and editing departments.
@@ -72,30 +174,47 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['name']
     search_fields = ['name', 'description']
+    query_budgets = {'list': 2, 'retrieve': 1}
 
+    @query_budget(2)  # The department query, plus the snapshot freshness check with max_staleness
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """
         Get department statistics summary.
 
-        Calculates and returns statistics for each department including:
+        Returns statistics for each department, read from the denormalized
+        department counters, including:
         - Employee count
         - Average salary
         - Minimum salary
         - Maximum salary
 
         Args:
-            request: HTTP request
+            request: HTTP request with an optional max_staleness parameter
+                (seconds of snapshot staleness accepted)
 
         Returns:
             Response: JSON response with department statistics
         """
-        departments = Department.objects.annotate(
-            employee_count=Count('employees', filter=models.Q(employees__is_active=True)),
-            avg_salary=Avg('employees__salary', filter=models.Q(employees__is_active=True)),
-            min_salary=Min('employees__salary', filter=models.Q(employees__is_active=True)),
-            max_salary=Max('employees__salary', filter=models.Q(employees__is_active=True))
-        )
+        # Serve from the department snapshot when the caller accepts its staleness
+        if snapshots.snapshots_fresh(['department_stats'], snapshots.parse_max_staleness(request)):
+            rows = sorted(snapshots.department_stats(), key=lambda row: row['department_name'])
+            serializer = DepartmentSummarySerializer(rows, many=True)
+            return Response(serializer.data)
+
+        # Denormalized counters, no join with the employee table. The average
+        # is computed in Python: SQLite divides whole-number decimals as integers
+        departments = list(Department.objects.values(
+            department_id=F('id'),
+            department_name=F('name'),
+            employee_count=F('active_employee_count'),
+            salary_total=F('salary_sum'),
+            min_salary=F('salary_min'),
+            max_salary=F('salary_max')
+        ).order_by('name'))
+        for department in departments:
+            salary_total, count = department.pop('salary_total'), department['employee_count']
+            department['avg_salary'] = round(salary_total / count, 2) if count else None
 
         serializer = DepartmentSummarySerializer(departments, many=True)
         return Response(serializer.data)
@@ -107,9 +226,10 @@ class PositionViewSet(viewsets.ModelViewSet):
 
     Provides CRUD operations for Position model.
     """
-    queryset = Position.objects.all()
+    queryset = Position.objects.select_related('department')
     serializer_class = PositionSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['department']
     search_fields = ['title', 'description']
+    query_budgets = {'list': 2, 'retrieve': 1}
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class PerformanceConfig(AppConfig):
+    """
+    App configuration for the performance app.
+    """
+    name = 'apps.performance'
+    verbose_name = 'Performance'
+
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('employees', '0002_alter_department_description_alter_department_name_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Performance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_date', models.DateField(verbose_name='Review Date')),
+                ('performance_score', models.DecimalField(decimal_places=1, max_digits=3, verbose_name='Performance Score')),
+                ('goals_achievement', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Goals Achievement(%)')),
+                ('comments', models.TextField(blank=True, null=True, verbose_name='Comments')),
+                ('status', models.CharField(choices=[('excellent', 'Excellent'), ('good', 'Good'), ('average', 'Average'), ('needs_improvement', 'Needs Improvement')], max_length=20, verbose_name='Status')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='performances', to='employees.employee', verbose_name='Employee')),
+                ('reviewer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviews_given', to='employees.employee', verbose_name='Reviewer')),
+            ],
+            options={
+                'verbose_name': 'Performance Record',
+                'verbose_name_plural': 'Performance Records',
+                'ordering': ['-review_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=100)),
+                ('rating', models.DecimalField(decimal_places=1, max_digits=3)),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('performance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='performance.performance')),
+            ],
+            options={
+                'verbose_name': 'Review',
+                'verbose_name_plural': 'Reviews',
+                'ordering': ['category'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Goal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('start_date', models.DateField()),
+                ('target_date', models.DateField()),
+                ('completion_date', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('not_started', 'Not Started'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('on_hold', 'On Hold'), ('cancelled', 'Cancelled')], default='not_started', max_length=20)),
+                ('progress', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='goals', to='employees.employee')),
+            ],
+            options={
+                'verbose_name': 'Goal',
+                'verbose_name_plural': 'Goals',
+                'ordering': ['-target_date'],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status__in', ['not_started', 'in_progress', 'on_hold'])), fields=['status', 'target_date'], name='goal_open_status_target_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['employee', 'status'], name='goal_employee_status_idx'),
+        ),
+    ]
@@ -35,6 +35,8 @@ class Goal(models.Model):
     """
     Goal model for tracking employee goals.
     """
+    OPEN_STATUSES = ['not_started', 'in_progress', 'on_hold']
+
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
         ('in_progress', 'In Progress'),
@@ -59,6 +61,15 @@ class Goal(models.Model):
         verbose_name = "Goal"
         verbose_name_plural = "Goals"
         ordering = ['-target_date']
+        indexes = [
+            # Goal health queries (overdue, at risk) only look at open goals by due date
+            models.Index(
+                fields=['status', 'target_date'],
+                name='goal_open_status_target_idx',
+                condition=models.Q(status__in=['not_started', 'in_progress', 'on_hold']),
+            ),
+            models.Index(fields=['employee', 'status'], name='goal_employee_status_idx'),
+        ]
 
 
 class Review(models.Model):
@@ -1,4 +1,8 @@
 
+from datetime import timedelta
+
+from django.db.models import Q
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Performance, Goal, Review
 
@@ -13,6 +17,34 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class ReviewItemSerializer(ReviewSerializer):
+    """
+    Serializer for one category rating of a batch review submission.
+
+    The performance record comes from the URL, so it is read-only here.
+    """
+    class Meta(ReviewSerializer.Meta):
+        read_only_fields = ['id', 'performance']
+
+
+class ReviewBatchSerializer(serializers.Serializer):
+    """
+    Serializer for a batch of category ratings for one performance record.
+    """
+    reviews = ReviewItemSerializer(many=True, allow_empty=False)
+    replace = serializers.BooleanField(default=False)
+
+    def validate_reviews(self, value):
+        """Reject batches rating the same category more than once."""
+        categories = [item['category'] for item in value]
+        duplicates = sorted({category for category in categories if categories.count(category) > 1})
+        if duplicates:
+            raise serializers.ValidationError(
+                f"Each category can only be rated once per batch: {', '.join(duplicates)}"
+            )
+        return value
+
+
 class GoalSerializer(serializers.ModelSerializer):
     """
     Serializer for Goal model.
@@ -50,11 +82,34 @@ class PerformanceSerializer(serializers.ModelSerializer):
 class PerformanceDetailSerializer(PerformanceSerializer):
     """
     Detailed serializer for Performance model with goal information.
+
+    Only the goals relevant to the review are embedded: goals running during
+    the review period plus goals that are still open, capped at GOALS_LIMIT.
+    The employee's full goal list is linked through goals_url.
     """
-    goals = GoalSerializer(source='employee.goals', many=True, read_only=True)
+    GOALS_LIMIT = 20
+    GOALS_WINDOW_DAYS = 365
+    goals = serializers.SerializerMethodField()
+    goals_url = serializers.SerializerMethodField()
 
     class Meta(PerformanceSerializer.Meta):
-        fields = PerformanceSerializer.Meta.fields + ['goals']
+        fields = PerformanceSerializer.Meta.fields + ['goals', 'goals_url']
+
+    def get_goals(self, obj):
+        """Get the goals relevant to this review period in a single query."""
+        window_start = obj.review_date - timedelta(days=self.GOALS_WINDOW_DAYS)
+        goals = Goal.objects.filter(
+            Q(target_date__gte=window_start) | Q(status__in=Goal.OPEN_STATUSES),
+            employee_id=obj.employee_id,
+            start_date__lte=obj.review_date,
+        ).select_related('employee')[:self.GOALS_LIMIT]
+        return GoalSerializer(goals, many=True, context=self.context).data
+
+    def get_goals_url(self, obj):
+        """Get the URL listing all goals of the reviewed employee."""
+        url = f"{reverse('goal-list')}?employee={obj.employee_id}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class PerformanceSummarySerializer(serializers.Serializer):
@@ -68,3 +123,12 @@ class PerformanceSummarySerializer(serializers.Serializer):
     good_count = serializers.IntegerField()
     average_count = serializers.IntegerField()
     needs_improvement_count = serializers.IntegerField()
+
+
+class PerformanceSummaryGroupSerializer(PerformanceSummarySerializer):
+    """
+    Serializer for performance summary statistics of one group and/or period.
+    """
+    group_id = serializers.IntegerField(required=False)
+    group_name = serializers.CharField(required=False)
+    period = serializers.DateField(required=False)
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.employees.models import Employee
+from utils.cache import bump_versions
+from .models import Performance, Goal, Review
+
+
+# Cache namespace for payloads aggregated over all reviews
+REVIEWS_NAMESPACE = 'reviews'
+
+
+def performance_namespace(performance_id):
+    """Cache namespace for payloads built from one performance record and its reviews."""
+    return f"performance:{performance_id}"
+
+
+def employee_namespace(employee_id):
+    """Cache namespace for payloads embedding an employee's own fields (e.g. names)."""
+    return f"employee:{employee_id}"
+
+
+def employee_goals_namespace(employee_id):
+    """Cache namespace for payloads built from an employee's goals."""
+    return f"employee_goals:{employee_id}"
+
+
+def invalidate_reviews(performance_id):
+    """
+    Invalidate cached payloads built from a performance record's reviews.
+
+    Called explicitly by bulk write paths, which do not send model signals.
+    """
+    bump_versions(performance_namespace(performance_id), REVIEWS_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Performance)
+def invalidate_performance(sender, instance, **kwargs):
+    """Invalidate cached payloads when a performance record changes."""
+    bump_versions(performance_namespace(instance.pk), REVIEWS_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    """Invalidate the parent performance record when one of its reviews changes."""
+    invalidate_reviews(instance.performance_id)
+
+
+@receiver([post_save, post_delete], sender=Goal)
+def invalidate_goal(sender, instance, **kwargs):
+    """Invalidate payloads embedding the employee's goals when a goal changes."""
+    bump_versions(employee_goals_namespace(instance.employee_id))
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_employee(sender, instance, **kwargs):
+    """Invalidate payloads embedding the employee, e.g. the names in performance details."""
+    bump_versions(employee_namespace(instance.pk))
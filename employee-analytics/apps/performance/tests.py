@@ -0,0 +1,271 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.employees.models import Department, Employee
+from apps.performance.models import Goal, Performance, Review
+from apps.performance.views import SUMMARY_GROUPS, SUMMARY_INTERVALS
+from utils.testing import QueryBudgetTestMixin
+
+
+def create_employee(code, department):
+    """Create an active employee of a department."""
+    return Employee.objects.create(
+        employee_id=code, first_name='Test', last_name=code, email=f'{code.lower()}@example.com',
+        department=department, hire_date=date(2023, 1, 1), salary=Decimal('50000.00'),
+    )
+
+
+class PerformanceQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Performance, goal and review endpoints stay within their query budgets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_data()
+        cls.refresh_snapshots()
+
+    def test_performances(self):
+        self.assertWithinBudget('get', '/api/performances/')
+        self.assertWithinBudget('get', f'/api/performances/{Performance.objects.first().pk}/')
+
+    def test_goals(self):
+        self.assertWithinBudget('get', '/api/goals/')
+        self.assertWithinBudget('get', f'/api/goals/{Goal.objects.first().pk}/')
+        self.assertWithinBudget('get', '/api/goals/overdue/')
+        self.assertWithinBudget('get', '/api/goals/at_risk/')
+
+    def test_reviews(self):
+        self.assertWithinBudget('get', '/api/reviews/')
+        self.assertWithinBudget('get', f'/api/reviews/{Review.objects.first().pk}/')
+        self.assertWithinBudget('get', '/api/summary/reviews/')
+
+    def test_summary(self):
+        self.assertWithinBudget('get', '/api/summary/performance/')
+        self.assertWithinBudget('get', '/api/summary/performance/', {'start_date': '2020-01-01', 'end_date': '2099-12-31'})
+
+    def test_summary_groups_and_intervals(self):
+        for group_by in SUMMARY_GROUPS:
+            self.assertWithinBudget('get', '/api/summary/performance/', {'group_by': group_by})
+            for interval in SUMMARY_INTERVALS:
+                self.assertWithinBudget('get', '/api/summary/performance/', {'group_by': group_by, 'interval': interval})
+        for interval in SUMMARY_INTERVALS:
+            self.assertWithinBudget('get', '/api/summary/performance/', {'interval': interval})
+
+    def test_summary_from_snapshot(self):
+        self.assertWithinBudget('get', '/api/summary/performance/', {'max_staleness': 3600})
+        # Breakdowns are not in the snapshot and fall back to the live aggregate
+        self.assertWithinBudget('get', '/api/summary/performance/', {'max_staleness': 3600, 'group_by': 'department'})
+        self.assertWithinBudget('get', '/api/summary/performance/', {'max_staleness': 3600, 'interval': 'quarter'})
+
+
+class PerformanceTrendTests(TestCase):
+    """Trend series compute rolling means, deltas and department percentile ranks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('trend', 'trend@example.com', 'trend')
+        engineering = Department.objects.create(name='Engineering')
+        cls.department = engineering.pk
+        cls.first = create_employee('T001', engineering)
+        second = create_employee('T002', engineering)
+        outsider = create_employee('T003', Department.objects.create(name='Sales'))
+        reviews = [
+            (cls.first, date(2024, 1, 10), '3.0', '60.00'),
+            (cls.first, date(2024, 4, 10), '4.0', '70.00'),
+            (cls.first, date(2024, 7, 10), '5.0', '90.00'),
+            (second, date(2024, 1, 20), '4.0', '80.00'),
+            (second, date(2024, 4, 20), '4.0', '50.00'),
+            (second, date(2024, 7, 20), '2.0', '40.00'),
+            # Other departments do not take part in the ranks
+            (outsider, date(2024, 1, 15), '1.0', '10.00'),
+        ]
+        Performance.objects.bulk_create([
+            Performance(
+                employee=employee, review_date=review_date, performance_score=Decimal(score),
+                goals_achievement=Decimal(goals), status='good',
+            )
+            for employee, review_date, score, goals in reviews
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def trend(self, **params):
+        response = self.client.get('/api/performances/trend/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['series']
+
+    def test_department(self):
+        first, second = self.trend(department=self.department, window=2)
+        self.assertEqual(first['employee_id'], 'T001')
+        self.assertEqual(first['dates'], ['2024-01-10', '2024-04-10', '2024-07-10'])
+        self.assertEqual(first['performance_score_rolling'], [3.0, 3.5, 4.5])
+        self.assertEqual(first['performance_score_delta'], [None, 1.0, 1.0])
+        self.assertEqual(first['goals_achievement_rolling'], [60.0, 65.0, 80.0])
+        self.assertEqual(first['goals_achievement_delta'], [None, 10.0, 20.0])
+        self.assertEqual(first['percentile_rank'], [25.0, 50.0, 75.0])
+        self.assertEqual(second['performance_score_rolling'], [4.0, 4.0, 3.0])
+        self.assertEqual(second['performance_score_delta'], [None, 0.0, -2.0])
+        self.assertEqual(second['percentile_rank'], [75.0, 50.0, 25.0])
+
+    def test_employee_ranked_against_department(self):
+        series, = self.trend(employee_id='T001')
+        self.assertEqual(series['employee'], self.first.pk)
+        self.assertEqual(series['performance_score_rolling'], [3.0, 3.5, 4.0])
+        self.assertEqual(series['percentile_rank'], [25.0, 50.0, 75.0])
+
+    def test_date_range(self):
+        first, second = self.trend(department=self.department, start_date='2024-04-01')
+        self.assertEqual(first['dates'], ['2024-04-10', '2024-07-10'])
+        self.assertEqual(first['performance_score_delta'], [None, 1.0])
+        self.assertEqual(second['percentile_rank'], [50.0, 25.0])
+
+    def test_invalid_parameters(self):
+        for params in ({}, {'department': 'abc'}, {'department': self.department, 'window': 13}):
+            response = self.client.get('/api/performances/trend/', params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class GoalHealthTests(TestCase):
+    """Overdue, at-risk and burndown results on hand-built goals."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('goals', 'goals@example.com', 'goals')
+        cls.engineering = Department.objects.create(name='Engineering')
+        cls.sales = Department.objects.create(name='Sales')
+        developer = create_employee('G001', cls.engineering)
+        seller = create_employee('G002', cls.sales)
+
+        def goal(employee, title, start_date, target_date, status, completion_date=None, progress=0):
+            return Goal(
+                employee=employee, title=title, start_date=start_date, target_date=target_date,
+                status=status, completion_date=completion_date, progress=progress,
+            )
+
+        today = timezone.localdate()
+        Goal.objects.bulk_create([
+            goal(developer, 'completed in February', date(2024, 1, 5), date(2024, 2, 15), 'completed', date(2024, 2, 10)),
+            goal(developer, 'still open', date(2024, 1, 20), date(2024, 3, 31), 'in_progress'),
+            goal(developer, 'completed after the range', date(2024, 2, 1), date(2024, 3, 31), 'completed', date(2024, 4, 5)),
+            goal(developer, 'cancelled', date(2024, 1, 10), date(2024, 2, 10), 'cancelled'),
+            # No completion date: completed on its target date
+            goal(developer, 'opened before the range', date(2023, 12, 1), date(2024, 3, 15), 'completed'),
+            goal(developer, 'opened after the range', date(2024, 4, 10), date(2024, 6, 30), 'not_started'),
+            goal(seller, 'sales goal', date(2024, 3, 1), date(2024, 5, 31), 'in_progress'),
+            goal(seller, 'due soon', today - timedelta(days=30), today + timedelta(days=10), 'in_progress', progress=20),
+            goal(seller, 'due soon, nearly done', today - timedelta(days=30), today + timedelta(days=10), 'in_progress', progress=90),
+            goal(seller, 'due later', today - timedelta(days=30), today + timedelta(days=60), 'on_hold'),
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def titles(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [goal['title'] for goal in response.data['results']]
+
+    def test_overdue(self):
+        self.assertEqual(
+            self.titles('/api/goals/overdue/'),
+            ['still open', 'sales goal', 'opened after the range'],
+        )
+        self.assertEqual(self.titles('/api/goals/overdue/', department=self.sales.pk), ['sales goal'])
+
+    def test_at_risk(self):
+        self.assertEqual(self.titles('/api/goals/at_risk/'), ['due soon'])
+        self.assertEqual(self.titles('/api/goals/at_risk/', days=90), ['due soon', 'due later'])
+        self.assertEqual(self.titles('/api/goals/at_risk/', max_progress=100), ['due soon', 'due soon, nearly done'])
+
+    def test_burndown(self):
+        response = self.client.get('/api/goals/burndown/', {'start_date': '2024-01-01', 'end_date': '2024-03-31'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['periods'], ['2024-01-01', '2024-02-01', '2024-03-01'])
+        self.assertEqual(
+            {row['department_name']: (row['open'], row['completed']) for row in response.data['departments']},
+            {'Engineering': ([3, 3, 2], [0, 1, 2]), 'Sales': ([0, 0, 1], [0, 0, 0])},
+        )
+
+        response = self.client.get('/api/goals/burndown/', {
+            'start_date': '2024-01-01', 'end_date': '2024-06-30', 'interval': 'quarter', 'department': self.engineering.pk,
+        })
+        department, = response.data['departments']
+        self.assertEqual(response.data['periods'], ['2024-01-01', '2024-04-01'])
+        self.assertEqual((department['open'], department['completed']), ([2, 2], [2, 3]))
+
+    def test_invalid_parameters(self):
+        for path, params in (
+            ('/api/goals/overdue/', {'department': 'abc'}),
+            ('/api/goals/at_risk/', {'days': 10 ** 9}),
+            ('/api/goals/at_risk/', {'max_progress': 'abc'}),
+            ('/api/goals/burndown/', {'interval': 'day'}),
+            ('/api/goals/burndown/', {'end_date': '2024-13-01'}),
+            ('/api/goals/burndown/', {'department': 'abc'}),
+        ):
+            response = self.client.get(path, params)
+            self.assertEqual(response.status_code, 400, (path, params))
+
+
+class AddReviewsTests(TestCase):
+    """Batch review submission validates the whole batch before writing it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('reviews', 'reviews@example.com', 'reviews')
+        cls.performance = Performance.objects.create(
+            employee=create_employee('R001', Department.objects.create(name='Engineering')),
+            review_date=date(2024, 1, 10), performance_score=Decimal('4.0'),
+            goals_achievement=Decimal('80.00'), status='good',
+        )
+        Review.objects.create(performance=cls.performance, category='Teamwork', rating=Decimal('3.0'))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.path = f'/api/performances/{self.performance.pk}/add_reviews/'
+
+    def ratings(self):
+        return dict(self.performance.reviews.order_by('category', 'id').values_list('category', 'rating'))
+
+    def test_add(self):
+        response = self.client.post(self.path, [
+            {'category': 'Communication', 'rating': '4.5'},
+            {'category': 'Delivery', 'rating': '5.0', 'comments': 'On time'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual([review['performance'] for review in response.data], [self.performance.pk] * 2)
+        self.assertEqual(self.ratings(), {
+            'Communication': Decimal('4.5'), 'Delivery': Decimal('5.0'), 'Teamwork': Decimal('3.0'),
+        })
+
+    def test_replace(self):
+        response = self.client.post(self.path, {
+            'reviews': [{'category': 'Teamwork', 'rating': '4.0'}], 'replace': True,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(self.performance.reviews.count(), 1)
+        self.assertEqual(self.ratings(), {'Teamwork': Decimal('4.0')})
+
+    def test_duplicate_categories(self):
+        response = self.client.post(self.path, [
+            {'category': 'Delivery', 'rating': '4.0'},
+            {'category': 'Communication', 'rating': '4.0'},
+            {'category': 'Delivery', 'rating': '2.0'},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Delivery', str(response.data['reviews']))
+        self.assertNotIn('Communication', str(response.data['reviews']))
+        self.assertEqual(self.ratings(), {'Teamwork': Decimal('3.0')})
+
+    def test_invalid_batch(self):
+        for data in ([], {'reviews': []}, [{'category': 'Delivery', 'rating': '4.0'}, {'category': 'Communication'}]):
+            response = self.client.post(self.path, data, format='json')
+            self.assertEqual(response.status_code, 400, data)
+        self.assertEqual(self.ratings(), {'Teamwork': Decimal('3.0')})
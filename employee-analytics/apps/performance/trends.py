@@ -0,0 +1,67 @@
+import numpy as np
+
+from utils.stats import (
+    group_starts, grouped_rolling_mean, grouped_diff, grouped_percentile_rank, to_list
+)
+
+
+def build_trend_series(rows, window=3, employee_code=None):
+    """
+    Build per-employee performance time series from review history.
+
+    Percentile ranks compare each review with the reviews of the same
+    department in the same calendar quarter, so the department history
+    must be passed in even when only one employee is returned.
+
+    Args:
+        rows: Review rows ordered by employee and review date, as tuples of
+            (employee pk, employee code, first name, last name, department id,
+            review date, performance score, goals achievement)
+        window: Number of reviews in the rolling mean window
+        employee_code: Only return the series of this employee when provided
+
+    Returns:
+        list: One dict of column arrays per employee
+    """
+    if not rows:
+        return []
+
+    (employee_pks, employee_codes, first_names, last_names,
+     department_ids, review_dates, scores, goals) = zip(*rows)
+
+    employees = np.array(employee_pks)
+    departments = np.array([-1 if dept is None else dept for dept in department_ids])
+    dates = np.array(review_dates, dtype='datetime64[D]')
+    scores = np.array(scores, dtype=float)
+    goals = np.array(goals, dtype=float)
+
+    # Rank within (department, quarter) buckets
+    quarters = dates.astype('datetime64[M]').astype(int) // 3
+    buckets = departments * 100000 + quarters
+    percentile_rank = grouped_percentile_rank(scores, buckets)
+
+    score_rolling = grouped_rolling_mean(scores, employees, window)
+    score_delta = grouped_diff(scores, employees)
+    goals_rolling = grouped_rolling_mean(goals, employees, window)
+    goals_delta = grouped_diff(goals, employees)
+
+    series = []
+    starts = np.unique(group_starts(employees))
+    ends = np.append(starts[1:], len(employees))
+    for start, end in zip(starts, ends):
+        if employee_code and employee_codes[start] != employee_code:
+            continue
+        series.append({
+            'employee': int(employees[start]),
+            'employee_id': employee_codes[start],
+            'employee_name': f"{first_names[start]} {last_names[start]}",
+            'dates': [str(date) for date in dates[start:end]],
+            'performance_score': to_list(scores[start:end], 1),
+            'performance_score_rolling': to_list(score_rolling[start:end]),
+            'performance_score_delta': to_list(score_delta[start:end], 1),
+            'goals_achievement': to_list(goals[start:end]),
+            'goals_achievement_rolling': to_list(goals_rolling[start:end]),
+            'goals_achievement_delta': to_list(goals_delta[start:end]),
+            'percentile_rank': to_list(percentile_rank[start:end], 1),
+        })
+    return series
@@ -1,7 +1,7 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PerformanceViewSet, GoalViewSet, ReviewViewSet, performance_summary
+from .views import PerformanceViewSet, GoalViewSet, ReviewViewSet, performance_summary, review_matrix
 
 router = DefaultRouter()
 router.register(r'performances', PerformanceViewSet)
@@ -11,4 +11,5 @@ router.register(r'reviews', ReviewViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('summary/performance/', performance_summary, name='performance_summary'),
+    path('summary/reviews/', review_matrix, name='review_matrix'),
 ]
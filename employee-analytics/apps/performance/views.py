@@ -1,15 +1,34 @@
+from datetime import timedelta
+
+import numpy as np
 
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Avg, Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Avg, Case, Count, DateField, F, Q, StdDev, Subquery, Value, When, prefetch_related_objects
+)
+from django.db.models.functions import Coalesce, Concat, TruncMonth, TruncQuarter, TruncWeek, TruncYear
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
+from apps.analytics import snapshots
+from apps.employees.models import Employee
+from utils.cache import make_key, get_or_set
+from utils.periods import parse_date_param, period_starts
+from utils.query_budget import query_budget
 from .models import Performance, Goal, Review
+from .trends import build_trend_series
+from .signals import (
+    performance_namespace, employee_namespace, employee_goals_namespace, invalidate_reviews, REVIEWS_NAMESPACE
+)
 from .serializers import (
     PerformanceSerializer, PerformanceDetailSerializer, 
-    GoalSerializer, ReviewSerializer, PerformanceSummarySerializer
+    GoalSerializer, ReviewSerializer, PerformanceSummarySerializer,
+    PerformanceSummaryGroupSerializer, ReviewBatchSerializer
 )
 
 
@@ -31,6 +50,7 @@ class PerformanceViewSet(viewsets.ModelViewSet):
     ]
     ordering_fields = ['review_date', 'performance_score', 'goals_achievement']
     ordering = ['-review_date']
+    query_budgets = {'list': 3, 'retrieve': 3}
 
     def get_serializer_class(self):
         """
@@ -69,7 +89,45 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(review_date__lte=end_date)
 
         # Optimize query by selecting related employee and reviewer data
-        return queryset.select_related('employee', 'reviewer')
+        queryset = queryset.select_related('employee', 'reviewer')
+        if self.action != 'retrieve':
+            # Nested reviews in one query; retrieve prefetches them only on cache misses
+            queryset = queryset.prefetch_related('reviews')
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get a single performance record with its reviews and relevant goals.
+
+        The assembled payload is cached until the record, its reviews, the
+        employee's goals or the employee or reviewer (embedded names) change.
+
+        Returns:
+            Response: JSON response with the detailed performance record
+        """
+        instance = self.get_object()
+        serializer_class = self.get_serializer_class()
+        cache_key = make_key(
+            'performance_detail',
+            namespaces=(
+                performance_namespace(instance.pk),
+                employee_goals_namespace(instance.employee_id),
+                *[employee_namespace(pk) for pk in (instance.employee_id, instance.reviewer_id) if pk is not None],
+            ),
+            pk=instance.pk,
+            # goals_url is absolute and the embedded goals are bounded
+            scheme=request.scheme,
+            host=request.get_host(),
+            goals_limit=serializer_class.GOALS_LIMIT,
+            goals_window_days=serializer_class.GOALS_WINDOW_DAYS,
+        )
+
+        def build():
+            # Fetch all reviews in one query instead of lazily per access
+            prefetch_related_objects([instance], 'reviews')
+            return self.get_serializer(instance).data
+
+        return Response(get_or_set(cache_key, build))
 
     @action(detail=True, methods=['post'])
     def add_review(self, request, pk=None):
@@ -91,6 +149,121 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=['post'])
+    def add_reviews(self, request, pk=None):
+        """
+        Add several category reviews to a performance record at once.
+
+        All ratings are validated together and inserted in one transaction
+        with a single bulk insert. With replace set, existing reviews of the
+        submitted categories are deleted first.
+
+        Args:
+            request: HTTP request containing a reviews list of category, rating
+                and comments, and an optional replace flag (a bare list is
+                accepted as the reviews list)
+            pk: Primary key of the performance record
+
+        Returns:
+            Response: JSON response with the created reviews
+        """
+        performance = self.get_object()
+
+        data = {'reviews': request.data} if isinstance(request.data, list) else request.data
+        serializer = ReviewBatchSerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        items = serializer.validated_data['reviews']
+        with transaction.atomic():
+            if serializer.validated_data['replace']:
+                Review.objects.filter(
+                    performance=performance,
+                    category__in=[item['category'] for item in items]
+                ).delete()
+            reviews = Review.objects.bulk_create([
+                Review(performance=performance, **item) for item in items
+            ])
+
+        # bulk_create does not send post_save, invalidate cached payloads here
+        invalidate_reviews(performance.pk)
+
+        return Response(ReviewSerializer(reviews, many=True).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def trend(self, request):
+        """
+        Get performance trend series for one employee or a whole department.
+
+        The review history of the department is fetched in a single query;
+        rolling means, deltas between reviews and percentile ranks within
+        the department (per quarter) are computed as array operations.
+
+        Args:
+            request: HTTP request with employee_id or department, and optional
+                window, start_date and end_date parameters
+
+        Returns:
+            Response: JSON response with one time series per employee
+        """
+        employee_id = request.query_params.get('employee_id')
+        department = request.query_params.get('department')
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+
+        if not employee_id and not department:
+            return Response({
+                'status': 'error',
+                'message': 'employee_id or department is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            window = int(request.query_params.get('window', 3))
+        except ValueError:
+            window = 0
+        if not 1 <= window <= 12:
+            return Response({
+                'status': 'error',
+                'message': 'window must be an integer between 1 and 12'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if not employee_id:
+            try:
+                department = int(department)
+            except ValueError:
+                return Response({
+                    'status': 'error',
+                    'message': 'department must be a department id'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Performance.objects.all()
+        if employee_id:
+            # The employee's department peers are needed for percentile ranks
+            department_id = Employee.objects.filter(
+                employee_id=employee_id
+            ).values('department_id')[:1]
+            queryset = queryset.filter(
+                Q(employee__employee_id=employee_id) |
+                Q(employee__department_id=Subquery(department_id))
+            )
+        else:
+            queryset = queryset.filter(employee__department_id=department)
+
+        if start_date:
+            queryset = queryset.filter(review_date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(review_date__lte=end_date)
+
+        rows = queryset.order_by('employee_id', 'review_date', 'id').values_list(
+            'employee_id', 'employee__employee_id', 'employee__first_name',
+            'employee__last_name', 'employee__department_id', 'review_date',
+            'performance_score', 'goals_achievement',
+        )
+
+        return Response({
+            'window': window,
+            'series': build_trend_series(list(rows), window, employee_code=employee_id),
+        })
+
 
 class GoalViewSet(viewsets.ModelViewSet):
     """
@@ -98,7 +271,7 @@ class GoalViewSet(viewsets.ModelViewSet):
 
     Provides CRUD operations for Goal model.
     """
-    queryset = Goal.objects.all()
+    queryset = Goal.objects.select_related('employee')
     serializer_class = GoalSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -106,6 +279,205 @@ class GoalViewSet(viewsets.ModelViewSet):
     search_fields = ['employee__first_name', 'employee__last_name', 'title', 'description']
     ordering_fields = ['target_date', 'start_date', 'progress']
     ordering = ['-target_date']
+    query_budgets = {'list': 2, 'retrieve': 1}
+
+    def get_open_goals(self, request):
+        """
+        Get open goals, optionally restricted to a department.
+
+        Args:
+            request: HTTP request with optional department parameter
+
+        Returns:
+            QuerySet: Open goals ordered by target date, served by the partial
+            (status, target_date) index
+
+        Raises:
+            ValueError: If department is not a department id
+        """
+        queryset = Goal.objects.filter(status__in=Goal.OPEN_STATUSES).select_related('employee')
+        department = request.query_params.get('department')
+        if department:
+            queryset = queryset.filter(employee__department_id=int(department))
+        return queryset.order_by('target_date', 'id')
+
+    def paginated_response(self, queryset):
+        """Return a paginated response for a goal queryset."""
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @query_budget(2)
+    @action(detail=False, methods=['get'])
+    def overdue(self, request):
+        """
+        Get open goals whose target date has passed.
+
+        Args:
+            request: HTTP request with optional department parameter
+
+        Returns:
+            Response: Paginated JSON response with overdue goals, oldest first
+        """
+        try:
+            queryset = self.get_open_goals(request)
+        except ValueError:
+            return Response({
+                'status': 'error',
+                'message': 'department must be a department id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(target_date__lt=timezone.localdate())
+        return self.paginated_response(queryset)
+
+    @query_budget(2)
+    @action(detail=False, methods=['get'])
+    def at_risk(self, request):
+        """
+        Get open goals due soon with little progress.
+
+        Args:
+            request: HTTP request with optional department, days (default 30,
+                at most GOAL_AT_RISK_MAX_DAYS) and max_progress (default 50)
+                parameters
+
+        Returns:
+            Response: Paginated JSON response with at-risk goals, soonest due first
+        """
+        max_days = getattr(settings, 'GOAL_AT_RISK_MAX_DAYS', 365)
+        try:
+            days = int(request.query_params.get('days', 30))
+            max_progress = float(request.query_params.get('max_progress', 50))
+        except ValueError:
+            return Response({
+                'status': 'error',
+                'message': 'days must be an integer and max_progress a number'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= days <= max_days:
+            return Response({
+                'status': 'error',
+                'message': f'days must be between 0 and {max_days}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            queryset = self.get_open_goals(request)
+        except ValueError:
+            return Response({
+                'status': 'error',
+                'message': 'department must be a department id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        today = timezone.localdate()
+        queryset = queryset.filter(
+            target_date__gte=today,
+            target_date__lte=today + timedelta(days=days),
+            progress__lt=max_progress,
+        )
+        return self.paginated_response(queryset)
+
+    @action(detail=False, methods=['get'])
+    def burndown(self, request):
+        """
+        Get open and completed goal counts per department over time.
+
+        Goals are grouped by department, start bucket and completion bucket
+        in a single query; the series are cumulative sums over the buckets.
+        Cancelled goals are left out.
+
+        Args:
+            request: HTTP request with optional start_date, end_date
+                (default: the last year), interval (week, month, quarter;
+                default month) and department parameters
+
+        Returns:
+            Response: JSON response with one series per department
+        """
+        interval = request.query_params.get('interval', 'month')
+        if interval not in BURNDOWN_INTERVALS:
+            return Response({
+                'status': 'error',
+                'message': f"interval must be one of: {', '.join(BURNDOWN_INTERVALS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            end_date = parse_date_param(request.query_params.get('end_date'), 'end_date') or timezone.localdate()
+            start_date = (
+                parse_date_param(request.query_params.get('start_date'), 'start_date')
+                or end_date - timedelta(days=365)
+            )
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        department = request.query_params.get('department')
+        try:
+            department = int(department) if department else None
+        except ValueError:
+            return Response({
+                'status': 'error',
+                'message': 'department must be a department id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        periods = period_starts(start_date, end_date, interval)
+        trunc = BURNDOWN_INTERVALS[interval]
+        # Goals completed after end_date are still open at the end of the range
+        closed_on = Case(
+            When(
+                Q(completion_date__lte=end_date) | Q(completion_date__isnull=True, target_date__lte=end_date),
+                status='completed',
+                then=Coalesce('completion_date', 'target_date'),
+            ),
+            output_field=DateField(),
+        )
+
+        queryset = Goal.objects.exclude(status='cancelled').filter(start_date__lte=end_date)
+        if department is not None:
+            queryset = queryset.filter(employee__department_id=department)
+
+        rows = list(
+            queryset.order_by()
+            .values(
+                department_id=F('employee__department_id'),
+                department_name=F('employee__department__name'),
+                opened=trunc('start_date'),
+                closed=trunc(closed_on),
+            )
+            .annotate(count=Count('id'))
+        )
+
+        departments = {}
+        for row in rows:
+            departments.setdefault(row['department_id'], row['department_name'])
+        department_ids = sorted(departments, key=lambda pk: (departments[pk] or '', pk or 0))
+        row_index = {pk: i for i, pk in enumerate(department_ids)}
+
+        opened = np.zeros((len(department_ids), len(periods)), dtype=int)
+        completed = np.zeros((len(department_ids), len(periods)), dtype=int)
+        period_array = np.array(periods, dtype='datetime64[D]')
+        for row in rows:
+            i = row_index[row['department_id']]
+            # Events before the range count from the first bucket
+            j = max(np.searchsorted(period_array, np.datetime64(row['opened'], 'D'), side='right') - 1, 0)
+            opened[i, j] += row['count']
+            if row['closed'] is not None:
+                j = max(np.searchsorted(period_array, np.datetime64(row['closed'], 'D'), side='right') - 1, 0)
+                completed[i, j] += row['count']
+
+        opened = np.cumsum(opened, axis=1)
+        completed = np.cumsum(completed, axis=1)
+
+        return Response({
+            'interval': interval,
+            'periods': [str(period) for period in periods],
+            'departments': [
+                {
+                    'department_id': pk,
+                    'department_name': departments[pk],
+                    'open': (opened[i] - completed[i]).tolist(),
+                    'completed': completed[i].tolist(),
+                }
+                for i, pk in enumerate(department_ids)
+            ],
+        })
 
 
 class ReviewViewSet(viewsets.ModelViewSet):
@@ -122,8 +494,62 @@ class ReviewViewSet(viewsets.ModelViewSet):
     search_fields = ['performance__employee__first_name', 'performance__employee__last_name', 'comments']
     ordering_fields = ['category', 'rating']
     ordering = ['category']
+    query_budgets = {'list': 2, 'retrieve': 1}
+
+
+# Date buckets supported by the goal burndown
+BURNDOWN_INTERVALS = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+}
+
+
+# Dimensions supported by performance_summary's group_by parameter
+SUMMARY_GROUPS = {
+    'department': {
+        'group_id': F('employee__department_id'),
+        'group_name': F('employee__department__name'),
+    },
+    'reviewer': {
+        'group_id': F('reviewer_id'),
+        'group_name': Concat('reviewer__first_name', Value(' '), 'reviewer__last_name'),
+    },
+    'position': {
+        'group_id': F('employee__position_id'),
+        'group_name': F('employee__position__title'),
+    },
+}
+
+# Date buckets supported by performance_summary's interval parameter
+SUMMARY_INTERVALS = {
+    'quarter': TruncQuarter,
+    'year': TruncYear,
+}
+
+
+def performance_summary_aggregates():
+    """
+    Build the aggregates behind performance_summary.
 
+    Status counts use filtered aggregates so every statistic is computed
+    in the same statement.
 
+    Returns:
+        dict: Aggregate expressions keyed by output field name
+    """
+    return {
+        'total_reviews': Count('id'),
+        'avg_performance_score': Avg('performance_score'),
+        'avg_goals_achievement': Avg('goals_achievement'),
+        'excellent_count': Count('id', filter=Q(status='excellent')),
+        'good_count': Count('id', filter=Q(status='good')),
+        'average_count': Count('id', filter=Q(status='average')),
+        'needs_improvement_count': Count('id', filter=Q(status='needs_improvement')),
+    }
+
+
+@query_budget(2)  # The aggregate, plus the snapshot freshness check with max_staleness
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def performance_summary(request):
@@ -131,17 +557,36 @@ def performance_summary(request):
     Get performance statistics summary.
 
     Calculates and returns performance review statistics for a given date range,
-    including counts by status and aggregated score data.
+    including counts by status and aggregated score data. All statistics are
+    computed in a single query. With group_by and/or interval the statistics
+    are broken down per group and period instead of company-wide.
 
     Args:
-        request: HTTP request with optional start_date and end_date parameters
+        request: HTTP request with optional start_date, end_date,
+            group_by (department, reviewer, position),
+            interval (quarter, year) and max_staleness (seconds of snapshot
+            staleness accepted for company-wide totals) parameters
 
     Returns:
         Response: JSON response with performance statistics
     """
-    # Get query parameters for date filtering
+    # Get query parameters for date filtering and grouping
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
+    group_by = request.query_params.get('group_by')
+    interval = request.query_params.get('interval')
+
+    if group_by and group_by not in SUMMARY_GROUPS:
+        return Response({
+            'status': 'error',
+            'message': f"group_by must be one of: {', '.join(SUMMARY_GROUPS)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if interval and interval not in SUMMARY_INTERVALS:
+        return Response({
+            'status': 'error',
+            'message': f"interval must be one of: {', '.join(SUMMARY_INTERVALS)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
 
     # Build base query
     queryset = Performance.objects.all()
@@ -153,28 +598,122 @@ def performance_summary(request):
     if end_date:
         queryset = queryset.filter(review_date__lte=end_date)
 
-    # Calculate statistics
-    total_reviews = queryset.count()
-    avg_performance_score = queryset.aggregate(Avg('performance_score'))['performance_score__avg'] or 0
-    avg_goals_achievement = queryset.aggregate(Avg('goals_achievement'))['goals_achievement__avg'] or 0
-
-    excellent_count = queryset.filter(status='excellent').count()
-    good_count = queryset.filter(status='good').count()
-    average_count = queryset.filter(status='average').count()
-    needs_improvement_count = queryset.filter(status='needs_improvement').count()
-
-    # Build response data
-    data = {
-        'total_reviews': total_reviews,
-        'avg_performance_score': round(avg_performance_score, 1),
-        'avg_goals_achievement': round(avg_goals_achievement, 2),
-        'excellent_count': excellent_count,
-        'good_count': good_count,
-        'average_count': average_count,
-        'needs_improvement_count': needs_improvement_count
-    }
+    if not group_by and not interval:
+        # Serve from the performance snapshot when the caller accepts its staleness
+        if snapshots.snapshots_fresh(['performance_daily'], snapshots.parse_max_staleness(request)):
+            serializer = PerformanceSummarySerializer(snapshots.performance_stats(start_date, end_date))
+            return Response(serializer.data)
 
-    serializer = PerformanceSummarySerializer(data=data)
-    if serializer.is_valid():
-        return Response(serializer.data)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # Company-wide totals in one statement
+        data = queryset.aggregate(**performance_summary_aggregates())
+        data['avg_performance_score'] = round(data['avg_performance_score'] or 0, 1)
+        data['avg_goals_achievement'] = round(data['avg_goals_achievement'] or 0, 2)
+
+        serializer = PerformanceSummarySerializer(data=data)
+        if serializer.is_valid():
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # Breakdown per group and/or period, one row per bucket from a single GROUP BY
+    dimensions = dict(SUMMARY_GROUPS.get(group_by, {}))
+    if interval:
+        dimensions['period'] = SUMMARY_INTERVALS[interval]('review_date')
+
+    rows = (
+        queryset.order_by()
+        .values(**dimensions)
+        .annotate(**performance_summary_aggregates())
+        .order_by(*dimensions)
+    )
+
+    results = []
+    for row in rows:
+        row['avg_performance_score'] = round(row['avg_performance_score'] or 0, 1)
+        row['avg_goals_achievement'] = round(row['avg_goals_achievement'] or 0, 2)
+        if row.get('group_name') is not None:
+            row['group_name'] = row['group_name'].strip() or None
+        results.append(row)
+
+    serializer = PerformanceSummaryGroupSerializer(results, many=True)
+    return Response({
+        'group_by': group_by,
+        'interval': interval,
+        'results': serializer.data,
+    })
+
+
+@query_budget(1)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def review_matrix(request):
+    """
+    Get the department x review category rating matrix.
+
+    Mean, count and standard deviation of review ratings are computed per
+    department and category in a single grouped query. The result is cached
+    until a review or performance record changes.
+
+    Args:
+        request: HTTP request with optional start_date and end_date parameters
+
+    Returns:
+        Response: JSON response with departments, categories and one matrix per statistic
+    """
+    start_date = request.query_params.get('start_date')
+    end_date = request.query_params.get('end_date')
+
+    def build():
+        queryset = Review.objects.all()
+
+        # Apply date filters on the review date of the performance record
+        if start_date:
+            queryset = queryset.filter(performance__review_date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(performance__review_date__lte=end_date)
+
+        cells = (
+            queryset.order_by()
+            .values(
+                'category',
+                department_id=F('performance__employee__department_id'),
+                department_name=F('performance__employee__department__name'),
+            )
+            .annotate(mean=Avg('rating'), count=Count('id'), stddev=StdDev('rating', sample=True))
+        )
+
+        departments = {}
+        categories = set()
+        for cell in cells:
+            departments.setdefault(cell['department_id'], cell['department_name'])
+            categories.add(cell['category'])
+
+        department_ids = sorted(departments, key=lambda pk: (departments[pk] or '', pk or 0))
+        categories = sorted(categories)
+        row_index = {pk: i for i, pk in enumerate(department_ids)}
+        column_index = {category: j for j, category in enumerate(categories)}
+
+        matrices = {
+            name: [[None] * len(categories) for _ in department_ids]
+            for name in ('mean', 'count', 'stddev')
+        }
+        for cell in cells:
+            i = row_index[cell['department_id']]
+            j = column_index[cell['category']]
+            matrices['mean'][i][j] = round(float(cell['mean']), 2)
+            matrices['count'][i][j] = cell['count']
+            if cell['stddev'] is not None:
+                matrices['stddev'][i][j] = round(float(cell['stddev']), 2)
+
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'departments': [{'id': pk, 'name': departments[pk]} for pk in department_ids],
+            'categories': categories,
+            **matrices,
+        }
+
+    cache_key = make_key(
+        'review_matrix', namespaces=(REVIEWS_NAMESPACE,),
+        start_date=start_date, end_date=end_date,
+    )
+    return Response(get_or_set(cache_key, build))
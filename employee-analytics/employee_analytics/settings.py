@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 # MIDDLEWARE defines the order in which middleware processes requests
 # Middleware components provide various functionalities like security, sessions, etc.
 MIDDLEWARE = [
+    'utils.profiling.ProfilingMiddleware',  # Server-Timing headers and sampled request profiles (PROFILING_*), first so it times the whole stack
     'corsheaders.middleware.CorsMiddleware',      # Handles Cross-Origin Resource Sharing
     'django.middleware.security.SecurityMiddleware',  # Provides security features
     'django.contrib.sessions.middleware.SessionMiddleware',  # Manages user sessions
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',  # User authentication
     'django.contrib.messages.middleware.MessageMiddleware',  # Message framework
     'django.middleware.clickjacking.XFrameOptionsMiddleware',  # Clickjacking protection
+    'utils.query_budget.QueryBudgetMiddleware',  # Checks view query counts against their budgets (QUERY_BUDGET_MODE)
 ]
 
 # ROOT_URLCONF specifies the Python module where the URLconf for the project is located
@@ -135,6 +137,11 @@ STATICFILES_DIRS = [  # Additional directories where static files are stored
     os.path.join(BASE_DIR, 'static'),
 ]
 
+# Media files configuration
+# Uploaded files and generated report files are stored here (reports are only served through the API)
+MEDIA_URL = '/media/'  # URL prefix for media files
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))  # Directory where media files are stored
+
 # Default primary key field type
 # DEFAULT_AUTO_FIELD specifies the default type for auto-created primary key fields
 # Using BigAutoField provides a 64-bit integer field for better scalability
@@ -187,3 +194,54 @@ SWAGGER_SETTINGS = {
     'JSON_EDITOR': True,       # Enables JSON editor in Swagger UI
     'IS_AUTHENTICATED': False,  # Whether authentication is required to view the API docs
 }
+
+# Cache configuration
+# Expensive read paths (performance details, analytics summaries) are cached here
+# Set CACHE_URL to a Redis/Memcached location in production to share the cache between workers
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_URL', 'employee-analytics'),
+    }
+}
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_TIMEOUT', '300'))  # Seconds cached payloads stay valid
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '60'))  # Seconds the dashboard summary stays fresh
+DASHBOARD_STALE_TIMEOUT = int(os.getenv('DASHBOARD_STALE_TIMEOUT', '600'))  # Seconds a stale dashboard may be served while it is recomputed
+DASHBOARD_PARALLEL_WORKERS = int(os.getenv('DASHBOARD_PARALLEL_WORKERS', '4'))  # Threads computing dashboard sections concurrently, each with its own DB connection (0 computes them sequentially)
+DASHBOARD_SECTION_TIMEOUT = float(os.getenv('DASHBOARD_SECTION_TIMEOUT', '10'))  # Seconds to wait for dashboard sections before returning a partial, uncached payload
+ANALYTICS_SNAPSHOT_REFRESH_INTERVAL = int(os.getenv('ANALYTICS_SNAPSHOT_REFRESH_INTERVAL', '300'))  # Seconds between snapshot refreshes of `manage.py refresh_analytics --loop`
+
+# Goal tracking (see apps/performance/views.py)
+GOAL_AT_RISK_MAX_DAYS = int(os.getenv('GOAL_AT_RISK_MAX_DAYS', '365'))  # Largest horizon (days) accepted by /api/goals/at_risk/
+
+# Report jobs (see apps/analytics/jobs.py), executed by `manage.py run_report_workers`
+REPORT_REUSE_WINDOW = int(os.getenv('REPORT_REUSE_WINDOW', '3600'))  # Seconds a completed report is reused for identical requests
+REPORT_JOB_TIMEOUT = int(os.getenv('REPORT_JOB_TIMEOUT', '3600'))  # Seconds after which a running report is considered abandoned and requeued
+REPORT_REQUEUE_INTERVAL = int(os.getenv('REPORT_REQUEUE_INTERVAL', '60'))  # Seconds between checks of running workers for abandoned reports
+REPORT_CHUNK_SIZE = int(os.getenv('REPORT_CHUNK_SIZE', '2000'))  # Rows fetched per database round trip while generating a report
+
+# Attendance anomaly scanner (see apps/attendance/anomalies.py), run by `manage.py scan_attendance_anomalies`
+ANOMALY_SCAN_CHUNK_SIZE = int(os.getenv('ANOMALY_SCAN_CHUNK_SIZE', '5000'))  # Rows fetched per database round trip while scanning
+ANOMALY_Z_THRESHOLD = float(os.getenv('ANOMALY_Z_THRESHOLD', '3.5'))  # Robust (median/MAD) z-score above which hours worked are flagged
+ANOMALY_LONG_DAY_HOURS = float(os.getenv('ANOMALY_LONG_DAY_HOURS', '16'))  # Hours worked in a day above which it is flagged
+ANOMALY_CLUSTER_RESOLUTION = int(os.getenv('ANOMALY_CLUSTER_RESOLUTION', '1'))  # Seconds within which time logs count as identical
+ANOMALY_CLUSTER_MIN_EMPLOYEES = int(os.getenv('ANOMALY_CLUSTER_MIN_EMPLOYEES', '3'))  # Distinct employees sharing a timestamp needed to flag it
+ANOMALY_CLUSTER_WINDOW = int(os.getenv('ANOMALY_CLUSTER_WINDOW', '900'))  # Seconds before and after a shared timestamp whose logs give its expected number of employees
+ANOMALY_CLUSTER_MAX_P = float(os.getenv('ANOMALY_CLUSTER_MAX_P', '1e-6'))  # Probability of a shared timestamp (Poisson, from the surrounding logs) under which it is flagged
+
+# SQL query budgets declared on views (see utils/query_budget.py)
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'off')  # What happens when a request exceeds its budget: off, log (warning with repeated statements) or raise
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', '0'))  # Budget of views declaring none (0 leaves them unchecked)
+
+# Request profiling (see utils/profiling.py), adjustable at runtime through /api/analytics/profiling/
+PROFILING_SERVER_TIMING = os.getenv('PROFILING_SERVER_TIMING', str(DEBUG)).lower() == 'true'  # Add Server-Timing headers (db, render, app, total) to every response
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))  # Fraction of requests profiled and written to PROFILING_DIR (0 disables)
+PROFILING_PROFILER = os.getenv('PROFILING_PROFILER', 'sampling')  # sampling (low-overhead stack sampler, collapsed stacks) or cprofile (deterministic, pstats files)
+PROFILING_SAMPLE_INTERVAL = float(os.getenv('PROFILING_SAMPLE_INTERVAL', '0.005'))  # Seconds between stack samples of a profiled request
+PROFILING_DIR = os.getenv('PROFILING_DIR', os.path.join(BASE_DIR, 'profiles'))  # Directory profiles are written to
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '500'))  # Profiles kept in PROFILING_DIR, the oldest are deleted
+PROFILING_CONFIG_TTL = float(os.getenv('PROFILING_CONFIG_TTL', '5'))  # Seconds each process caches the runtime configuration
+
+# Ad-hoc aggregation limits (see apps/analytics/query_engine.py)
+AGGREGATE_MAX_ROWS = int(os.getenv('AGGREGATE_MAX_ROWS', '10000'))  # Maximum number of groups an aggregation may return
+AGGREGATE_MAX_COST = float(os.getenv('AGGREGATE_MAX_COST', '1000000'))  # Maximum PostgreSQL planner cost estimate of an aggregation
@@ -0,0 +1,395 @@
+import http.client
+import itertools
+import json
+import platform
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.attendance.models import Attendance
+from apps.employees.models import Employee
+from apps.performance.models import Performance
+
+# Benchmarked endpoints in run order; check-out needs the check-ins before it.
+# `data` builds the request body from the context and the request number.
+# Endpoints marked `writes` add rows, which changes the dataset (and so the
+# query counts and timings) of every later run: they only run on request.
+ENDPOINTS = {
+    'employees': {'method': 'GET', 'path': '/api/employees/'},
+    'employees_by_department': {'method': 'GET', 'path': '/api/employees/by_department/'},
+    'attendances': {'method': 'GET', 'path': '/api/attendances/'},
+    'attendance_summary': {'method': 'GET', 'path': '/api/summary/attendance/'},
+    'performance_summary': {'method': 'GET', 'path': '/api/summary/performance/'},
+    'dashboard_summary': {'method': 'GET', 'path': '/api/dashboard/'},
+    'check_in': {
+        'method': 'POST', 'path': '/api/attendances/check_in/', 'writes': True,
+        'data': lambda context, index: {'employee_id': context['employees'][index % len(context['employees'])]},
+    },
+    'check_out': {
+        'method': 'POST', 'path': '/api/attendances/check_out/', 'writes': True,
+        'data': lambda context, index: {'employee_id': context['employees'][index % len(context['employees'])]},
+    },
+}
+
+# Metrics compared with a baseline, and whether higher values are worse
+COMPARED_METRICS = {
+    'p50_ms': True,
+    'p95_ms': True,
+    'p99_ms': True,
+    'throughput': False,
+    'queries_mean': True,
+}
+
+# Employees used by the check-in/check-out requests
+CONTEXT_EMPLOYEES = 1000
+
+# Query count in the Server-Timing header of utils.profiling.ProfilingMiddleware
+_SERVER_TIMING_QUERIES = re.compile(r'(?:^|,)\s*db;[^,]*desc="(\d+) queries"')
+
+
+def dataset_size():
+    """Row counts identifying the benchmarked dataset, so results stay comparable."""
+    return {
+        'employees': Employee.objects.count(),
+        'attendances': Attendance.objects.count(),
+        'performances': Performance.objects.count(),
+    }
+
+
+def benchmark_context():
+    """Data the request bodies are built from."""
+    employees = list(Employee.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)[:CONTEXT_EMPLOYEES])
+    if not employees:
+        raise ValueError("The database has no active employees, generate or load a dataset first")
+    return {'employees': employees}
+
+
+class InProcessClient:
+    """
+    Drive the endpoints through the Django test client, without a server.
+
+    Each thread gets its own client and database connection, and the SQL
+    queries of every request are counted.
+
+    Args:
+        user: User the requests are authenticated as
+        cold_cache: Clear the cache before every request
+    """
+
+    def __init__(self, user, cold_cache=False):
+        self.user = user
+        self.cold_cache = cold_cache
+        # The test client sends "testserver", which is usually not an allowed host
+        self.host = next((host for host in settings.ALLOWED_HOSTS if host and '*' not in host), 'testserver')
+        self.local = threading.local()
+
+    def request(self, method, path, data=None):
+        """
+        Send one request.
+
+        Returns:
+            tuple: (status code, response size in bytes, number of SQL queries)
+        """
+        from rest_framework.test import APIClient
+
+        if not hasattr(self.local, 'client'):
+            self.local.client = APIClient(SERVER_NAME=self.host)
+            self.local.client.force_authenticate(self.user)
+        if self.cold_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            if method == 'GET':
+                response = self.local.client.get(path, data)
+            else:
+                response = self.local.client.generic(method, path, json.dumps(data or {}), content_type='application/json')
+            size = len(response.content) if not response.streaming else 0
+        return response.status_code, size, len(queries)
+
+    def close(self):
+        """Close the database connection of the calling thread."""
+        connection.close()
+
+
+class HttpClient:
+    """
+    Drive the endpoints of a running server over HTTP with keep-alive
+    connections, logging in once through the session login page.
+
+    Args:
+        base_url: Server URL, e.g. http://localhost:8000
+        username: User to log in as
+        password: Password of the user
+    """
+
+    def __init__(self, base_url, username, password):
+        parts = urlsplit(base_url)
+        self.scheme, self.netloc = parts.scheme or 'http', parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.local = threading.local()
+        self.cookies = {}
+        self._login(username, password)
+
+    def _connection(self):
+        if not hasattr(self.local, 'connection'):
+            factory = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            self.local.connection = factory(self.netloc, timeout=60)
+        return self.local.connection
+
+    def _send(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        http_connection = self._connection()
+        try:
+            http_connection.request(method, self.prefix + path, body=body, headers=headers)
+            response = http_connection.getresponse()
+            content = response.read()
+        except (http.client.HTTPException, OSError):
+            # The server closed the keep-alive connection, retry once on a new one
+            http_connection.close()
+            del self.local.connection
+            http_connection = self._connection()
+            http_connection.request(method, self.prefix + path, body=body, headers=headers)
+            response = http_connection.getresponse()
+            content = response.read()
+        return response, content
+
+    def _login(self, username, password):
+        response, _ = self._send('GET', '/api/auth/login/')
+        self._store_cookies(response)
+        body = urlencode({
+            'username': username,
+            'password': password,
+            'csrfmiddlewaretoken': self.cookies.get('csrftoken', ''),
+        })
+        response, _ = self._send('POST', '/api/auth/login/', body, {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Referer': f'{self.scheme}://{self.netloc}{self.prefix}/api/auth/login/',
+        })
+        self._store_cookies(response)
+        if 'sessionid' not in self.cookies:
+            raise ValueError(f"Could not log in as {username} (HTTP {response.status})")
+
+    def _store_cookies(self, response):
+        for header in response.headers.get_all('Set-Cookie') or []:
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+
+    def request(self, method, path, data=None):
+        """
+        Send one request.
+
+        Returns:
+            tuple: (status code, response size in bytes, number of SQL queries
+                from the Server-Timing header, None when the server sends none)
+        """
+        body = None
+        headers = {}
+        if method == 'GET':
+            if data:
+                path = f'{path}?{urlencode(data)}'
+        else:
+            body = json.dumps(data or {})
+            headers = {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': self.cookies.get('csrftoken', ''),
+                'Referer': f'{self.scheme}://{self.netloc}/',
+            }
+        response, content = self._send(method, path, body, headers)
+        queries = _SERVER_TIMING_QUERIES.search(response.headers.get('Server-Timing') or '')
+        return response.status, len(content), int(queries.group(1)) if queries else None
+
+    def close(self):
+        """Close the HTTP connection of the calling thread."""
+        if hasattr(self.local, 'connection'):
+            self.local.connection.close()
+            del self.local.connection
+
+
+def summarize(samples, seconds):
+    """
+    Latency, throughput and query statistics of one endpoint run.
+
+    Args:
+        samples: (latency seconds, status code, bytes, queries or None) per request
+        seconds: Wall time of the run
+
+    Returns:
+        dict: Metrics (latencies in milliseconds)
+    """
+    latencies = np.array([sample[0] for sample in samples], dtype=float) * 1000
+    statuses = {}
+    for sample in samples:
+        statuses[str(sample[1])] = statuses.get(str(sample[1]), 0) + 1
+    queries = [sample[3] for sample in samples if sample[3] is not None]
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0, 0, 0)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample[1] >= 400),
+        'statuses': statuses,
+        'seconds': round(seconds, 3),
+        'throughput': round(len(samples) / seconds, 2) if seconds else 0,
+        'mean_ms': round(float(latencies.mean()), 2) if len(latencies) else 0,
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(latencies.max()), 2) if len(latencies) else 0,
+        'bytes_mean': round(sum(sample[2] for sample in samples) / len(samples)) if samples else 0,
+        'queries_mean': round(sum(queries) / len(queries), 2) if queries else None,
+        'queries_max': max(queries) if queries else None,
+    }
+
+
+def run_endpoint(client, spec, context, requests, concurrency, warmup=0):
+    """
+    Benchmark one endpoint.
+
+    Warm-up requests run first and are not recorded; the measured requests
+    are then spread over `concurrency` threads.
+
+    Args:
+        client: InProcessClient or HttpClient
+        spec: Endpoint entry of ENDPOINTS
+        context: Result of benchmark_context
+        requests: Number of measured requests
+        concurrency: Number of threads sending requests
+        warmup: Number of unrecorded requests sent first
+
+    Returns:
+        dict: Metrics (see summarize)
+    """
+    make_data = spec.get('data')
+
+    def send(index):
+        data = make_data(context, index) if make_data else None
+        started = time.perf_counter()
+        status, size, queries = client.request(spec['method'], spec['path'], data)
+        return time.perf_counter() - started, status, size, queries
+
+    for index in range(warmup):
+        send(index)
+
+    counter = itertools.count()
+    samples = []
+
+    def worker():
+        try:
+            while (index := next(counter)) < requests:
+                samples.append(send(warmup + index))
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return summarize(samples, time.perf_counter() - started)
+
+
+def run_benchmark(client, mode, endpoints=None, requests=100, concurrency=1, warmup=5, progress=None, writes=False):
+    """
+    Benchmark endpoints and collect the results.
+
+    Args:
+        client: InProcessClient or HttpClient
+        mode: "inprocess" or "http", recorded in the results
+        endpoints: Names from ENDPOINTS (all by default), run in ENDPOINTS order
+        requests: Measured requests per endpoint
+        concurrency: Threads sending requests
+        warmup: Unrecorded requests per endpoint
+        progress: Optional callable(endpoint name, metrics) called after each endpoint
+        writes: Also run the endpoints that write rows
+
+    Returns:
+        dict: Run settings, environment, dataset size and metrics per endpoint
+
+    Raises:
+        ValueError: When a requested endpoint writes rows and writes is False
+    """
+    if not writes:
+        requested = [name for name in endpoints or () if ENDPOINTS[name].get('writes')]
+        if requested:
+            raise ValueError(f"{', '.join(requested)} write rows to the database, pass writes=True (--writes) to run them")
+    names = [
+        name for name, spec in ENDPOINTS.items()
+        if (endpoints is None or name in endpoints) and (writes or not spec.get('writes'))
+    ]
+    context = benchmark_context()
+    results = {
+        'created_at': timezone.now().isoformat(),
+        'mode': mode,
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'requests': requests,
+        'concurrency': concurrency,
+        'warmup': warmup,
+        'writes': writes,
+        'dataset': dataset_size(),
+        'endpoints': {},
+    }
+    for name in names:
+        metrics = run_endpoint(client, ENDPOINTS[name], context, requests, concurrency, warmup)
+        results['endpoints'][name] = metrics
+        if progress:
+            progress(name, metrics)
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compare benchmark results with a baseline run.
+
+    Latency and throughput regress when they get worse by more than
+    `threshold` (a fraction); query counts are deterministic and regress
+    on any increase.
+
+    Args:
+        results: Result of run_benchmark
+        baseline: Earlier result of run_benchmark
+        threshold: Tolerated relative change of timings
+
+    Returns:
+        tuple: (comparison rows, warnings). Rows hold endpoint, metric,
+            baseline, current, relative change and whether it regressed.
+    """
+    warnings = []
+    for key in ('mode', 'database', 'concurrency', 'dataset'):
+        if results.get(key) != baseline.get(key):
+            warnings.append(f"{key} differs from the baseline: {baseline.get(key)} -> {results.get(key)}")
+
+    rows = []
+    for name, metrics in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if previous is None:
+            warnings.append(f"{name} is not in the baseline")
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            old, new = previous.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float('inf'))
+            if metric == 'queries_mean':
+                regressed = new > old
+            elif higher_is_worse:
+                regressed = change > threshold
+            else:
+                regressed = change < -threshold
+            rows.append({
+                'endpoint': name,
+                'metric': metric,
+                'baseline': old,
+                'current': new,
+                'change': round(change, 3) if change != float('inf') else None,
+                'regressed': regressed,
+            })
+    return rows, warnings
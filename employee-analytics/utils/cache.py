@@ -0,0 +1,183 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(namespace):
+    """Return the cache key holding the version counter of a namespace."""
+    return f"cache_version:{namespace}"
+
+
+def get_versions(*namespaces):
+    """
+    Get the current version of each cache namespace.
+
+    Namespaces that have no version yet (never used, or evicted) are seeded
+    with a time based value so that stale entries written under an older
+    counter can never be picked up again.
+
+    Args:
+        *namespaces: Namespace names, e.g. "performance:12"
+
+    Returns:
+        list: Versions in the same order as the namespaces
+    """
+    keys = [_version_key(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key, 0)
+        versions.append(version)
+    return versions
+
+
+def bump_versions(*namespaces):
+    """
+    Invalidate every cache entry built from the given namespaces.
+
+    Args:
+        *namespaces: Namespace names to invalidate
+    """
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Counter missing (never used or evicted), start a fresh one
+            cache.set(key, time.time_ns(), None)
+
+
+def make_key(prefix, namespaces=(), **params):
+    """
+    Build a cache key that changes whenever one of the namespaces is bumped.
+
+    Args:
+        prefix: Key prefix identifying the cached payload
+        namespaces: Namespaces the payload depends on
+        **params: Request parameters the payload depends on
+
+    Returns:
+        str: Cache key
+    """
+    versions = get_versions(*namespaces) if namespaces else []
+    digest = hashlib.md5(
+        json.dumps([versions, params], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def get_or_set(key, builder, timeout=None):
+    """
+    Return the cached value for key, building and storing it on a miss.
+
+    Args:
+        key: Cache key
+        builder: Callable returning the value to cache
+        timeout: Cache timeout in seconds (defaults to ANALYTICS_CACHE_TIMEOUT)
+
+    Returns:
+        The cached or freshly built value
+    """
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        if timeout is None:
+            timeout = getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 300)
+        cache.set(key, value, timeout)
+    return value
+
+
+def _refresh(key, builder, versions, timeout, stale_timeout, lock_key, should_cache=None):
+    """Rebuild a stale-while-revalidate entry and release its refresh lock."""
+    try:
+        value = builder()
+        if should_cache is not None and not should_cache(value):
+            return value
+        cache.set(key, {
+            'value': value,
+            'versions': versions,
+            'fresh_until': time.time() + timeout,
+        }, timeout + stale_timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def _refresh_in_background(*args):
+    """Rebuild a stale entry in a daemon thread with its own database connection."""
+    def run():
+        try:
+            _refresh(*args)
+        except Exception:
+            logger.exception("Background cache refresh failed for %s", args[0])
+        finally:
+            connection.close()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_or_refresh(key, builder, namespaces=(), timeout=None, stale_timeout=None,
+                   lock_timeout=30, wait=5.0, should_cache=None):
+    """
+    Cached read with stale-while-revalidate and single-flight recomputation.
+
+    An entry is fresh until its timeout passes or one of its namespaces is
+    bumped. Stale entries are still served for up to stale_timeout seconds
+    while a single caller refreshes them in the background. On a complete
+    miss only the caller holding the refresh lock computes the value; the
+    others wait up to `wait` seconds for it before computing it themselves.
+
+    Args:
+        key: Cache key (namespace versions are tracked inside the entry)
+        builder: Callable returning the value to cache
+        namespaces: Namespaces whose bumps make the entry stale
+        timeout: Seconds the entry stays fresh (defaults to ANALYTICS_CACHE_TIMEOUT)
+        stale_timeout: Extra seconds a stale entry may be served (defaults to timeout)
+        lock_timeout: Seconds after which an abandoned refresh lock expires
+        wait: Seconds to wait for another caller's computation on a miss
+        should_cache: Optional predicate; built values it rejects (e.g. partial
+            results) are returned without being cached
+
+    Returns:
+        The cached, stale or freshly built value
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 300)
+    if stale_timeout is None:
+        stale_timeout = timeout
+
+    versions = get_versions(*namespaces) if namespaces else []
+    lock_key = f"{key}:refresh_lock"
+    args = (key, builder, versions, timeout, stale_timeout, lock_key, should_cache)
+
+    entry = cache.get(key)
+    if entry is not None:
+        if entry['versions'] == versions and entry['fresh_until'] > time.time():
+            return entry['value']
+        # Stale: serve it and let a single caller refresh it
+        if cache.add(lock_key, True, lock_timeout):
+            _refresh_in_background(*args)
+        return entry['value']
+
+    if cache.add(lock_key, True, lock_timeout):
+        return _refresh(*args)
+
+    # Another caller is computing the value, wait for it instead of piling on
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+    return builder()
@@ -0,0 +1,122 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack
+
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name, workers):
+    """
+    Get a process-wide bounded thread pool, created on first use.
+
+    Worker threads close their database connection after each task (see
+    _run_task), so each pool holds at most `workers` connections. The pool
+    tracks its idle workers; run_parallel only submits to idle ones, so
+    tasks still running after their caller gave up never delay new callers.
+
+    Args:
+        name: Pool name
+        workers: Maximum number of threads
+
+    Returns:
+        ThreadPoolExecutor: The pool
+    """
+    with _executors_lock:
+        if name not in _executors:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            executor.idle_workers = threading.BoundedSemaphore(workers)
+            _executors[name] = executor
+        return _executors[name]
+
+
+def _run_task(name, task, wrappers=(), idle_workers=None):
+    """
+    Run a task in a pool thread, then release its database connection.
+
+    The execute wrappers of the submitting thread's connection are installed
+    on the pool thread's connection for the duration of the task, so query
+    recorders (query budgets, profiling) see the task's queries too. The
+    connection is closed after every task, abandoned ones included, as
+    request threads do at the end of a request.
+    """
+    try:
+        with ExitStack() as stack:
+            for wrapper in wrappers:
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            try:
+                return task()
+            except Exception:
+                # The connection may be unusable (e.g. aborted transaction), start over next time
+                connection.close()
+                raise
+    finally:
+        close_old_connections()
+        if idle_workers is not None:
+            idle_workers.release()
+
+
+def _run_inline(name, task, results, failed):
+    """Run a task in the calling thread, logging failures."""
+    try:
+        results[name] = task()
+    except Exception:
+        logger.exception("Task %s failed", name)
+        failed.append(name)
+
+
+def run_parallel(tasks, executor=None, timeout=None):
+    """
+    Run independent tasks concurrently and collect whatever finishes in time.
+
+    Tasks still running after `timeout` seconds are abandoned (their result
+    is discarded when they finish); failing tasks are logged. Without an
+    executor the tasks run one after another in the calling thread. With a
+    pool from get_executor, tasks only go to idle workers; when every worker
+    is busy (e.g. with tasks abandoned by earlier callers), the remaining
+    tasks run in the calling thread instead of queueing behind them. The
+    caller's database execute wrappers also apply to the tasks' queries.
+
+    Args:
+        tasks: Mapping of task name to callable
+        executor: ThreadPoolExecutor to run the tasks in
+        timeout: Seconds to wait for the pooled tasks (None waits forever)
+
+    Returns:
+        tuple: (results by task name, names of timed out tasks, names of failed tasks)
+    """
+    results, timed_out, failed = {}, [], []
+    if executor is None:
+        for name, task in tasks.items():
+            _run_inline(name, task, results, failed)
+        return results, timed_out, failed
+
+    idle_workers = getattr(executor, 'idle_workers', None)
+    wrappers = list(connection.execute_wrappers)
+    futures, inline = {}, {}
+    for name, task in tasks.items():
+        if idle_workers is None or idle_workers.acquire(blocking=False):
+            futures[name] = executor.submit(_run_task, name, task, wrappers, idle_workers)
+        else:
+            inline[name] = task
+    for name, task in inline.items():
+        _run_inline(name, task, results, failed)
+
+    wait(futures.values(), timeout=timeout)
+    for name, future in futures.items():
+        if not future.done():
+            if future.cancel() and idle_workers is not None:
+                # Never started, so _run_task will not release its worker
+                idle_workers.release()
+            timed_out.append(name)
+        elif future.exception() is not None:
+            logger.error("Task %s failed", name, exc_info=future.exception())
+            failed.append(name)
+        else:
+            results[name] = future.result()
+    return results, timed_out, failed
@@ -1,15 +1,21 @@
-
+import multiprocessing
 import random
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+import django
 from faker import Faker
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
 from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.utils import timezone
 
+from apps.analytics.signals import invalidate_bulk_changes
 from apps.employees.models import Employee, Department, Position
 from apps.attendance.models import Attendance, TimeLog
 from apps.performance.models import Performance, Goal, Review
 
-fake = Faker('en_US')
-
 # Department list
 DEPARTMENTS = [
     {'name': 'Technology', 'description': 'Responsible for company technology R&D and product innovation'},
@@ -39,6 +45,24 @@ SALARY_RANGES = {
     'Other': (40000, 70000),
 }
 
+REVIEW_CATEGORIES = ['Technical Skills', 'Communication', 'Teamwork', 'Problem Solving', 'Leadership']
+
+# Size presets for `manage.py generate_data`: employees and days of attendance history
+PRESETS = {
+    'small': {'employees': 100, 'days': 30},
+    'medium': {'employees': 5000, 'days': 365},
+    'large': {'employees': 50000, 'days': 730},
+}
+
+# Employees whose attendance and reviews are generated by one task. Each
+# employee has its own random stream, so the data does not depend on how
+# tasks are spread over processes.
+EMPLOYEES_PER_TASK = 200
+
+# Faker output is pre-generated once and sampled, Faker is too slow per row
+TEXT_POOL_SIZE = 500
+
+
 def get_salary_range(position):
     """Get salary range based on position"""
     for key, value in SALARY_RANGES.items():
@@ -46,293 +70,390 @@ def get_salary_range(position):
             return value
     return SALARY_RANGES['Other']
 
-def generate_departments():
-    """Generate department data"""
-    departments = []
-    for dept_data in DEPARTMENTS:
-        department, created = Department.objects.get_or_create(
-            name=dept_data['name'],
-            defaults={'description': dept_data['description']}
-        )
-        departments.append(department)
-    return departments
-
-def generate_positions():
-    """Generate position data"""
-    positions = []
-    departments = Department.objects.all()
 
+def generate_departments():
+    """Create the missing departments and return all generator departments."""
+    existing = {dept.name: dept for dept in Department.objects.filter(name__in=[d['name'] for d in DEPARTMENTS])}
+    Department.objects.bulk_create([
+        Department(name=dept_data['name'], description=dept_data['description'])
+        for dept_data in DEPARTMENTS
+        if dept_data['name'] not in existing
+    ])
+    return list(Department.objects.filter(name__in=[d['name'] for d in DEPARTMENTS]).order_by('id'))
+
+
+def generate_positions(departments):
+    """Create the missing positions of the departments and return them by department id."""
+    existing = set(Position.objects.filter(department__in=departments).values_list('department_id', 'title'))
+    missing = []
     for dept in departments:
-        if dept.name in POSITIONS:
-            for pos_title in POSITIONS[dept.name]:
+        for pos_title in POSITIONS.get(dept.name, []):
+            if (dept.pk, pos_title) not in existing:
                 min_salary, max_salary = get_salary_range(pos_title)
-                position, created = Position.objects.get_or_create(
+                missing.append(Position(
                     title=pos_title,
                     department=dept,
-                    defaults={
-                        'description': f'{pos_title} position in {dept.name}',
-                        'min_salary': min_salary,
-                        'max_salary': max_salary
-                    }
-                )
-                positions.append(position)
+                    description=f'{pos_title} position in {dept.name}',
+                    min_salary=min_salary,
+                    max_salary=max_salary,
+                ))
+    Position.objects.bulk_create(missing)
+
+    positions = {}
+    for position in Position.objects.filter(department__in=departments).order_by('id'):
+        positions.setdefault(position.department_id, []).append(position)
     return positions
 
-def generate_employee_data(count=5):
-    """Generate employee data"""
-    # Ensure departments and positions exist
+
+def text_pool(faker):
+    """Pre-generate the free text sampled by the generator."""
+    return {
+        'sentences': [faker.sentence() for _ in range(TEXT_POOL_SIZE)],
+        'paragraphs': [faker.paragraph(nb_sentences=3) for _ in range(TEXT_POOL_SIZE)],
+        'goal_titles': [faker.sentence(nb_words=4) for _ in range(TEXT_POOL_SIZE)],
+        'goal_descriptions': [faker.paragraph(nb_sentences=2) for _ in range(TEXT_POOL_SIZE)],
+    }
+
+
+def generate_employees(count, seed, chunk_size, create_users=True):
+    """
+    Create employees (and their users) with chunked bulk inserts.
+
+    Args:
+        count: Number of employees
+        seed: Random seed
+        chunk_size: Rows per INSERT
+        create_users: Whether to create a Django user per employee
+
+    Returns:
+        list: (employee pk, generation index, department id, hire date) per employee
+    """
+    rng = random.Random(seed)
+    faker = Faker('en_US')
+    faker.seed_instance(seed)
+    today = timezone.localdate()
+
     departments = generate_departments()
-    positions = generate_positions()
-
-    # Generate employee data
-    employees = []
-    for i in range(count):
-        # Randomly select department and position
-        department = random.choice(departments)
-        available_positions = Position.objects.filter(department=department)
-        position = random.choice(available_positions) if available_positions else None
-
-        # Generate name and user information
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        username = f"{first_name.lower()}{last_name.lower()}{random.randint(1, 999)}"
-        email = fake.email()
-
-        # Create Django user
-        user, created = User.objects.get_or_create(
-            username=username,
-            defaults={
-                'email': email,
-                'first_name': first_name,
-                'last_name': last_name,
-            }
-        )
-
-        # Generate employee ID
-        employee_id = f"EMP{random.randint(10000, 99999)}"
-
-        # Generate salary
+    positions = generate_positions(departments)
+    # Numbering continues after existing employees so repeated runs do not collide
+    start = Employee.objects.count()
+
+    users, employees = [], []
+    for index in range(count):
+        department = rng.choice(departments)
+        position = rng.choice(positions[department.pk]) if positions.get(department.pk) else None
+        first_name = faker.first_name()
+        last_name = faker.last_name()
+        number = start + index + 1
+        email = f"{first_name.lower()}.{last_name.lower()}.{number}@example.com"
         if position:
-            min_salary = position.min_salary
-            max_salary = position.max_salary
+            min_salary, max_salary = int(position.min_salary), int(position.max_salary)
         else:
             min_salary, max_salary = get_salary_range("Other")
-        salary = random.randint(min_salary, max_salary)
-
-        # Generate hire date (1-5 years ago)
-        hire_date = datetime.now() - timedelta(days=random.randint(365, 1825))
-
-        # Create employee
-        employee, created = Employee.objects.get_or_create(
-            employee_id=employee_id,
-            defaults={
-                'user': user,
-                'first_name': first_name,
-                'last_name': last_name,
-                'gender': random.choice(['M', 'F']),
-                'email': email,
-                'phone': fake.phone_number()[:20],
-                'department': department,
-                'position': position,
-                'hire_date': hire_date,
-                'salary': salary,
-                'is_active': True,
-            }
-        )
-
-        employees.append(employee)
-
-    # Generate attendance records for employees (past 30 days)
-    for employee in employees:
-        # Randomly generate attendance records for the past 30 days
-        for days_ago in range(1, 31):
-            date = datetime.now() - timedelta(days=days_ago)
-
-            # Skip weekends
-            if date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                continue
 
-            # Randomly determine attendance status
-            status_rand = random.random()
-            if status_rand < 0.1:  # 10% chance of absence
-                status = 'absent'
-                check_in = None
-                check_out = None
-                hours_worked = 0
-            elif status_rand < 0.2:  # 10% chance of being late
-                status = 'late'
-                check_in = datetime.combine(date, datetime.min.time()) + timedelta(hours=9, minutes=random.randint(15, 60))
-                check_out = datetime.combine(date, datetime.min.time()) + timedelta(hours=18, minutes=random.randint(0, 30))
-                hours_worked = round((check_out - check_in).total_seconds() / 3600, 2)
-            elif status_rand < 0.25:  # 5% chance of early leave
-                status = 'early_leave'
-                check_in = datetime.combine(date, datetime.min.time()) + timedelta(hours=8, minutes=random.randint(0, 30))
-                check_out = datetime.combine(date, datetime.min.time()) + timedelta(hours=17, minutes=random.randint(0, 30))
-                hours_worked = round((check_out - check_in).total_seconds() / 3600, 2)
-            elif status_rand < 0.3:  # 5% chance of leave
-                status = 'leave'
-                check_in = None
-                check_out = None
-                hours_worked = 0
-            else:  # 70% chance of normal attendance
-                status = 'present'
-                check_in = datetime.combine(date, datetime.min.time()) + timedelta(hours=8, minutes=random.randint(0, 30))
-                check_out = datetime.combine(date, datetime.min.time()) + timedelta(hours=18, minutes=random.randint(0, 60))
-                hours_worked = round((check_out - check_in).total_seconds() / 3600, 2)
-
-            # Calculate overtime hours
-            overtime_hours = 0
-            if hours_worked > 8:
-                overtime_hours = round(hours_worked - 8, 2)
-
-            # Create attendance record
-            attendance, created = Attendance.objects.get_or_create(
-                employee=employee,
-                date=date.date(),
-                defaults={
-                    'check_in': check_in,
-                    'check_out': check_out,
-                    'status': status,
-                    'hours_worked': hours_worked,
-                    'overtime_hours': overtime_hours,
-                }
-            )
-
-            # Create time logs if check-in and check-out times are available
-            if check_in:
-                TimeLog.objects.create(
-                    attendance=attendance,
-                    log_type='check_in',
-                    timestamp=check_in
-                )
-            if check_out:
-                TimeLog.objects.create(
-                    attendance=attendance,
-                    log_type='check_out',
-                    timestamp=check_out
-                )
-
-    # Generate performance records for employees (1-2 times per year)
-    for employee in employees:
-        hire_date = employee.hire_date
-        current_date = datetime.now().date()
-
-        # Calculate years of employment
-        years_employed = (current_date - hire_date).days / 365.25
-
-        # Generate 1-2 performance evaluations per year
-        for year in range(int(years_employed) + 1):
-            review_count = random.randint(1, 2)
-
-            for i in range(review_count):
-                # Determine review date (random time within the year)
-                if year == 0:  # First year of employment
-                    # Conduct reviews at 6 months and 12 months after hiring
-                    if i == 0:
-                        review_date = hire_date + timedelta(days=180)
-                    else:
-                        review_date = hire_date + timedelta(days=365)
-                else:
-                    # Conduct reviews at random times in other years
-                    start_date = hire_date + timedelta(days=365 * year)
-                    end_date = hire_date + timedelta(days=365 * (year + 1))
-                    days_diff = (end_date - start_date).days
-                    review_date = start_date + timedelta(days=random.randint(1, days_diff))
-
-                # Ensure review date is not later than current date
-                if review_date > current_date:
-                    continue
-
-                # Select reviewer (usually another employee in the department or a manager)
-                potential_reviewers = Employee.objects.filter(
-                    department=employee.department,
-                    is_active=True
-                ).exclude(id=employee.id)
-
-                if potential_reviewers.exists():
-                    reviewer = random.choice(potential_reviewers)
-                else:
-                    reviewer = None
-
-                # Generate performance score and goals achievement
-                performance_score = round(random.uniform(3.0, 5.0), 1)
-                goals_achievement = round(random.uniform(70.0, 120.0), 2)
-
-                # Determine status based on performance score
-                if performance_score >= 4.5:
-                    status = 'excellent'
-                elif performance_score >= 4.0:
-                    status = 'good'
-                elif performance_score >= 3.5:
-                    status = 'average'
-                else:
-                    status = 'needs_improvement'
-
-                # Generate comments
-                comments = fake.paragraph(nb_sentences=3)
-
-                # Create performance record
-                performance, created = Performance.objects.get_or_create(
-                    employee=employee,
-                    review_date=review_date,
-                    defaults={
-                        'reviewer': reviewer,
-                        'performance_score': performance_score,
-                        'goals_achievement': goals_achievement,
-                        'comments': comments,
-                        'status': status,
-                    }
-                )
-
-                # Generate detailed reviews for the performance record
-                review_categories = ['Technical Skills', 'Communication', 'Teamwork', 'Problem Solving', 'Leadership']
-                for category in review_categories:
-                    rating = round(random.uniform(3.0, 5.0), 1)
-                    review_comments = fake.sentence()
-
-                    Review.objects.create(
-                        performance=performance,
-                        category=category,
-                        rating=rating,
-                        comments=review_comments
-                    )
-
-                # Generate goals for the employee
-                num_goals = random.randint(1, 3)
-                for j in range(num_goals):
-                    goal_title = fake.sentence(nb_words=4)
-                    goal_description = fake.paragraph(nb_sentences=2)
-                    goal_start_date = review_date
-                    goal_target_date = goal_start_date + timedelta(days=random.randint(90, 365))
-
-                    # Randomly determine if goal is completed
-                    if goal_target_date <= current_date and random.random() < 0.7:  # 70% chance of completion if target date passed
-                        goal_status = 'completed'
-                        goal_completion_date = goal_target_date - timedelta(days=random.randint(0, 30))
-                        goal_progress = 100.0
-                    elif goal_target_date > current_date:
-                        goal_status = 'in_progress'
-                        goal_completion_date = None
-                        goal_progress = round(random.uniform(10, 90), 2)
-                    else:
-                        goal_status = 'on_hold'
-                        goal_completion_date = None
-                        goal_progress = round(random.uniform(10, 80), 2)
-
-                    Goal.objects.create(
-                        employee=employee,
-                        title=goal_title,
-                        description=goal_description,
-                        start_date=goal_start_date,
-                        target_date=goal_target_date,
-                        completion_date=goal_completion_date,
-                        status=goal_status,
-                        progress=goal_progress
-                    )
+        if create_users:
+            users.append(User(
+                username=f"{first_name.lower()}{last_name.lower()}{number}",
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                password=UNUSABLE_PASSWORD_PREFIX,
+            ))
+        employees.append(Employee(
+            employee_id=f"EMP{number:07d}",
+            first_name=first_name,
+            last_name=last_name,
+            gender=rng.choice(['M', 'F']),
+            email=email,
+            phone=faker.phone_number()[:20],
+            department=department,
+            position=position,
+            # Hired 1-5 years ago
+            hire_date=today - timedelta(days=rng.randint(365, 1825)),
+            salary=rng.randint(min_salary, max_salary),
+            is_active=True,
+        ))
+
+    with transaction.atomic():
+        if create_users:
+            User.objects.bulk_create(users, batch_size=chunk_size)
+            for user, employee in zip(users, employees):
+                employee.user = user
+        # Also opens the employment history and updates the counters
+        Employee.objects.bulk_create(employees, batch_size=chunk_size)
+
+    return [
+        (employee.pk, start + index, employee.department_id, employee.hire_date)
+        for index, employee in enumerate(employees)
+    ]
+
+
+def _attendance(day, rng, tz):
+    """Random attendance of one work day: (status, check-in, check-out), to the second like a badge reader."""
+    midnight = datetime.combine(day, dt_time.min, tzinfo=tz)
+    status_rand = rng.random()
+    if status_rand < 0.1:  # 10% chance of absence
+        return 'absent', None, None
+    if status_rand < 0.2:  # 10% chance of being late
+        return ('late', midnight + timedelta(hours=9, minutes=rng.randint(15, 60), seconds=rng.randint(0, 59)),
+                midnight + timedelta(hours=18, minutes=rng.randint(0, 30), seconds=rng.randint(0, 59)))
+    if status_rand < 0.25:  # 5% chance of early leave
+        return ('early_leave', midnight + timedelta(hours=8, minutes=rng.randint(0, 30), seconds=rng.randint(0, 59)),
+                midnight + timedelta(hours=17, minutes=rng.randint(0, 30), seconds=rng.randint(0, 59)))
+    if status_rand < 0.3:  # 5% chance of leave
+        return 'leave', None, None
+    # 70% chance of normal attendance
+    return ('present', midnight + timedelta(hours=8, minutes=rng.randint(0, 30), seconds=rng.randint(0, 59)),
+            midnight + timedelta(hours=18, minutes=rng.randint(0, 60), seconds=rng.randint(0, 59)))
+
+
+def _review_dates(hire_date, today, rng):
+    """1-2 review dates per year of employment, the first ones 6 and 12 months after hiring."""
+    dates = []
+    for year in range((today - hire_date).days // 365 + 1):
+        for i in range(rng.randint(1, 2)):
+            if year == 0:
+                review_date = hire_date + timedelta(days=180 if i == 0 else 365)
+            else:
+                review_date = hire_date + timedelta(days=365 * year + rng.randint(1, 365))
+            if review_date <= today:
+                dates.append(review_date)
+    return dates
+
+
+def _goal(employee_pk, review_date, today, rng, texts):
+    """Random goal set at a review."""
+    target_date = review_date + timedelta(days=rng.randint(90, 365))
+    if target_date <= today and rng.random() < 0.7:  # 70% chance of completion if target date passed
+        status, completion_date, progress = 'completed', target_date - timedelta(days=rng.randint(0, 30)), 100
+    elif target_date > today:
+        status, completion_date, progress = 'in_progress', None, round(rng.uniform(10, 90), 2)
+    else:
+        status, completion_date, progress = 'on_hold', None, round(rng.uniform(10, 80), 2)
+    return Goal(
+        employee_id=employee_pk,
+        title=rng.choice(texts['goal_titles']),
+        description=rng.choice(texts['goal_descriptions']),
+        start_date=review_date,
+        target_date=target_date,
+        completion_date=completion_date,
+        status=status,
+        progress=Decimal(str(progress)),
+    )
+
+
+def _performance_status(score):
+    """Review status from the performance score."""
+    if score >= 4.5:
+        return 'excellent'
+    if score >= 4.0:
+        return 'good'
+    if score >= 3.5:
+        return 'average'
+    return 'needs_improvement'
+
+
+def _assign_pks(objects, model, keys):
+    """
+    Fill in primary keys after a bulk insert on databases that cannot return them.
+
+    Args:
+        objects: Inserted instances
+        model: Their model
+        keys: Field names identifying a row among the inserted ones
+    """
+    if not objects or objects[0].pk is not None:
+        return
+    lookup = {key: [getattr(obj, key) for obj in objects] for key in keys}
+    rows = model.objects.filter(**{f'{key}__in': set(values) for key, values in lookup.items()}).values_list('pk', *keys)
+    pks = {tuple(row[1:]): row[0] for row in rows}
+    for obj in objects:
+        obj.pk = pks[tuple(getattr(obj, key) for key in keys)]
+
+
+def generate_activity(employees, days, seed, chunk_size, reviewers, texts):
+    """
+    Create attendance, time logs, reviews and goals of some employees.
+
+    Each employee draws from its own random stream derived from the seed
+    and its generation index, so results do not depend on task order.
+
+    Args:
+        employees: (pk, generation index, department id, hire date) tuples
+        days: Days of attendance history, ending yesterday
+        seed: Random seed of the run
+        chunk_size: Rows per INSERT
+        reviewers: Active employee pks per department id
+        texts: Text pool (see text_pool)
+
+    Returns:
+        dict: Number of rows created per table
+    """
+    tz = timezone.get_default_timezone()
+    today = timezone.localdate()
+    workdays = [
+        day for day in (today - timedelta(days=offset) for offset in range(days, 0, -1))
+        if day.weekday() < 5
+    ]
+    attendances, time_logs = [], []
+    performances, reviews, goals = [], [], []
+
+    for employee_pk, index, department_id, hire_date in employees:
+        rng = random.Random(seed * 1000003 + index)
+
+        for day in workdays:
+            if day < hire_date:
+                continue
+            status, check_in, check_out = _attendance(day, rng, tz)
+            hours_worked = round((check_out - check_in).total_seconds() / 3600, 2) if check_in else 0
+            attendances.append(Attendance(
+                employee_id=employee_pk,
+                date=day,
+                check_in=check_in,
+                check_out=check_out,
+                status=status,
+                hours_worked=Decimal(str(hours_worked)),
+                overtime_hours=Decimal(str(round(max(hours_worked - 8, 0), 2))),
+            ))
+
+        pool = reviewers.get(department_id, [])
+        for review_date in _review_dates(hire_date, today, rng):
+            # Reviewer: another active employee of the department
+            reviewer = rng.choice(pool) if len(pool) > 1 else None
+            while reviewer == employee_pk:
+                reviewer = rng.choice(pool)
+            performance_score = round(rng.uniform(3.0, 5.0), 1)
+            performances.append(Performance(
+                employee_id=employee_pk,
+                reviewer_id=reviewer,
+                review_date=review_date,
+                performance_score=Decimal(str(performance_score)),
+                goals_achievement=Decimal(str(round(rng.uniform(70.0, 120.0), 2))),
+                comments=rng.choice(texts['paragraphs']),
+                status=_performance_status(performance_score),
+            ))
+            reviews.append([
+                Review(category=category, rating=Decimal(str(round(rng.uniform(3.0, 5.0), 1))),
+                       comments=rng.choice(texts['sentences']))
+                for category in REVIEW_CATEGORIES
+            ])
+            goals.extend(_goal(employee_pk, review_date, today, rng, texts) for _ in range(rng.randint(1, 3)))
+
+    with transaction.atomic():
+        Attendance.objects.bulk_create(attendances, batch_size=chunk_size)
+        _assign_pks(attendances, Attendance, ('employee_id', 'date'))
+        for attendance in attendances:
+            if attendance.check_in:
+                time_logs.append(TimeLog(attendance_id=attendance.pk, log_type='check_in', timestamp=attendance.check_in))
+                time_logs.append(TimeLog(attendance_id=attendance.pk, log_type='check_out', timestamp=attendance.check_out))
+        TimeLog.objects.bulk_create(time_logs, batch_size=chunk_size)
+
+        Performance.objects.bulk_create(performances, batch_size=chunk_size)
+        _assign_pks(performances, Performance, ('employee_id', 'review_date'))
+        for performance, performance_reviews in zip(performances, reviews):
+            for review in performance_reviews:
+                review.performance_id = performance.pk
+        Review.objects.bulk_create([review for batch in reviews for review in batch], batch_size=chunk_size)
+        Goal.objects.bulk_create(goals, batch_size=chunk_size)
 
     return {
-        'employees_created': len(employees),
-        'attendances_created': Attendance.objects.count(),
-        'performances_created': Performance.objects.count(),
-        'goals_created': Goal.objects.count(),
+        'attendances': len(attendances),
+        'time_logs': len(time_logs),
+        'performances': len(performances),
+        'reviews': len(performances) * len(REVIEW_CATEGORIES),
+        'goals': len(goals),
+    }
+
+
+# Per-process state of the worker pool, set by _init_worker
+_worker_state = {}
+
+
+def _init_worker(days, seed, chunk_size, reviewers, texts):
+    """Prepare a worker process: Django setup, fresh connections and shared inputs."""
+    django.setup()
+    connections.close_all()
+    _worker_state.update(days=days, seed=seed, chunk_size=chunk_size, reviewers=reviewers, texts=texts)
+
+
+def _run_task(employees):
+    """Generate the activity of one slice of employees in a worker process."""
+    counts = generate_activity(employees, **_worker_state)
+    return len(employees), counts
+
+
+def generate_employee_data(count=5, days=30, seed=None, workers=1, chunk_size=5000,
+                           create_users=True, progress=None):
+    """
+    Generate employees with attendance history, reviews and goals.
+
+    Rows are built in memory and written with chunked bulk inserts; Faker
+    text is pre-generated and reviewer pools are loaded once per department.
+    The same seed on the same database produces the same data, whatever the
+    number of workers.
+
+    Args:
+        count: Number of employees
+        days: Days of attendance history, ending yesterday (weekends skipped)
+        seed: Random seed (a random one is picked and returned when None)
+        workers: Processes generating attendance and reviews (forced to 1 on SQLite)
+        chunk_size: Rows per INSERT statement
+        create_users: Whether to create a Django user per employee
+        progress: Optional callable(employees done, rows created) called after each task
+
+    Returns:
+        dict: Seed, rows created per table and elapsed seconds
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 31)
+    if connection.vendor == 'sqlite':
+        # SQLite allows one writer at a time
+        workers = 1
+    started = time.monotonic()
+
+    employees = generate_employees(count, seed, chunk_size, create_users)
+    stats = {
+        'seed': seed,
+        'employees': len(employees),
+        'users': len(employees) if create_users else 0,
+        'attendances': 0,
+        'time_logs': 0,
+        'performances': 0,
+        'reviews': 0,
+        'goals': 0,
     }
+
+    faker = Faker('en_US')
+    faker.seed_instance(seed)
+    texts = text_pool(faker)
+    reviewers = {}
+    for department_id, pk in Employee.objects.filter(is_active=True).order_by('pk').values_list('department_id', 'pk'):
+        reviewers.setdefault(department_id, []).append(pk)
+
+    tasks = [employees[i:i + EMPLOYEES_PER_TASK] for i in range(0, len(employees), EMPLOYEES_PER_TASK)]
+    done = 0
+
+    def collect(task_employees, counts):
+        nonlocal done
+        done += task_employees
+        for table, rows in counts.items():
+            stats[table] += rows
+        if progress:
+            progress(done, sum(value for key, value in stats.items() if key != 'seed'))
+
+    if workers > 1 and len(tasks) > 1:
+        # Workers open their own connections; inherited ones must not be shared
+        connections.close_all()
+        with multiprocessing.get_context().Pool(
+            workers, initializer=_init_worker, initargs=(days, seed, chunk_size, reviewers, texts),
+        ) as pool:
+            for task_employees, counts in pool.imap_unordered(_run_task, tasks):
+                collect(task_employees, counts)
+    else:
+        for task in tasks:
+            collect(len(task), generate_activity(task, days, seed, chunk_size, reviewers, texts))
+
+    if employees:
+        invalidate_bulk_changes(min(hire_date for _, _, _, hire_date in employees))
+    stats['seconds'] = round(time.monotonic() - started, 2)
+    return stats
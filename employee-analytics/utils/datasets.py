@@ -0,0 +1,357 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.analytics.signals import invalidate_bulk_changes
+
+# Dataset tables in load order: every table only references earlier ones
+# (or itself, e.g. Employee.manager; foreign keys are checked at commit)
+DATASET_MODELS = (
+    'auth.User',
+    'employees.Department',
+    'employees.Position',
+    'employees.Employee',
+    'employees.EmploymentHistory',
+    'attendance.Attendance',
+    'attendance.TimeLog',
+    'performance.Performance',
+    'performance.Review',
+    'performance.Goal',
+)
+
+MANIFEST_NAME = 'manifest.json'
+
+# Bumped when the file layout changes
+FORMAT_VERSION = 1
+
+# Files use PostgreSQL's COPY text format: tab separated, \N for NULL,
+# backslash escapes, booleans as t/f and datetimes in UTC with an offset
+NULL = '\\N'
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_UNESCAPES = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+_ESCAPED = re.compile(r'\\(.)')
+
+
+def dataset_models():
+    """Dataset models in load order."""
+    return [apps.get_model(label) for label in DATASET_MODELS]
+
+
+def _columns(model):
+    """Concrete (field, column name) pairs of a model, in field order."""
+    return [(field, field.column) for field in model._meta.concrete_fields]
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _escape(value):
+    return value.translate(_ESCAPES)
+
+
+def _unescape(value):
+    return _ESCAPED.sub(lambda match: _UNESCAPES.get(match.group(1), match.group(1)), value) if '\\' in value else value
+
+
+def _dump_converter(field):
+    """Function turning a raw SQLite value of a field into COPY text."""
+    internal_type = field.get_internal_type()
+    if internal_type == 'BooleanField':
+        return lambda value: 't' if value else 'f'
+    if internal_type == 'DateTimeField':
+        # Stored as naive UTC text
+        return lambda value: f'{value}+00'
+    if internal_type == 'DecimalField':
+        return lambda value, places=field.decimal_places: f'{value:.{places}f}' if isinstance(value, float) else str(value)
+    return lambda value: _escape(str(value))
+
+
+def _load_converter(field):
+    """Function turning COPY text of a field into a value SQLite stores like Django does."""
+    internal_type = field.get_internal_type()
+    if internal_type == 'BooleanField':
+        return lambda value: value == 't'
+    if internal_type == 'DateTimeField':
+        return lambda value: str(datetime.fromisoformat(value).astimezone(dt_timezone.utc).replace(tzinfo=None))
+    return _unescape
+
+
+def _dump_table_sqlite(model, output, chunk_size):
+    """Write a table as COPY text from SQLite, returning the number of rows."""
+    columns = _columns(model)
+    converters = [_dump_converter(field) for field, _ in columns]
+    rows = 0
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT {} FROM {} ORDER BY {}'.format(
+            ', '.join(_quote(column) for _, column in columns),
+            _quote(model._meta.db_table),
+            _quote(model._meta.pk.column),
+        ))
+        while True:
+            batch = cursor.fetchmany(chunk_size)
+            if not batch:
+                break
+            output.write(''.join(
+                '\t'.join(NULL if value is None else convert(value) for convert, value in zip(converters, row)) + '\n'
+                for row in batch
+            ))
+            rows += len(batch)
+    return rows
+
+
+def _copy_to(cursor, sql, output):
+    """Run COPY ... TO STDOUT into a binary file (psycopg2 or psycopg 3)."""
+    if hasattr(cursor, 'copy_expert'):
+        cursor.copy_expert(sql, output)
+        return
+    with cursor.copy(sql) as copy:
+        for block in copy:
+            output.write(block)
+
+
+def _copy_from(cursor, sql, source):
+    """Run COPY ... FROM STDIN from a binary file (psycopg2 or psycopg 3)."""
+    if hasattr(cursor, 'copy_expert'):
+        cursor.copy_expert(sql, source)
+        return
+    with cursor.copy(sql) as copy:
+        while block := source.read(1 << 20):
+            copy.write(block)
+
+
+def _dump_table_postgresql(model, output):
+    """Write a table with COPY TO, returning the number of rows."""
+    columns = ', '.join(_quote(column) for _, column in _columns(model))
+    with connection.cursor() as cursor:
+        _copy_to(cursor, 'COPY (SELECT {} FROM {} ORDER BY {}) TO STDOUT'.format(
+            columns, _quote(model._meta.db_table), _quote(model._meta.pk.column),
+        ), output)
+        rows = cursor.rowcount
+    # Older drivers do not report COPY row counts; the transaction sees the same snapshot
+    return rows if rows >= 0 else model.objects.count()
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        while block := source.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dump_dataset(directory, chunk_size=10000, compresslevel=6):
+    """
+    Write the dataset tables to a directory: one gzip compressed COPY text
+    file per table and a manifest.
+
+    PostgreSQL writes the files with COPY TO inside one repeatable read
+    transaction, so all tables come from the same snapshot; other databases
+    convert rows in Python to the same format, so bundles load anywhere.
+
+    Args:
+        directory: Target directory (created if missing)
+        chunk_size: Rows fetched at a time on databases without COPY
+        compresslevel: gzip compression level
+
+    Returns:
+        dict: The manifest
+    """
+    os.makedirs(directory, exist_ok=True)
+    tables = []
+    started = time.monotonic()
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+                cursor.execute("SET LOCAL TIME ZONE 'UTC'")
+        for model in dataset_models():
+            file_name = f'{model._meta.db_table}.tsv.gz'
+            path = os.path.join(directory, file_name)
+            table_started = time.monotonic()
+            with gzip.open(path, 'wb', compresslevel=compresslevel) as output:
+                if connection.vendor == 'postgresql':
+                    rows = _dump_table_postgresql(model, output)
+                else:
+                    with io.TextIOWrapper(output, encoding='utf-8', newline='') as text:
+                        rows = _dump_table_sqlite(model, text, chunk_size)
+            tables.append({
+                'model': model._meta.label,
+                'table': model._meta.db_table,
+                'file': file_name,
+                'columns': [column for _, column in _columns(model)],
+                'rows': rows,
+                'bytes': os.path.getsize(path),
+                'sha256': _sha256(path),
+                'seconds': round(time.monotonic() - table_started, 2),
+            })
+
+    manifest = {
+        'format': FORMAT_VERSION,
+        'created_at': timezone.now().isoformat(),
+        'vendor': connection.vendor,
+        'seconds': round(time.monotonic() - started, 2),
+        'tables': tables,
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as output:
+        json.dump(manifest, output, indent=2)
+    return manifest
+
+
+def read_manifest(directory):
+    """
+    Read and validate the manifest of a dataset directory against the current models.
+
+    Raises:
+        ValueError: If the manifest is missing, has another format or does
+            not match the current tables
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"No {MANIFEST_NAME} in {directory}")
+    with open(path) as source:
+        manifest = json.load(source)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported dataset format {manifest.get('format')}, expected {FORMAT_VERSION}")
+
+    models = {model._meta.label: model for model in dataset_models()}
+    for entry in manifest['tables']:
+        model = models.get(entry['model'])
+        if model is None:
+            raise ValueError(f"Unknown dataset table {entry['model']}")
+        expected = [column for _, column in _columns(model)]
+        if entry['columns'] != expected:
+            raise ValueError(
+                f"Columns of {entry['model']} changed since the dump (migrations differ): "
+                f"{entry['columns']} != {expected}"
+            )
+    return manifest
+
+
+def _load_table_sqlite(model, columns, source, chunk_size):
+    """Insert COPY text rows with batched executemany, returning the number of rows."""
+    fields = {column: field for field, column in _columns(model)}
+    converters = [_load_converter(fields[column]) for column in columns]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        _quote(model._meta.db_table),
+        ', '.join(_quote(column) for column in columns),
+        ', '.join(['%s'] * len(columns)),
+    )
+    rows = 0
+    batch = []
+    with connection.cursor() as cursor:
+        for line in source:
+            batch.append([
+                None if value == NULL else convert(value)
+                for convert, value in zip(converters, line.rstrip('\n').split('\t'))
+            ])
+            if len(batch) >= chunk_size:
+                cursor.executemany(sql, batch)
+                rows += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            rows += len(batch)
+    return rows
+
+
+def _load_table_postgresql(model, columns, source):
+    """Load COPY text rows with COPY FROM, returning the number of rows."""
+    with connection.cursor() as cursor:
+        _copy_from(cursor, 'COPY {} ({}) FROM STDIN'.format(
+            _quote(model._meta.db_table), ', '.join(_quote(column) for column in columns),
+        ), source)
+        return cursor.rowcount
+
+
+def load_dataset(directory, truncate=False, chunk_size=10000, progress=None):
+    """
+    Load a dataset written by dump_dataset, in one transaction.
+
+    Tables are loaded in manifest (dependency) order with COPY FROM on
+    PostgreSQL and batched executemany elsewhere; primary keys are kept,
+    sequences are reset afterwards and analytics caches invalidated.
+
+    Args:
+        directory: Dataset directory
+        truncate: Empty the dataset tables first; tables referencing them
+            (anomalies, calibrations, reports...) are emptied too
+        chunk_size: Rows per executemany batch
+        progress: Optional callable(table entry, rows loaded, seconds) called after each table
+
+    Returns:
+        dict: Rows loaded per model and elapsed seconds
+
+    Raises:
+        ValueError: If the manifest is invalid, a file does not match its
+            checksum or the tables are not empty and truncate is False
+    """
+    manifest = read_manifest(directory)
+    models = {model._meta.label: model for model in dataset_models()}
+    entries = manifest['tables']
+    for entry in entries:
+        if _sha256(os.path.join(directory, entry['file'])) != entry['sha256']:
+            raise ValueError(f"{entry['file']} does not match the checksum in the manifest")
+
+    started = time.monotonic()
+    loaded = {}
+    with transaction.atomic():
+        if truncate:
+            tables = [models[entry['model']]._meta.db_table for entry in entries]
+            connection.ops.execute_sql_flush(
+                connection.ops.sql_flush(no_style(), tables, reset_sequences=True, allow_cascade=True),
+            )
+        else:
+            filled = [label for label, model in models.items() if model.objects.exists()]
+            if filled:
+                raise ValueError(f"Tables are not empty: {', '.join(filled)} (use truncate)")
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL TIME ZONE 'UTC'")
+
+        for entry in entries:
+            model = models[entry['model']]
+            table_started = time.monotonic()
+            path = os.path.join(directory, entry['file'])
+            if connection.vendor == 'postgresql':
+                with gzip.open(path, 'rb') as source:
+                    rows = _load_table_postgresql(model, entry['columns'], source)
+            else:
+                with gzip.open(path, 'rt', encoding='utf-8', newline='\n') as source:
+                    rows = _load_table_sqlite(model, entry['columns'], source, chunk_size)
+            loaded[entry['model']] = rows
+            if progress:
+                progress(entry, rows, time.monotonic() - table_started)
+
+        loaded_models = [models[entry['model']] for entry in entries]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), loaded_models):
+                cursor.execute(sql)
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for model in loaded_models:
+                cursor.execute(f'ANALYZE {_quote(model._meta.db_table)}')
+
+    Attendance, Performance = apps.get_model('attendance.Attendance'), apps.get_model('performance.Performance')
+    first_days = [
+        Attendance.objects.aggregate(day=Min('date'))['day'],
+        Performance.objects.aggregate(day=Min('review_date'))['day'],
+    ]
+    first_days = [day for day in first_days if day]
+    if first_days:
+        invalidate_bulk_changes(min(first_days))
+
+    return {'rows': loaded, 'seconds': round(time.monotonic() - started, 2)}
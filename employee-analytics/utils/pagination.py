@@ -1,5 +1,5 @@
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -42,3 +42,19 @@ class LargeResultsSetPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
+
+
+class DateCursorPagination(CursorPagination):
+    """
+    Keyset pagination for large, date ordered tables.
+
+    Pages are fetched with WHERE (date, id) < cursor instead of OFFSET, so
+    every page costs the same regardless of its depth. Provides:
+    - Default page size of 50 items
+    - Maximum page size of 500 items
+    - Opaque next/previous cursor links instead of page numbers
+    """
+    ordering = ('-date', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -0,0 +1,149 @@
+import re
+from datetime import date
+
+from django.utils.dateparse import parse_date
+
+
+PERIOD_PATTERN = re.compile(r'^(?P<year>\d{4})(?:-(?P<kind>[QH])(?P<index>\d))?$')
+
+
+def parse_date_param(value, name='date'):
+    """
+    Parse an optional YYYY-MM-DD request or report parameter.
+
+    Args:
+        value: Parameter value (empty values give None)
+        name: Parameter name, for the error message
+
+    Returns:
+        date or None: The date, None when the value is empty
+
+    Raises:
+        ValueError: If the value is not a valid date
+    """
+    if not value:
+        return None
+    try:
+        parsed = parse_date(str(value))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"Invalid {name} '{value}', expected YYYY-MM-DD")
+    return parsed
+
+
+def parse_period(period):
+    """
+    Parse a review period label into its date range.
+
+    Supported labels are a year ("2024"), a half year ("2024-H1") and a
+    quarter ("2024-Q3").
+
+    Args:
+        period: Period label
+
+    Returns:
+        tuple: (start_date, end_date), both inclusive
+
+    Raises:
+        ValueError: If the label is not a supported period
+    """
+    match = PERIOD_PATTERN.match(period or '')
+    if not match:
+        raise ValueError(f"Invalid period '{period}', expected YYYY, YYYY-Hn or YYYY-Qn")
+
+    year = int(match.group('year'))
+    kind = match.group('kind')
+    if kind is None:
+        return date(year, 1, 1), date(year, 12, 31)
+
+    index = int(match.group('index'))
+    months = 6 if kind == 'H' else 3
+    if not 1 <= index <= 12 // months:
+        raise ValueError(f"Invalid period '{period}'")
+
+    first_month = (index - 1) * months + 1
+    last_month = first_month + months - 1
+    end_date = date(year + 1, 1, 1) if last_month == 12 else date(year, last_month + 1, 1)
+    return date(year, first_month, 1), date.fromordinal(end_date.toordinal() - 1)
+
+
+def period_starts(start_date, end_date, interval):
+    """
+    List the start dates of the calendar buckets covering a date range.
+
+    Args:
+        start_date: First date of the range
+        end_date: Last date of the range
+        interval: Bucket size, one of "week", "month", "quarter" or "year"
+
+    Returns:
+        list: Bucket start dates, matching Django's Trunc* functions
+
+    Raises:
+        ValueError: If the interval is not supported
+    """
+    if interval == 'week':
+        current = date.fromordinal(start_date.toordinal() - start_date.weekday())
+        starts = []
+        while current <= end_date:
+            starts.append(current)
+            current = date.fromordinal(current.toordinal() + 7)
+        return starts
+
+    months = {'month': 1, 'quarter': 3, 'year': 12}.get(interval)
+    if months is None:
+        raise ValueError(f"Invalid interval '{interval}', expected week, month, quarter or year")
+
+    index = start_date.year * 12 + (start_date.month - 1)
+    index -= index % months
+    starts = []
+    while True:
+        current = date(index // 12, index % 12 + 1, 1)
+        if current > end_date:
+            return starts
+        starts.append(current)
+        index += months
+
+
+def previous_period(period):
+    """
+    Get the label of the period immediately before a period.
+
+    Args:
+        period: Period label (YYYY, YYYY-Hn or YYYY-Qn)
+
+    Returns:
+        str: Label of the previous period of the same kind
+
+    Raises:
+        ValueError: If the label is not a supported period
+    """
+    parse_period(period)
+    match = PERIOD_PATTERN.match(period)
+    year = int(match.group('year'))
+    kind = match.group('kind')
+    if kind is None:
+        return str(year - 1)
+
+    index = int(match.group('index')) - 1
+    if index == 0:
+        return f"{year - 1}-{kind}{2 if kind == 'H' else 4}"
+    return f"{year}-{kind}{index}"
+
+
+def period_labels(day):
+    """
+    Get the labels of every period containing a date.
+
+    Args:
+        day: Date
+
+    Returns:
+        list: Year, half-year and quarter labels, e.g. ["2024", "2024-H1", "2024-Q2"]
+    """
+    return [
+        str(day.year),
+        f"{day.year}-H{(day.month - 1) // 6 + 1}",
+        f"{day.year}-Q{(day.month - 1) // 3 + 1}",
+    ]
@@ -0,0 +1,316 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .query_budget import QueryRecorder
+
+logger = logging.getLogger(__name__)
+
+# Runtime overrides of the profiling settings, shared through the cache
+CONFIG_CACHE_KEY = 'profiling:config'
+
+PROFILERS = ('sampling', 'cprofile')
+
+_SLUG = re.compile(r'[^A-Za-z0-9]+')
+
+# Per-process copy of the configuration, re-read every PROFILING_CONFIG_TTL seconds
+_config = {'value': None, 'expires': 0.0}
+_config_lock = threading.Lock()
+
+
+def default_config():
+    """Profiling configuration from the settings."""
+    return {
+        'server_timing': getattr(settings, 'PROFILING_SERVER_TIMING', False),
+        'sample_rate': getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0),
+        'profiler': getattr(settings, 'PROFILING_PROFILER', 'sampling'),
+    }
+
+
+def get_config():
+    """
+    Current profiling configuration: the settings with the runtime overrides
+    stored by set_config. Cached in the process for PROFILING_CONFIG_TTL
+    seconds, so requests do not hit the cache backend.
+    """
+    now = time.monotonic()
+    if now >= _config['expires']:
+        with _config_lock:
+            _config['value'] = {**default_config(), **(cache.get(CONFIG_CACHE_KEY) or {})}
+            _config['expires'] = now + getattr(settings, 'PROFILING_CONFIG_TTL', 5)
+    return _config['value']
+
+
+def validate_config(changes):
+    """
+    Validate profiling configuration changes.
+
+    Args:
+        changes: Mapping with server_timing, sample_rate and/or profiler
+
+    Returns:
+        dict: Normalized changes
+
+    Raises:
+        ValueError: On unknown fields or invalid values
+    """
+    unknown = sorted(set(changes) - set(default_config()))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    valid = {}
+    if 'server_timing' in changes:
+        if not isinstance(changes['server_timing'], bool):
+            raise ValueError("server_timing must be true or false")
+        valid['server_timing'] = changes['server_timing']
+    if 'sample_rate' in changes:
+        try:
+            sample_rate = float(changes['sample_rate'])
+        except (TypeError, ValueError):
+            raise ValueError("sample_rate must be a number between 0 and 1")
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be a number between 0 and 1")
+        valid['sample_rate'] = sample_rate
+    if 'profiler' in changes:
+        if changes['profiler'] not in PROFILERS:
+            raise ValueError(f"profiler must be one of: {', '.join(PROFILERS)}")
+        valid['profiler'] = changes['profiler']
+    return valid
+
+
+def set_config(changes=None, reset=False):
+    """
+    Override profiling settings at runtime for every process sharing the cache.
+
+    Args:
+        changes: Fields to override (see validate_config)
+        reset: Drop all overrides first
+
+    Returns:
+        dict: The new configuration
+    """
+    changes = validate_config(changes or {})
+    stored = {} if reset else (cache.get(CONFIG_CACHE_KEY) or {})
+    stored.update(changes)
+    cache.set(CONFIG_CACHE_KEY, stored, timeout=None)
+    with _config_lock:
+        _config['expires'] = 0.0
+    return get_config()
+
+
+class StackSampler:
+    """
+    Statistical profiler: a background thread records the stack of one
+    thread every `interval` seconds. The profiled code runs unmodified, so
+    the overhead stays low even on hot paths.
+
+    Args:
+        thread_id: Identifier of the thread to sample
+        interval: Seconds between samples
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        """Write the samples in collapsed stack format (flamegraph.pl, speedscope)."""
+        with open(path, 'w') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f"{stack} {count}\n")
+
+
+class CProfileProfiler:
+    """Deterministic profiler of the current thread, written as a pstats file."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+def _start_profiler(kind):
+    if kind == 'cprofile':
+        profiler = CProfileProfiler()
+    else:
+        profiler = StackSampler(threading.get_ident(), getattr(settings, 'PROFILING_SAMPLE_INTERVAL', 0.005))
+    profiler.start()
+    return profiler
+
+
+def _prune(directory, keep):
+    """Delete the oldest profiles beyond `keep` files."""
+    paths = [entry.path for entry in os.scandir(directory) if entry.is_file()]
+    if len(paths) <= keep:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def write_profile(profiler, kind, request, total):
+    """
+    Write a request profile to PROFILING_DIR.
+
+    Returns:
+        str: File name of the profile
+    """
+    directory = getattr(settings, 'PROFILING_DIR', 'profiles')
+    os.makedirs(directory, exist_ok=True)
+    slug = _SLUG.sub('-', request.path).strip('-')[:80] or 'root'
+    extension = 'prof' if kind == 'cprofile' else 'folded'
+    name = (
+        f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}-{request.method}-{slug}-"
+        f"{total * 1000:.0f}ms.{extension}"
+    )
+    profiler.write(os.path.join(directory, name))
+    _prune(directory, getattr(settings, 'PROFILING_MAX_FILES', 500))
+    return name
+
+
+@contextmanager
+def timing(request, name):
+    """
+    Time a block of a view and report it as its own Server-Timing metric,
+    e.g. `with timing(request, 'serialize'): data = serializer.data`.
+
+    Args:
+        request: Current request (Django or DRF)
+        name: Metric name (letters, digits, - and _)
+    """
+    timings = getattr(getattr(request, '_request', request), '_profiling_timings', None)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def server_timing(metrics):
+    """
+    Format a Server-Timing header value.
+
+    Args:
+        metrics: (name, seconds or None, description or None) tuples
+    """
+    entries = []
+    for name, seconds, description in metrics:
+        entry = name
+        if seconds is not None:
+            entry += f";dur={seconds * 1000:.1f}"
+        if description:
+            entry += f';desc="{description}"'
+        entries.append(entry)
+    return ', '.join(entries)
+
+
+class ProfilingMiddleware:
+    """
+    Report where request time goes and sample request profiles.
+
+    With server_timing enabled every response gets a Server-Timing header:
+    db (SQL time and query count of the request, including session and
+    authentication lookups and tasks run with utils.concurrency.run_parallel),
+    render (response rendering, including JSON encoding), app (the rest:
+    view logic and serialization), total, and any spans recorded with
+    timing(). A sample_rate fraction of requests is profiled (stack
+    sampling or cProfile) and written to PROFILING_DIR.
+
+    The configuration defaults to the PROFILING_* settings and can be
+    changed at runtime by staff through /api/analytics/profiling/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_config()
+        sampled = config['sample_rate'] > 0 and random.random() < config['sample_rate']
+        if not config['server_timing'] and not sampled:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        request._profiling_timings = {}
+        profiler = _start_profiler(config['profiler']) if sampled else None
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(recorder):
+                response = self.get_response(request)
+        finally:
+            if profiler:
+                profiler.stop()
+        total = time.perf_counter() - started
+
+        timings = request._profiling_timings
+        render = timings.pop('render', None)
+        metrics = [('db', recorder.duration, f"{len(recorder)} queries")]
+        if render is not None:
+            metrics.append(('render', render, None))
+        metrics.append(('app', max(total - recorder.duration - (render or 0), 0), None))
+        metrics.extend((name, seconds, None) for name, seconds in timings.items())
+        metrics.append(('total', total, None))
+
+        if profiler:
+            try:
+                metrics.append(('profile', None, write_profile(profiler, config['profiler'], request, total)))
+            except OSError:
+                logger.exception("Could not write the profile of %s %s", request.method, request.path)
+        if config['server_timing']:
+            response['Server-Timing'] = server_timing(metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, '_profiling_timings', None)
+        if timings is not None:
+            # Rendering runs right after this hook; DRF responses render here
+            started = time.perf_counter()
+
+            def rendered(response):
+                timings['render'] = time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,225 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.urls import resolve
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_MODES = ('off', 'log', 'raise')
+
+# Repeated statements listed in a report
+REPORT_STATEMENTS = 5
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:\s*(?:%s|\?)\s*,)*\s*(?:%s|\?)\s*\)', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL queries than its budget allows."""
+
+
+def query_budget(limit):
+    """
+    Declare the maximum number of SQL queries of a view or viewset action.
+
+    Put it above @api_view on function views and above (or below) @action
+    on viewset methods. Viewsets can also declare budgets for inherited
+    actions with a `query_budgets` dict, e.g. {'list': 2, 'retrieve': 1}.
+
+    Args:
+        limit: Maximum number of queries run by the view
+    """
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+def get_query_budget(resolver_match, method):
+    """
+    Budget declared for the view handling a request.
+
+    Args:
+        resolver_match: ResolverMatch of the request
+        method: HTTP method
+
+    Returns:
+        int or None: The budget, QUERY_BUDGET_DEFAULT (None when 0) for views without one
+    """
+    view = resolver_match.func
+    budget = getattr(view, 'query_budget', None)
+    cls = getattr(view, 'cls', None)
+    if budget is None and cls is not None:
+        # Viewsets map methods to actions, function views to handler methods
+        actions = getattr(view, 'actions', None) or {}
+        name = actions.get(method.lower(), method.lower())
+        budget = getattr(cls, 'query_budgets', {}).get(name)
+        if budget is None:
+            budget = getattr(getattr(cls, name, None), 'query_budget', None)
+    if budget is None:
+        budget = getattr(settings, 'QUERY_BUDGET_DEFAULT', 0) or None
+    return budget
+
+
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape: literals and parameters become ?, IN
+    lists collapse, so queries differing only by values compare equal.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def repeated_statements(statements, limit=REPORT_STATEMENTS):
+    """
+    Most repeated normalized statements.
+
+    Args:
+        statements: SQL strings
+        limit: Maximum number of statements returned
+
+    Returns:
+        list: (normalized SQL, count) of statements run more than once, most repeated first
+    """
+    counts = Counter(normalize_sql(sql) for sql in statements)
+    return [(sql, count) for sql, count in counts.most_common(limit) if count > 1]
+
+
+def format_report(label, budget, statements):
+    """
+    Explain a budget overrun, listing the repeated statements (usually the N+1 relation).
+
+    Args:
+        label: Request description, e.g. "GET /api/employees/"
+        budget: Allowed number of queries
+        statements: SQL strings run by the request
+    """
+    lines = [f"{label} ran {len(statements)} queries, budget is {budget}"]
+    repeated = repeated_statements(statements)
+    if repeated:
+        lines.append("Repeated statements:")
+        lines.extend(f"  {count}x {sql}" for sql, count in repeated)
+    return '\n'.join(lines)
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper recording the statements run on the current
+    thread's connection and the time spent in the database. Tasks run with
+    utils.concurrency.run_parallel share the caller's wrappers, so their
+    queries are recorded too (hence the lock).
+
+    Usage:
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            ...
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.duration += time.perf_counter() - started
+                self.statements.append(sql)
+
+    def __len__(self):
+        return len(self.statements)
+
+
+def assert_query_budget(client, method, path, data=None, budget=None, **extra):
+    """
+    Send a request with a test client and fail if it exceeds its query budget.
+
+    Authenticate the client with force_authenticate (or force_login before
+    the first request) so only the view's queries are counted. Queries of
+    tasks the view runs with utils.concurrency.run_parallel are counted too.
+
+    Args:
+        client: Django or DRF test client
+        method: HTTP method, e.g. "get"
+        path: Request path (query string allowed)
+        data: Request data
+        budget: Query budget (default: the one declared by the view)
+        **extra: Passed to the client method (e.g. format='json')
+
+    Returns:
+        HttpResponse: The response
+
+    Raises:
+        QueryBudgetExceeded: With the repeated statements
+        ValueError: If the view declares no budget and none is given
+    """
+    if budget is None:
+        budget = get_query_budget(resolve(path.split('?')[0]), method)
+        if budget is None:
+            raise ValueError(f"{method.upper()} {path} declares no query budget")
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        response = getattr(client, method.lower())(path, data, **extra)
+    if len(recorder) > budget:
+        raise QueryBudgetExceeded(format_report(f"{method.upper()} {path}", budget, recorder.statements))
+    return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Check view query counts against their budgets at runtime.
+
+    QUERY_BUDGET_MODE selects what happens on an overrun: "log" writes a
+    warning with the repeated statements, "raise" raises
+    QueryBudgetExceeded (for development and CI), "off" removes the
+    middleware. The user and session are loaded before counting starts, so
+    only the view's queries are counted: those on the request thread and
+    those of the tasks it runs with utils.concurrency.run_parallel (e.g.
+    the dashboard sections).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+        if self.mode not in QUERY_BUDGET_MODES:
+            raise ValueError(f"QUERY_BUDGET_MODE must be one of: {', '.join(QUERY_BUDGET_MODES)}")
+        if self.mode == 'off':
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        recorder = getattr(request, '_query_budget_recorder', None)
+        if recorder is None:
+            return response
+        connection.execute_wrappers.remove(recorder)
+
+        budget = get_query_budget(request.resolver_match, request.method)
+        if budget is not None and len(recorder) > budget:
+            report = format_report(f"{request.method} {request.path}", budget, recorder.statements)
+            if self.mode == 'raise':
+                raise QueryBudgetExceeded(report)
+            logger.warning(report)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        user = getattr(request, 'user', None)
+        if user is not None:
+            # Resolve the lazy user now so its queries are not charged to the view
+            user.is_authenticated
+        request._query_budget_recorder = QueryRecorder()
+        connection.execute_wrappers.append(request._query_budget_recorder)
+        return None
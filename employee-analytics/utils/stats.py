@@ -0,0 +1,196 @@
+import numpy as np
+
+
+def group_starts(groups):
+    """
+    Get the start offset of the group each element belongs to.
+
+    Args:
+        groups: Array of group keys, sorted so equal keys are contiguous
+
+    Returns:
+        numpy.ndarray: For each element, the index of the first element of its group
+    """
+    groups = np.asarray(groups)
+    if not len(groups):
+        return np.zeros(0, dtype=int)
+    is_start = np.ones(len(groups), dtype=bool)
+    is_start[1:] = groups[1:] != groups[:-1]
+    start_index = np.flatnonzero(is_start)
+    return start_index[np.cumsum(is_start) - 1]
+
+
+def grouped_rolling_mean(values, groups, window):
+    """
+    Rolling mean over the last `window` values of each group.
+
+    Uses a cumulative sum so the whole array is processed in one pass;
+    the first elements of a group average over the values available so far.
+
+    Args:
+        values: Array of values, ordered within each group
+        groups: Array of group keys, sorted so equal keys are contiguous
+        window: Number of values in the rolling window
+
+    Returns:
+        numpy.ndarray: Rolling means aligned with values
+    """
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return values
+    index = np.arange(len(values))
+    low = np.maximum(index - window + 1, group_starts(groups))
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    return (cumulative[index + 1] - cumulative[low]) / (index - low + 1)
+
+
+def grouped_diff(values, groups):
+    """
+    Difference between each value and the previous value of the same group.
+
+    Args:
+        values: Array of values, ordered within each group
+        groups: Array of group keys, sorted so equal keys are contiguous
+
+    Returns:
+        numpy.ndarray: Deltas aligned with values, NaN for the first value of a group
+    """
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return values
+    delta = np.empty_like(values)
+    delta[0] = np.nan
+    delta[1:] = values[1:] - values[:-1]
+    delta[group_starts(groups) == np.arange(len(values))] = np.nan
+    return delta
+
+
+def grouped_percentile_rank(values, groups):
+    """
+    Percentile rank of each value within its group.
+
+    Ties share the mid-rank, so the rank is the percentage of group values
+    below the value plus half the percentage equal to it.
+
+    Args:
+        values: Array of values
+        groups: Array of group keys (any order)
+
+    Returns:
+        numpy.ndarray: Percentile ranks (0-100) aligned with values
+    """
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups)
+    size = len(values)
+    if not size:
+        return values
+
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    sorted_groups = groups[order]
+
+    # Runs of equal (group, value) pairs and the groups containing them
+    new_group = np.ones(size, dtype=bool)
+    new_group[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    new_run = new_group.copy()
+    new_run[1:] |= sorted_values[1:] != sorted_values[:-1]
+
+    group_start = group_starts(sorted_groups)
+    run_id = np.cumsum(new_run) - 1
+    run_start = np.flatnonzero(new_run)
+    run_length = np.diff(np.append(run_start, size))
+    group_id = np.cumsum(new_group) - 1
+    group_size = np.diff(np.append(np.flatnonzero(new_group), size))
+
+    below = run_start[run_id] - group_start
+    ranks = np.empty(size)
+    ranks[order] = (below + 0.5 * run_length[run_id]) / group_size[group_id] * 100
+    return ranks
+
+
+def grouped_stats(keys, values):
+    """
+    Count, mean and sample standard deviation of values per group key.
+
+    Args:
+        keys: Array of group keys (any order)
+        values: Array of values aligned with keys
+
+    Returns:
+        tuple: (unique keys, group index of each element, counts, means, stds);
+            the std is NaN for groups with fewer than two values
+    """
+    values = np.asarray(values, dtype=float)
+    unique_keys, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique_keys))
+    totals = np.bincount(inverse, weights=values, minlength=len(unique_keys))
+    squares = np.bincount(inverse, weights=values ** 2, minlength=len(unique_keys))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = totals / counts
+        variances = (squares - counts * means ** 2) / (counts - 1)
+    stds = np.sqrt(np.clip(variances, 0, None))
+    stds[counts < 2] = np.nan
+    return unique_keys, inverse, counts, means, stds
+
+
+def grouped_median(keys, values):
+    """
+    Median of values per group key.
+
+    Args:
+        keys: Array of group keys (any order)
+        values: Array of values aligned with keys
+
+    Returns:
+        tuple: (unique keys, group index of each element, counts, medians)
+    """
+    values = np.asarray(values, dtype=float)
+    unique_keys, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse, minlength=len(unique_keys))
+    if not len(values):
+        return unique_keys, inverse, counts, np.zeros(0)
+
+    # Sort by group, then value; the middle element(s) of each group are its median
+    sorted_values = values[np.lexsort((values, inverse))]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    medians = (sorted_values[starts + (counts - 1) // 2] + sorted_values[starts + counts // 2]) / 2
+    return unique_keys, inverse, counts, medians
+
+
+def robust_z_scores(keys, values):
+    """
+    Robust z-scores of values within their group, based on the median and
+    the median absolute deviation (MAD, scaled by 1.4826 to estimate the
+    standard deviation of normal data).
+
+    Args:
+        keys: Array of group keys (any order)
+        values: Array of values aligned with keys
+
+    Returns:
+        tuple: Per element (z-scores, group medians, group MADs, group sizes);
+            z-scores are inf or NaN where the MAD is 0
+    """
+    values = np.asarray(values, dtype=float)
+    _, inverse, counts, medians = grouped_median(keys, values)
+    _, _, _, mads = grouped_median(inverse, np.abs(values - medians[inverse]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = (values - medians[inverse]) / (1.4826 * mads[inverse])
+    return scores, medians[inverse], mads[inverse], counts[inverse]
+
+
+def to_list(values, digits=2):
+    """
+    Convert a float array to a JSON friendly list, mapping NaN to None.
+
+    Args:
+        values: Array of floats
+        digits: Number of decimals to round to
+
+    Returns:
+        list: Rounded values
+    """
+    values = np.round(np.asarray(values, dtype=float), digits)
+    return [None if np.isnan(value) else float(value) for value in values]
@@ -0,0 +1,51 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from .data_generator import generate_employee_data
+from .query_budget import assert_query_budget
+
+
+class QueryBudgetTestMixin:
+    """
+    Helpers for tests checking endpoints against their query budgets.
+
+    Data comes from the sample data generator with a fixed seed, requests are
+    sent by a force-authenticated superuser and the cache is cleared before
+    each request, so the budgets are checked on the uncached code paths.
+    """
+    # Generated employees and days of attendance history
+    EMPLOYEES = 6
+    DAYS = 20
+
+    @classmethod
+    def create_data(cls):
+        """Generate the dataset and the requesting user."""
+        generate_employee_data(count=cls.EMPLOYEES, days=cls.DAYS, seed=1, create_users=False)
+        cls.user = User.objects.create_superuser('budget', 'budget@example.com', 'budget')
+
+    @staticmethod
+    def refresh_snapshots():
+        """Refresh the analytics snapshots, so max_staleness requests read them."""
+        call_command('refresh_analytics', stdout=StringIO())
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertWithinBudget(self, method, path, data=None, **extra):
+        """
+        Send a request, failing if it errors or exceeds the view's query budget.
+
+        Returns:
+            Response: The response
+        """
+        cache.clear()
+        with self.subTest(method=method, path=path, data=data):
+            response = assert_query_budget(self.client, method, path, data, **extra)
+            self.assertLess(response.status_code, 400, getattr(response, 'data', response.content))
+            return response